@@ -32,3 +32,12 @@ class QualityReport:
             }
             for result in self.results
         ]
+
+    def as_columns(self) -> dict[str, list[object]]:
+        return {
+            "table": [self.table] * len(self.results),
+            "generated_at": [self.generated_at] * len(self.results),
+            "rule": [result.rule for result in self.results],
+            "passed": [result.passed for result in self.results],
+            "details": [result.details for result in self.results],
+        }
@@ -5,23 +5,47 @@ from typing import Iterator
 
 import clickhouse_connect
 
+from data_quality_monitor.infrastructure.clients.columnar import ColumnarWriter
+from data_quality_monitor.infrastructure.clients.pool import ClientPool, PoolMetrics
 from data_quality_monitor.infrastructure.config import ClickHouseConfig
 
 
 class ClickHouseFactory:
     def __init__(self, config: ClickHouseConfig) -> None:
         self._config = config
+        self._pool = ClientPool(
+            create=self._create_client,
+            max_size=config.pool_size,
+            idle_timeout=config.pool_idle_timeout,
+            health_check_interval=config.pool_health_check_interval,
+        )
+
+    @property
+    def pool_metrics(self) -> PoolMetrics:
+        return self._pool.metrics
 
     @contextmanager
     def connect(self) -> Iterator[clickhouse_connect.driver.Client]:  # type: ignore[name-defined]
-        client = clickhouse_connect.get_client(
+        with self._pool.lease() as client:
+            yield client
+
+    def writer(self) -> ColumnarWriter:
+        return ColumnarWriter(
+            self,
+            batch_rows=self._config.insert_batch_rows,
+            async_insert=self._config.async_insert,
+            wait_for_async_insert=self._config.wait_for_async_insert,
+        )
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def _create_client(self) -> clickhouse_connect.driver.Client:  # type: ignore[name-defined]
+        return clickhouse_connect.get_client(
             host=self._config.host,
             port=self._config.port,
             username=self._config.username,
             password=self._config.password,
             database=self._config.database,
+            compress=self._config.compression,
         )
-        try:
-            yield client
-        finally:
-            client.close()
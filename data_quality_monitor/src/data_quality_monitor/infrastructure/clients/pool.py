@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Generic, Iterator, Protocol, TypeVar
+
+
+class PooledClient(Protocol):
+    def ping(self) -> bool:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+ClientT = TypeVar("ClientT", bound=PooledClient)
+
+
+@dataclass(slots=True)
+class PoolMetrics:
+    created: int = 0
+    reused: int = 0
+    misses: int = 0
+    waits: int = 0
+    evicted_idle: int = 0
+    evicted_unhealthy: int = 0
+    discarded: int = 0
+    in_use: int = 0
+    idle: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class _IdleEntry(Generic[ClientT]):
+    client: ClientT
+    released_at: float
+    checked_at: float
+
+
+class ClientPool(Generic[ClientT]):
+    """Thread-safe bounded pool of long-lived ClickHouse clients."""
+
+    def __init__(
+        self,
+        create: Callable[[], ClientT],
+        max_size: int = 4,
+        idle_timeout: float | None = 300.0,
+        health_check_interval: float = 30.0,
+        acquire_timeout: float | None = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("pool max_size must be positive")
+        self._create = create
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._health_check_interval = health_check_interval
+        self._acquire_timeout = acquire_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle: deque[_IdleEntry[ClientT]] = deque()
+        self._size = 0
+        self._closed = False
+        self._pid = os.getpid()
+        self._metrics = PoolMetrics()
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        with self._lock:
+            snapshot = PoolMetrics(**self._metrics.as_dict())
+            snapshot.idle = len(self._idle)
+            snapshot.in_use = self._size - len(self._idle)
+            return snapshot
+
+    @contextmanager
+    def lease(self) -> Iterator[ClientT]:
+        client = self.acquire()
+        try:
+            yield client
+        except BaseException:
+            # the transport state is unknown after a failure, never hand it out again
+            self.release(client, discard=True)
+            raise
+        else:
+            self.release(client)
+
+    def acquire(self) -> ClientT:
+        deadline = None if self._acquire_timeout is None else self._clock() + self._acquire_timeout
+        while True:
+            entry = self._take_slot(deadline)
+            if entry is None:
+                break
+            # health checks do network I/O, keep them outside of the lock
+            if self._is_healthy(entry):
+                with self._lock:
+                    self._metrics.reused += 1
+                return entry.client
+            with self._available:
+                self._size -= 1
+                self._metrics.evicted_unhealthy += 1
+                self._available.notify()
+            self._close_quietly(entry.client)
+
+        try:
+            client = self._create()
+        except BaseException:
+            with self._available:
+                self._size -= 1
+                self._available.notify()
+            raise
+        with self._lock:
+            self._metrics.created += 1
+            self._metrics.misses += 1
+        return client
+
+    def release(self, client: ClientT, discard: bool = False) -> None:
+        with self._available:
+            if self._closed or discard:
+                self._size -= 1
+                if discard:
+                    self._metrics.discarded += 1
+                self._available.notify()
+                close_now = True
+            else:
+                now = self._clock()
+                self._idle.append(_IdleEntry(client=client, released_at=now, checked_at=now))
+                self._available.notify()
+                close_now = False
+        if close_now:
+            self._close_quietly(client)
+
+    def close(self) -> None:
+        with self._available:
+            self._closed = True
+            entries = list(self._idle)
+            self._idle.clear()
+            self._size -= len(entries)
+            self._available.notify_all()
+        for entry in entries:
+            self._close_quietly(entry.client)
+
+    def _evict_idle(self) -> None:
+        if self._idle_timeout is None:
+            return
+        cutoff = self._clock() - self._idle_timeout
+        # the deque is ordered by release time, oldest entries sit on the left
+        while self._idle and self._idle[0].released_at < cutoff:
+            entry = self._idle.popleft()
+            self._size -= 1
+            self._metrics.evicted_idle += 1
+            self._close_quietly(entry.client)
+
+    def _take_slot(self, deadline: float | None) -> _IdleEntry[ClientT] | None:
+        """Pop an idle client or reserve capacity for a new one (``None``)."""
+
+        with self._available:
+            self._reset_after_fork()
+            while True:
+                if self._closed:
+                    raise RuntimeError("client pool is closed")
+                self._evict_idle()
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self._max_size:
+                    self._size += 1
+                    return None
+                self._metrics.waits += 1
+                remaining = None if deadline is None else deadline - self._clock()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"no ClickHouse client available within {self._acquire_timeout}s")
+                self._available.wait(remaining)
+
+    def _is_healthy(self, entry: _IdleEntry[ClientT]) -> bool:
+        if self._clock() - entry.checked_at < self._health_check_interval:
+            return True
+        try:
+            return bool(entry.client.ping())
+        except Exception:  # noqa: BLE001
+            return False
+
+    def _reset_after_fork(self) -> None:
+        # sockets inherited from the parent process must not be shared with it
+        if os.getpid() == self._pid:
+            return
+        self._pid = os.getpid()
+        self._idle.clear()
+        self._size = 0
+        self._metrics = PoolMetrics()
+
+    @staticmethod
+    def _close_quietly(client: PooledClient) -> None:
+        try:
+            client.close()
+        except Exception:  # noqa: BLE001
+            pass
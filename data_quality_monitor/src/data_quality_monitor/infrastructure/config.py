@@ -14,6 +14,13 @@ class ClickHouseConfig:
     database: str
     username: str
     password: str
+    pool_size: int = 4
+    pool_idle_timeout: float = 300.0
+    pool_health_check_interval: float = 30.0
+    compression: bool | str = True
+    insert_batch_rows: int = 100_000
+    async_insert: bool = False
+    wait_for_async_insert: bool = True
 
 
 @dataclass(slots=True)
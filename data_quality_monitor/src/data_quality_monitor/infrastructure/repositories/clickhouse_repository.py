@@ -4,11 +4,13 @@ import pandas as pd
 
 from data_quality_monitor.domain.models.result import QualityReport
 from data_quality_monitor.infrastructure.clients.clickhouse import ClickHouseFactory
+from data_quality_monitor.infrastructure.clients.columnar import ColumnarWriter
 
 
 class ClickHouseRepository:
-    def __init__(self, factory: ClickHouseFactory) -> None:
+    def __init__(self, factory: ClickHouseFactory, writer: ColumnarWriter | None = None) -> None:
         self._factory = factory
+        self._writer = writer or factory.writer()
 
     def ensure_schema(self) -> None:
         ddl_statements = [
@@ -31,9 +33,7 @@ class ClickHouseRepository:
             return client.query_df(f"SELECT * FROM {table}")
 
     def save_report(self, report: QualityReport) -> None:
-        rows = report.as_rows()
-        with self._factory.connect() as client:
-            client.insert_dicts("dq_reports", rows)
+        self._writer.write("dq_reports", report.as_columns())
 
     def list_reports(self) -> pd.DataFrame:
         with self._factory.connect() as client:
@@ -3,7 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from fastapi import FastAPI
-from prometheus_client import CollectorRegistry, Counter, generate_latest
+from prometheus_client import CollectorRegistry, Counter, Gauge, generate_latest
 from starlette.responses import PlainTextResponse
 
 from data_quality_monitor.application.services.runner import QualityRunner
@@ -16,15 +16,22 @@ CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "rules.
 app = FastAPI(title="Data Quality Monitor")
 registry = CollectorRegistry()
 run_counter = Counter("dq_runs_total", "DQ runs", registry=registry)
+pool_gauge = Gauge("dq_clickhouse_pool", "ClickHouse client pool stats", ["stat"], registry=registry)
 
 
 @app.on_event("startup")
 def bootstrap() -> None:
     app.state.config = RuleConfig.load(CONFIG_PATH)
-    repository = ClickHouseRepository(factory=ClickHouseFactory(app.state.config.clickhouse))
+    app.state.factory = ClickHouseFactory(app.state.config.clickhouse)
+    repository = ClickHouseRepository(factory=app.state.factory)
     app.state.runner = QualityRunner(repository)
 
 
+@app.on_event("shutdown")
+def teardown() -> None:
+    app.state.factory.close()
+
+
 @app.post("/run")
 def run_checks() -> dict[str, int]:
     reports = app.state.runner.run(app.state.config.rules)
@@ -41,4 +48,6 @@ def list_reports() -> list[dict[str, object]]:
 
 @app.get("/metrics")
 def metrics() -> PlainTextResponse:
+    for stat, value in app.state.factory.pool_metrics.as_dict().items():
+        pool_gauge.labels(stat=stat).set(value)
     return PlainTextResponse(generate_latest(registry), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,79 @@
+"""Feature view writes: driver-serialized Map vs vectorized Native blocks.
+
+``driver`` is the column-wise path that still hands clickhouse-connect one
+dict per row for ``feature_map``; ``map`` and ``wide`` are the two layouts
+of ``persist_feature_view``. Nothing goes over the network.
+
+Usage: poetry run python benchmarks/bench_feature_encoding.py --rows 10000000
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+import typer
+from bench_inserts import SerializingFactory
+
+from feature_store_ml.infrastructure.clients.columnar import ColumnarWriter
+from feature_store_ml.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+
+app = typer.Typer()
+
+
+def _feature_view(rows: int, features: int) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    data: dict[str, np.ndarray] = {
+        "entity_id": rng.integers(0, 100_000, rows).astype(np.uint64),
+        "event_time": np.datetime64("2024-01-01") + rng.integers(0, 86_400, rows).astype("timedelta64[s]"),
+        "label": rng.integers(0, 2, rows).astype(np.uint8),
+    }
+    for idx in range(features):
+        data[f"feature_{idx}"] = rng.normal(size=rows)
+    return pd.DataFrame(data)
+
+
+def _driver_map(writer: ColumnarWriter, view: pd.DataFrame) -> None:
+    names = [column for column in view.columns if column not in {"entity_id", "event_time", "label"}]
+    matrix = view[names].to_numpy(dtype=np.float64).tolist()
+    writer.write(
+        "entity_features",
+        {
+            "event_time": view["event_time"],
+            "entity_id": view["entity_id"],
+            "label": view["label"],
+            "feature_map": [dict(zip(names, row)) for row in matrix],
+        },
+    )
+
+
+@app.command()
+def main(
+    rows: int = typer.Option(10_000_000),
+    driver_rows: int = typer.Option(1_000_000, help="the driver path is timed on a prefix, it keeps every dict alive"),
+    features: int = typer.Option(9, help="FeatureRegistry produces 9 features"),
+    batch_rows: int = typer.Option(100_000),
+) -> None:
+    view = _feature_view(rows, features)
+    factory = SerializingFactory()
+    writer = ColumnarWriter(factory, batch_rows=batch_rows)
+    typer.echo(f"{rows:,} feature rows x {features} features, {batch_rows:,} rows per insert")
+
+    prefix = view.iloc[:driver_rows]
+    started = time.perf_counter()
+    _driver_map(writer, prefix)
+    driver = (time.perf_counter() - started) / len(prefix) * rows
+    typer.echo(f"  driver map  {driver:8.2f}s (projected from {len(prefix):,} rows) {rows / driver:>12,.0f} rows/s")
+
+    for layout in ("map", "wide"):
+        repository = ClickHouseRepository(factory, writer=writer, feature_layout=layout)
+        repository._wide_columns = set(view.columns)  # no server to ALTER
+        started = time.perf_counter()
+        repository.persist_feature_view(view)
+        elapsed = time.perf_counter() - started
+        typer.echo(f"  native {layout:<4} {elapsed:8.2f}s {rows / elapsed:>12,.0f} rows/s  x{driver / elapsed:.0f}")
+
+
+if __name__ == "__main__":
+    app()
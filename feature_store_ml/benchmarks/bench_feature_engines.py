@@ -0,0 +1,76 @@
+"""pandas vs fused computation of the feature view from raw events.
+
+Both engines build the same frame (checked on every size both run); the
+pandas path is skipped above ``--pandas-max`` events, where its groupby
+copies no longer fit comfortably in memory.
+
+Usage: poetry run python benchmarks/bench_feature_engines.py --sizes 1000000,10000000,50000000
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+import typer
+
+from feature_store_ml.infrastructure.features.fused import FusedFeatureEngine
+from feature_store_ml.infrastructure.registry import FeatureRegistry
+
+app = typer.Typer()
+
+
+def _events(rows: int, entities: int, hours: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "event_time": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, hours * 3600, rows), unit="s"),
+            "entity_id": rng.integers(0, entities, rows),
+            "value": rng.normal(100.0, 15.0, rows),
+            "attribute": rng.random(rows),
+            "label": rng.integers(0, 2, rows, dtype=np.int8),
+        }
+    )
+
+
+def _time(call, repeats: int) -> tuple[float, pd.DataFrame]:
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = call()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+@app.command()
+def main(
+    sizes: str = typer.Option("1000000,10000000,50000000", help="comma separated event counts"),
+    entities: int = typer.Option(10_000),
+    hours: int = typer.Option(24),
+    bucket_minutes: int = typer.Option(15),
+    pandas_max: int = typer.Option(10_000_000, help="largest size the pandas path is run on"),
+    repeats: int = typer.Option(1),
+    seed: int = typer.Option(42),
+) -> None:
+    registry = FeatureRegistry(bucket_minutes=bucket_minutes)
+    fused = FusedFeatureEngine(registry)
+    typer.echo(f"{'events':>12} {'buckets':>10} {'pandas':>9} {'fused':>9} {'speedup':>8} {'fused rows/s':>14}")
+    for rows in (int(size) for size in sizes.split(",")):
+        events = _events(rows, entities, hours, seed)
+        fused_time, fused_view = _time(lambda: fused.compute(events), repeats)
+        pandas_cell, speedup = "-", "-"
+        if rows <= pandas_max:
+            pandas_time, pandas_view = _time(lambda: registry.compute(events), repeats)
+            pd.testing.assert_frame_equal(fused_view, pandas_view, check_exact=False, rtol=1e-9)
+            pandas_cell, speedup = f"{pandas_time:.2f}s", f"x{pandas_time / fused_time:.1f}"
+            del pandas_view
+        typer.echo(
+            f"{rows:>12,} {len(fused_view):>10,} {pandas_cell:>9} {fused_time:>8.2f}s {speedup:>8}"
+            f" {rows / fused_time:>14,.0f}"
+        )
+        del events, fused_view
+
+
+if __name__ == "__main__":
+    app()
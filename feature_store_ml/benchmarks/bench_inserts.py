@@ -0,0 +1,149 @@
+"""Row dicts vs column-oriented writes for predictions and the feature view.
+
+Both paths serialize into ClickHouse's Native insert format with
+clickhouse-connect itself, only the network round trip is left out.
+
+Usage: poetry run python benchmarks/bench_inserts.py --rows 1000000 --features 20
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+import typer
+from clickhouse_connect.datatypes.registry import get_from_name
+from clickhouse_connect.driver.insert import InsertContext
+from clickhouse_connect.driver.transform import NativeTransform
+
+from feature_store_ml.infrastructure.clients.columnar import ColumnarWriter
+from feature_store_ml.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+
+app = typer.Typer()
+
+SCHEMAS = {
+    "predictions": {"event_time": "DateTime", "entity_id": "UInt64", "score": "Float64"},
+    "entity_features": {
+        "event_time": "DateTime",
+        "entity_id": "UInt64",
+        "label": "UInt8",
+        "feature_map": "Map(String, Float64)",
+    },
+}
+
+
+class SerializingClient:
+    """Stand-in client that encodes every insert the way the driver sends it."""
+
+    def __init__(self) -> None:
+        self.bytes_written = 0
+
+    def insert(
+        self,
+        table: str,
+        data: Sequence[Sequence[Any]],
+        column_names: Sequence[str],
+        column_oriented: bool = False,
+        settings: dict[str, Any] | None = None,
+    ) -> None:
+        types = [get_from_name(SCHEMAS[table][name]) for name in column_names]
+        context = InsertContext(table, list(column_names), types, data=data, column_oriented=column_oriented)
+        self.bytes_written += sum(len(chunk) for chunk in NativeTransform.build_insert(context))
+
+    def raw_insert(
+        self,
+        table: str,
+        column_names: Sequence[str] | None = None,
+        insert_block: bytes | None = None,
+        settings: dict[str, Any] | None = None,
+        fmt: str | None = None,
+    ) -> None:
+        self.bytes_written += len(insert_block or b"")
+
+    def insert_dicts(self, table: str, rows: list[dict[str, Any]]) -> None:
+        names = list(rows[0])
+        self.insert(table, [[row[name] for name in names] for row in rows], column_names=names)
+
+
+class SerializingFactory:
+    def __init__(self) -> None:
+        self.client = SerializingClient()
+
+    @contextmanager
+    def connect(self) -> Iterator[SerializingClient]:
+        yield self.client
+
+
+def _frames(rows: int, features: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(7)
+    times = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 86_400, rows)), unit="s")
+    entity_ids = rng.integers(0, 10_000, rows).astype(np.uint64)
+    predictions = pd.DataFrame({"event_time": times, "entity_id": entity_ids, "score": rng.random(rows)})
+    view = pd.DataFrame({"entity_id": entity_ids, "event_time": times, "label": rng.integers(0, 2, rows)})
+    for idx in range(features):
+        view[f"feature_{idx}"] = rng.normal(size=rows)
+    return predictions, view
+
+
+def _dict_predictions(factory: SerializingFactory, payload: pd.DataFrame) -> None:
+    rows = payload.to_dict(orient="records")
+    with factory.connect() as client:
+        client.insert_dicts("predictions", rows)
+
+
+def _dict_feature_view(factory: SerializingFactory, features: pd.DataFrame) -> None:
+    rows = []
+    for _, row in features.iterrows():
+        feature_map = {
+            column: float(row[column])
+            for column in features.columns
+            if column not in {"entity_id", "event_time", "label"}
+        }
+        rows.append(
+            {
+                "entity_id": int(row["entity_id"]),
+                "event_time": row["event_time"],
+                "label": int(row.get("label", 0)),
+                "feature_map": feature_map,
+            }
+        )
+    with factory.connect() as client:
+        client.insert_dicts("entity_features", rows)
+
+
+def _rate(label: str, rows: int, call: Any) -> float:
+    started = time.perf_counter()
+    call()
+    elapsed = time.perf_counter() - started
+    typer.echo(f"{label:<28} {elapsed:8.2f}s {rows / elapsed:>12,.0f} rows/s")
+    return elapsed
+
+
+@app.command()
+def main(
+    rows: int = typer.Option(1_000_000, help="prediction rows"),
+    feature_rows: int = typer.Option(200_000, help="feature view rows (the dict path uses iterrows)"),
+    features: int = typer.Option(20, help="feature columns per row"),
+    batch_rows: int = typer.Option(100_000),
+) -> None:
+    predictions, _ = _frames(rows, 0)
+    _, view = _frames(feature_rows, features)
+    factory = SerializingFactory()
+    repository = ClickHouseRepository(factory, writer=ColumnarWriter(factory, batch_rows=batch_rows))
+
+    typer.echo(f"predictions, {rows:,} rows")
+    before = _rate("  dicts (to_dict records)", rows, lambda: _dict_predictions(factory, predictions))
+    after = _rate("  columnar", rows, lambda: repository.persist_predictions(predictions))
+    typer.echo(f"  speedup x{before / after:.1f}")
+
+    typer.echo(f"feature view, {feature_rows:,} rows x {features} features")
+    before = _rate("  dicts (iterrows)", feature_rows, lambda: _dict_feature_view(factory, view))
+    after = _rate("  native map block", feature_rows, lambda: repository.persist_feature_view(view))
+    typer.echo(f"  speedup x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    app()
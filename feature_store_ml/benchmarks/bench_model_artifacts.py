@@ -0,0 +1,84 @@
+"""Cold start of a scoring worker: pickled artifacts, the versioned model store and its compiled trees.
+
+Each load runs in a fresh process so nothing is cached in the interpreter;
+the numbers are the time from "process has imported lightgbm" to the first
+prediction, and the resident memory the model added to that process.
+
+Usage: poetry run python benchmarks/bench_model_artifacts.py --rounds 200 --repeats 5
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import lightgbm as lgb
+import numpy as np
+import typer
+
+from feature_store_ml.infrastructure.modeling.artifacts import ModelStore
+
+app = typer.Typer()
+FEATURES = 9
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/statm", encoding="utf-8") as handle:
+        return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _cold_start(kind: str, directory: str, results: multiprocessing.Queue) -> None:
+    row = np.zeros((1, FEATURES))
+    rss = _rss_bytes()
+    started = time.perf_counter()
+    if kind == "pickle":
+        booster = joblib.load(Path(directory) / "lightgbm_model.pkl")
+        joblib.load(Path(directory) / "metadata.pkl")
+        opened = time.perf_counter()
+    else:
+        model = ModelStore(Path(directory) / "models").open()
+        opened = time.perf_counter()
+        booster = model.compiled if kind == "compiled" else model.booster  # type: ignore[assignment]
+    booster.predict(row)
+    finished = time.perf_counter()
+    results.put((opened - started, finished - started, _rss_bytes() - rss))
+
+
+@app.command()
+def main(rounds: int = typer.Option(200), repeats: int = typer.Option(5)) -> None:
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(50_000, FEATURES))
+    label = (matrix[:, 0] + rng.normal(scale=0.5, size=len(matrix)) > 0).astype(int)
+    booster = lgb.train({"objective": "binary", "verbose": -1, "max_depth": 6}, lgb.Dataset(matrix, label), rounds)
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        joblib.dump(booster, directory / "lightgbm_model.pkl")
+        joblib.dump({"features": booster.feature_name()}, directory / "metadata.pkl")
+        published = ModelStore(directory / "models").publish(booster)
+        typer.echo(
+            f"{rounds} trees: pickle {(directory / 'lightgbm_model.pkl').stat().st_size / 1e6:.2f} MB, "
+            f"model.txt {published.manifest.size / 1e6:.2f} MB"
+        )
+        for kind in ("pickle", "store", "compiled"):
+            samples = []
+            for _ in range(repeats):
+                results: multiprocessing.Queue = context.Queue()
+                worker = context.Process(target=_cold_start, args=(kind, tmp, results))
+                worker.start()
+                samples.append(results.get())
+                worker.join()
+            opened, first, rss = (statistics.median(values) for values in zip(*samples))
+            typer.echo(
+                f"{kind:<8} open {opened * 1000:7.2f} ms  first prediction {first * 1000:7.2f} ms  "
+                f"rss +{rss / 1e6:6.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    app()
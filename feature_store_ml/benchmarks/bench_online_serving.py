@@ -0,0 +1,123 @@
+"""Single-entity scoring latency: one-shot load-and-predict vs the online API.
+
+The one-shot path loads the latest model version for every request, as the
+``serve`` command does; the online path keeps the booster loaded and reads
+feature vectors from the cache. ClickHouse is left out: every entity is
+already cached, which is the steady state the API is built for.
+
+Usage: poetry run python benchmarks/bench_online_serving.py --requests 2000 --clients 8
+"""
+
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import typer
+from fastapi.testclient import TestClient
+
+from feature_store_ml.application.use_cases.predict_online import PredictOnline
+from feature_store_ml.infrastructure.config import TrainingConfig
+from feature_store_ml.infrastructure.modeling.artifacts import ModelStore
+from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
+from feature_store_ml.infrastructure.registry import FeatureRegistry
+from feature_store_ml.infrastructure.serving.batcher import MicroBatcher
+from feature_store_ml.infrastructure.serving.cache import CachedFeatures, FeatureCache
+from feature_store_ml.infrastructure.serving.live_model import LiveModel
+from feature_store_ml.presentation import api
+
+app = typer.Typer()
+TRAINING = TrainingConfig(test_size=0.2, random_state=0, num_boost_round=200, learning_rate=0.05, max_depth=6)
+
+
+def _write_artifacts(directory: Path, features: tuple[str, ...], rounds: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.normal(size=(50_000, len(features))), columns=list(features))
+    label = (frame.iloc[:, 0] + rng.normal(scale=0.5, size=len(frame)) > 0).astype(int)
+    booster = lgb.train({"objective": "binary", "verbose": -1, "max_depth": 6}, lgb.Dataset(frame, label=label), rounds)
+    ModelStore(directory / "models").publish(booster)
+    return frame
+
+
+def _report(label: str, latencies: list[float], elapsed: float) -> None:
+    millis = np.asarray(latencies) * 1000.0
+    p50, p99 = np.percentile(millis, [50, 99])
+    typer.echo(f"{label:<34} p50 {p50:7.3f} ms  p99 {p99:7.3f} ms  {len(millis) / elapsed:>9,.0f} req/s")
+
+
+def _timed(call, requests: int, clients: int) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def worker(count: int) -> None:
+        local = []
+        for idx in range(count):
+            started = time.perf_counter()
+            call(idx)
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(requests // clients,)) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - started
+
+
+@app.command()
+def main(
+    requests: int = typer.Option(2_000),
+    clients: int = typer.Option(8, help="concurrent callers"),
+    rounds: int = typer.Option(200, help="boosting rounds of the benchmark model"),
+    entities: int = typer.Option(10_000),
+    batch_wait_ms: float = typer.Option(0.0),
+) -> None:
+    features = FeatureRegistry(bucket_minutes=15).feature_names
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        frame = _write_artifacts(directory, features, rounds)
+        trainer = LightGBMTrainer(TRAINING, directory)
+        vectors = frame.head(entities).to_numpy()
+
+        def one_shot(idx: int) -> None:
+            model, metadata = trainer.load()
+            model.predict(pd.DataFrame(vectors[idx % entities : idx % entities + 1], columns=metadata["features"]))
+
+        latencies, elapsed = _timed(one_shot, min(requests, 200), 1)
+        _report("one-shot load + predict", latencies, elapsed)
+
+        live = LiveModel(trainer, reload_interval=0)
+        live.start()
+        cache = FeatureCache(max_entries=entities)
+        cache.put_many((idx, CachedFeatures(pd.Timestamp("2024-01-01"), vectors[idx])) for idx in range(entities))
+        for wait_ms, callers in ((batch_wait_ms, 1), (batch_wait_ms, clients)):
+            batcher = MicroBatcher(partial(live.predict, feature_names=features), max_wait=wait_ms / 1000.0)
+            predictor = PredictOnline(None, cache, batcher, features, threshold=0.5)  # type: ignore[arg-type]
+            latencies, elapsed = _timed(lambda idx: predictor.execute([idx % entities]), requests, callers)
+            _report(f"online, {callers} client(s), wait {wait_ms:g} ms", latencies, elapsed)
+            metrics = batcher.metrics
+            typer.echo(f"{'':<34} {metrics.batches:,} batches, {metrics.rows / metrics.batches:.1f} rows per batch")
+            batcher.close()
+
+        batcher = MicroBatcher(partial(live.predict, feature_names=features), max_wait=0.0)
+        api.app.state.model = live
+        api.app.state.cache = cache
+        api.app.state.batcher = batcher
+        api.app.state.predictor = PredictOnline(None, cache, batcher, features, threshold=0.5)  # type: ignore[arg-type]
+        client = TestClient(api.app)
+        latencies, elapsed = _timed(lambda idx: client.get(f"/predict/{idx % entities}"), requests, 1)
+        _report("HTTP GET /predict/{id} (TestClient)", latencies, elapsed)
+        batcher.close()
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,84 @@
+"""Peak memory of training: the in-memory feature view vs the streamed float32 dataset.
+
+Each path runs in a fresh process. The in-memory path builds the whole
+feature view as one DataFrame, like ``load_feature_view`` does, then runs
+``DatasetBuilder`` and ``LightGBMTrainer.train``. The streaming path gets
+the same rows as ``--block-rows`` frames, like ``stream_feature_view``
+yields them, and trains from the memmaps. Peak RSS includes the
+interpreter and imported libraries (~150 MB).
+
+Usage: poetry run python benchmarks/bench_training_memory.py --rows 3000000
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import typer
+
+from feature_store_ml.infrastructure.config import FeatureConfig, TrainingConfig
+from feature_store_ml.infrastructure.datasets.builder import DatasetBuilder
+from feature_store_ml.infrastructure.datasets.streaming import StreamingDatasetBuilder, peak_rss_mb
+from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
+from feature_store_ml.infrastructure.registry import FeatureRegistry
+
+app = typer.Typer()
+REGISTRY = FeatureRegistry.from_config(FeatureConfig(lookback_hours=720, bucket_minutes=15, min_records=1))
+TRAINING = TrainingConfig(test_size=0.2, random_state=42, num_boost_round=50, learning_rate=0.1, max_depth=6)
+
+
+def _block(start: int, rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(start)
+    names = list(REGISTRY.feature_names)
+    frame = pd.DataFrame(rng.normal(size=(rows, len(names))), columns=names)
+    frame.insert(0, "entity_id", rng.integers(0, 100_000, rows))
+    frame.insert(1, "event_time", pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(start, start + rows), "s"))
+    noise = rng.normal(scale=1.0, size=rows)
+    frame.insert(2, "label", (frame[names[0]] + noise > 0).astype(int))
+    return frame
+
+
+def _blocks(rows: int, block_rows: int):
+    for start in range(0, rows, block_rows):
+        yield _block(start, min(block_rows, rows - start))
+
+
+def _run(kind: str, rows: int, block_rows: int, directory: str, results: multiprocessing.Queue) -> None:
+    started = time.perf_counter()
+    trainer = LightGBMTrainer(TRAINING, Path(directory) / kind)
+    if kind == "memory":
+        frame = pd.concat(_blocks(rows, block_rows), ignore_index=True)
+        loaded = peak_rss_mb()
+        trainer.train(DatasetBuilder(REGISTRY).build(frame))
+    else:
+        builder = StreamingDatasetBuilder(REGISTRY, Path(directory) / "dataset", validation_fraction=0.2, seed=42)
+        dataset = builder.build(_blocks(rows, block_rows))
+        loaded = peak_rss_mb()
+        trainer.train_streamed(dataset)
+        dataset.remove()
+    results.put((loaded, peak_rss_mb(), time.perf_counter() - started))
+
+
+@app.command()
+def main(rows: int = typer.Option(3_000_000), block_rows: int = typer.Option(100_000)) -> None:
+    context = multiprocessing.get_context("spawn")
+    view_mb = rows * (len(REGISTRY.feature_names) + 3) * 8 / 1e6
+    typer.echo(f"{rows:,} rows x {len(REGISTRY.feature_names)} features, feature view ~{view_mb:,.0f} MB as float64")
+    typer.echo(f"{'path':<10} {'peak after load':>16} {'peak after train':>17} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in ("memory", "streaming"):
+            results: multiprocessing.Queue = context.Queue()
+            worker = context.Process(target=_run, args=(kind, rows, block_rows, tmp, results))
+            worker.start()
+            loaded, trained, seconds = results.get()
+            worker.join()
+            typer.echo(f"{kind:<10} {loaded:>13,.0f} MB {trained:>14,.0f} MB {seconds:>8.1f}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,75 @@
+"""Scoring latency by batch size: LightGBM on a DataFrame or an ndarray vs compiled NumPy trees.
+
+All three score the same float32 matrix (checked on every size); times are
+the median of ``--repeats`` calls, single threaded (``num_threads=1``) so
+the engines are compared on equal terms.
+
+Usage: poetry run python benchmarks/bench_tree_engine.py --sizes 1,10,100,1000,10000,100000 --rounds 200
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import typer
+
+from feature_store_ml.infrastructure.modeling.compiled import CompiledTrees
+from feature_store_ml.infrastructure.registry import FeatureRegistry
+
+app = typer.Typer()
+
+
+def _median(call, repeats: int) -> float:
+    call()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+@app.command()
+def main(
+    sizes: str = typer.Option("1,10,100,1000,10000,100000", help="comma separated batch sizes"),
+    rounds: int = typer.Option(200, help="boosting rounds of the benchmark model"),
+    max_depth: int = typer.Option(6),
+    repeats: int = typer.Option(50, help="calls per size, fewer for the large batches"),
+    seed: int = typer.Option(0),
+) -> None:
+    features = list(FeatureRegistry(bucket_minutes=15).feature_names)
+    rng = np.random.default_rng(seed)
+    matrix = rng.normal(size=(50_000, len(features))).astype(np.float32)
+    matrix[rng.random(matrix.shape) < 0.02] = np.nan
+    label = (np.nan_to_num(matrix[:, 0]) + rng.normal(scale=0.5, size=len(matrix)) > 0).astype(int)
+    params = {"objective": "binary", "verbose": -1, "max_depth": max_depth, "num_threads": 1}
+    booster = lgb.train(params, lgb.Dataset(matrix, label, feature_name=features), rounds)
+    started = time.perf_counter()
+    compiled = CompiledTrees.from_booster(booster)
+    typer.echo(
+        f"{rounds} trees, {len(compiled.value):,} nodes, depth {compiled.depth}, "
+        f"compiled in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    typer.echo(f"{'rows':>8} {'lgb DataFrame':>14} {'lgb ndarray':>12} {'numpy':>10} {'numpy rows/s':>14}")
+    for size in (int(value) for value in sizes.split(",")):
+        batch = np.resize(matrix, (size, len(features)))
+        frame = pd.DataFrame(batch.astype(np.float64), columns=features)
+        np.testing.assert_allclose(compiled.predict(batch), booster.predict(batch, num_threads=1), rtol=1e-9)
+        calls = max(3, min(repeats, repeats * 1000 // size))
+        timings = [
+            _median(lambda: booster.predict(frame, num_threads=1), calls),
+            _median(lambda: booster.predict(batch, num_threads=1), calls),
+            _median(lambda: compiled.predict(batch), calls),
+        ]
+        frame_ms, array_ms, numpy_ms = (seconds * 1000 for seconds in timings)
+        typer.echo(
+            f"{size:>8,} {frame_ms:>11.3f}ms {array_ms:>9.3f}ms {numpy_ms:>7.3f}ms {size / timings[2]:>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import islice
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
+from feature_store_ml.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+from feature_store_ml.infrastructure.serving.checkpoint import ScoringCheckpoint, ScoringRun
+
+_STOP = object()
+
+
+@dataclass(frozen=True, slots=True)
+class ScoringChunk:
+    start: datetime
+    end: datetime
+    partition: int = 0
+    partitions: int = 1
+
+    @property
+    def key(self) -> str:
+        return f"{self.start.isoformat()}/{self.partition}"
+
+
+@dataclass(slots=True)
+class BulkScoringReport:
+    chunks: int = 0
+    resumed: int = 0
+    scored: int = 0
+    rows: int = 0
+
+
+def plan_chunks(run: ScoringRun) -> list[ScoringChunk]:
+    """``chunk_minutes`` windows over the run, each split into ``entity_id % entity_partitions`` parts."""
+
+    step = timedelta(minutes=run.chunk_minutes)
+    chunks = []
+    start = run.start
+    while start < run.end:
+        end = min(start + step, run.end)
+        chunks.extend(ScoringChunk(start, end, part, run.entity_partitions) for part in range(run.entity_partitions))
+        start = end
+    return chunks
+
+
+class BulkScorePredictions:
+    """Rescores the whole feature view over a time range, chunk by chunk.
+
+    The booster is loaded once; ``workers`` threads read and score chunks,
+    with LightGBM limited to ``cpu_count // workers`` threads per call so the
+    workers do not oversubscribe the cores. Scored chunks pass a bounded
+    queue to one writer thread, so inserts overlap the reads and scoring of
+    later chunks and at most ``workers + queue_size`` chunks sit in memory.
+    A chunk is recorded in ``checkpoint`` after its predictions are written;
+    rerunning an interrupted run scores only the chunks still missing.
+    Predictions carry the model version, so a chunk written again replaces
+    its earlier rows in ``predictions``.
+    """
+
+    def __init__(
+        self,
+        repository: ClickHouseRepository,
+        trainer: LightGBMTrainer,
+        checkpoint: ScoringCheckpoint | None = None,
+        chunk_minutes: int = 60,
+        entity_partitions: int = 1,
+        workers: int = 2,
+        queue_size: int = 4,
+        lookback_hours: int = 24,
+    ) -> None:
+        if chunk_minutes < 1 or entity_partitions < 1 or workers < 1 or queue_size < 1:
+            raise ValueError("bulk scoring chunk_minutes, entity_partitions, workers and queue_size must be positive")
+        self._repository = repository
+        self._trainer = trainer
+        self._checkpoint = checkpoint
+        self._chunk_minutes = chunk_minutes
+        self._entity_partitions = entity_partitions
+        self._workers = workers
+        self._queue_size = queue_size
+        self._lookback_hours = lookback_hours
+
+    def execute(self, start: datetime | None = None, end: datetime | None = None) -> BulkScoringReport:
+        """Score ``[start, end)``; without a range, resume an unfinished run or score the last ``lookback_hours``."""
+
+        model = self._trainer.open()
+        booster, features = model.booster, list(model.manifest.features)
+        run, done = self._resume(start, end, model.version)
+        chunks = plan_chunks(run)
+        pending = [chunk for chunk in chunks if chunk.key not in done]
+        report = BulkScoringReport(chunks=len(chunks), resumed=len(chunks) - len(pending))
+        logger.info(
+            "scoring {} to {} in {} chunks ({} already done) with {} workers",
+            run.start,
+            run.end,
+            len(chunks),
+            report.resumed,
+            self._workers,
+        )
+        threads = max(1, (os.cpu_count() or 1) // self._workers)
+        results: queue.Queue[object] = queue.Queue(maxsize=self._queue_size)
+        failures: list[BaseException] = []
+        writer = threading.Thread(
+            target=self._write,
+            args=(results, run, done, report, failures),
+            name="prediction-writer",
+            daemon=True,
+        )
+        writer.start()
+        try:
+            with ThreadPoolExecutor(self._workers, thread_name_prefix="bulk-scoring") as pool:
+                remaining = iter(pending)
+                in_flight: set[Future[tuple[ScoringChunk, pd.DataFrame]]] = {
+                    pool.submit(self._score, chunk, booster, features, threads)
+                    for chunk in islice(remaining, self._workers)
+                }
+                while in_flight:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        # blocks while the writer is queue_size chunks behind
+                        results.put(future.result())
+                        if failures:
+                            raise failures[0]
+                        chunk = next(remaining, None)
+                        if chunk is not None:
+                            in_flight.add(pool.submit(self._score, chunk, booster, features, threads))
+        finally:
+            results.put(_STOP)
+            writer.join()
+        if failures:
+            raise failures[0]
+        logger.info("scored {} rows in {} chunks", report.rows, report.scored)
+        return report
+
+    def _resume(self, start: datetime | None, end: datetime | None, model_version: str) -> tuple[ScoringRun, set[str]]:
+        saved = self._checkpoint.load() if self._checkpoint is not None else None
+        if saved is not None and start is None and end is None:
+            run, done = saved
+            unfinished = len(done) < len(plan_chunks(run))
+            same_plan = (run.chunk_minutes, run.entity_partitions, run.model_version) == (
+                self._chunk_minutes,
+                self._entity_partitions,
+                model_version,
+            )
+            if unfinished and same_plan:
+                return run, done
+        if end is None:
+            end = pd.Timestamp.now("UTC").tz_localize(None).floor(f"{self._chunk_minutes}min").to_pydatetime()
+        if start is None:
+            start = end - timedelta(hours=self._lookback_hours)
+        run = ScoringRun(start, end, self._chunk_minutes, self._entity_partitions, model_version)
+        if saved is not None and saved[0] == run:
+            return run, saved[1]
+        return run, set()
+
+    def _score(
+        self, chunk: ScoringChunk, booster: lgb.Booster, features: list[str], threads: int
+    ) -> tuple[ScoringChunk, pd.DataFrame]:
+        frame = self._repository.load_feature_chunk(chunk.start, chunk.end, chunk.partition, chunk.partitions)
+        if frame.empty:
+            return chunk, pd.DataFrame(columns=["event_time", "entity_id", "score"])
+        scores = booster.predict(frame[features].to_numpy(dtype=np.float64), num_threads=threads)
+        payload = frame[["event_time", "entity_id"]].copy()
+        payload["score"] = scores
+        return chunk, payload
+
+    def _write(
+        self,
+        results: queue.Queue[object],
+        run: ScoringRun,
+        done: set[str],
+        report: BulkScoringReport,
+        failures: list[BaseException],
+    ) -> None:
+        while True:
+            item = results.get()
+            if item is _STOP:
+                return
+            if failures:
+                continue  # keep draining so the scoring side never blocks on a dead writer
+            chunk, payload = item  # type: ignore[misc]
+            try:
+                # a rewritten chunk replaces the rows it wrote before instead of duplicating them
+                self._repository.persist_predictions(payload.assign(model_version=run.model_version))
+                done.add(chunk.key)
+                if self._checkpoint is not None:
+                    self._checkpoint.save(run, done)
+            except Exception as exc:  # noqa: BLE001 - re-raised by execute
+                logger.error("writing predictions of chunk {} failed: {}", chunk.key, exc)
+                failures.append(exc)
+                continue
+            report.scored += 1
+            report.rows += len(payload)
+            logger.info(
+                "chunk {}: {} predictions, {}/{} chunks done", chunk.key, len(payload), len(done), report.chunks
+            )
@@ -3,22 +3,107 @@ from __future__ import annotations
 import pandas as pd
 from loguru import logger
 
+from feature_store_ml.infrastructure.features.clickhouse_pushdown import ClickHouseFeatureEngine
+from feature_store_ml.infrastructure.features.fused import FusedFeatureEngine
 from feature_store_ml.infrastructure.registry import FeatureRegistry
 from feature_store_ml.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
 
 
 class MaterializeFeatures:
-    def __init__(self, repository: ClickHouseRepository, registry: FeatureRegistry) -> None:
+    """Builds the feature view from ``events``.
+
+    With ``incremental`` only buckets whose event count or latest event time
+    changed since the last run are recomputed, together with every later
+    bucket (their trend/volatility depend on the changed ones). The derived
+    features continue from the already materialized rows before the first
+    changed bucket, and the feature tables replace rows by
+    ``(event_time, entity_id)``, so a run costs what arrived since the last
+    one instead of the whole lookback.
+
+    With ``pushdown`` the per-bucket statistics are aggregated by ClickHouse
+    and raw events never leave the database; otherwise ``fused`` replaces
+    the pandas computation of ``registry`` with a single-sort one.
+    """
+
+    def __init__(
+        self,
+        repository: ClickHouseRepository,
+        registry: FeatureRegistry,
+        incremental: bool = False,
+        pushdown: ClickHouseFeatureEngine | None = None,
+        fused: FusedFeatureEngine | None = None,
+    ) -> None:
         self._repository = repository
         self._registry = registry
+        self._incremental = incremental
+        self._pushdown = pushdown
+        self._fused = fused
 
     def execute(self, lookback_hours: int, min_records: int) -> pd.DataFrame:
-        self._repository.ensure_schema()
+        self._repository.ensure_schema(require_replacing=self._incremental)
+        if self._incremental:
+            return self._execute_incremental(lookback_hours, min_records)
+        if self._pushdown is not None:
+            feature_view = self._pushdown.compute(lookback_hours=lookback_hours)
+            events = int(feature_view["value_count"].sum())
+            if events < min_records:
+                raise ValueError(f"not enough rows to materialize features: {events} < {min_records}")
+            logger.info("persisting {} feature rows aggregated from {} events in ClickHouse", len(feature_view), events)
+            self._repository.persist_feature_view(feature_view)
+            return feature_view
         events = self._repository.fetch_events(lookback_hours)
         if len(events) < min_records:
             raise ValueError(f"not enough rows to materialize features: {len(events)} < {min_records}")
         logger.info("building features for %d rows", len(events))
-        feature_view = self._registry.compute(events)
+        feature_view = self._compute(events)
         logger.info("persisting %d feature rows", len(feature_view))
         self._repository.persist_feature_view(feature_view)
         return feature_view
+
+    def _execute_incremental(self, lookback_hours: int, min_records: int) -> pd.DataFrame:
+        current = self._repository.bucket_watermarks(lookback_hours, self._registry.bucket_minutes)
+        stored = self._repository.load_feature_watermarks()
+        if stored.empty and current["events"].sum() < min_records:
+            raise ValueError(f"not enough rows to materialize features: {current['events'].sum()} < {min_records}")
+        changed = changed_buckets(current, stored)
+        if not len(changed):
+            logger.info("feature view is up to date, {} buckets unchanged", len(current))
+            return self._registry.compute(pd.DataFrame())
+
+        start = changed.min()
+        history = self._repository.load_feature_history(
+            since=current["bucket"].min().to_pydatetime(),
+            before=start.to_pydatetime(),
+            rows_per_entity=self._registry.context_rows,
+        )
+        logger.info(
+            "recomputing {} of {} buckets from {} ({} changed, {} events)",
+            int((current["bucket"] >= start).sum()),
+            len(current),
+            start,
+            len(changed),
+            int(current.loc[current["bucket"] >= start, "events"].sum()),
+        )
+        if self._pushdown is not None:
+            feature_view = self._pushdown.compute(since=start.to_pydatetime(), history=history)
+        else:
+            events = self._repository.fetch_events_since(start.to_pydatetime())
+            feature_view = self._compute(events, history=history)
+        self._repository.persist_feature_view(feature_view)
+        # watermarks go last: a run that fails before this point is simply redone
+        self._repository.save_feature_watermarks(current[current["bucket"] >= start])
+        return feature_view
+
+    def _compute(self, events: pd.DataFrame, history: pd.DataFrame | None = None) -> pd.DataFrame:
+        if self._fused is not None:
+            return self._fused.compute(events, history=history)
+        return self._registry.compute(events, history=history)
+
+
+def changed_buckets(current: pd.DataFrame, stored: pd.DataFrame) -> pd.Series:
+    """Buckets that are new or whose event count or latest event time moved."""
+
+    merged = current.merge(stored, on="bucket", how="left", suffixes=("", "_stored"))
+    moved = merged["events"] != merged["events_stored"]
+    moved |= merged["max_event_time"] != merged["max_event_time_stored"]
+    return merged.loc[moved, "bucket"]
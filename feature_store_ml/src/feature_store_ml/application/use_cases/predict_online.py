@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from feature_store_ml.domain.models.prediction import Prediction
+from feature_store_ml.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+from feature_store_ml.infrastructure.serving.batcher import MicroBatcher
+from feature_store_ml.infrastructure.serving.cache import CachedFeatures, FeatureCache
+
+
+class PredictOnline:
+    """Scores entities by id for the online API.
+
+    Latest feature vectors come from ``cache``; only the misses are read
+    from the feature view, in one query per request. The rows are scored
+    through ``batcher``, which folds concurrent requests into one
+    ``booster.predict`` call.
+    """
+
+    def __init__(
+        self,
+        repository: ClickHouseRepository,
+        cache: FeatureCache,
+        batcher: MicroBatcher,
+        feature_names: Sequence[str],
+        threshold: float,
+        timeout: float | None = 5.0,
+    ) -> None:
+        self._repository = repository
+        self._cache = cache
+        self._batcher = batcher
+        self._feature_names = list(feature_names)
+        self._threshold = threshold
+        self._timeout = timeout
+
+    def execute(self, entity_ids: Sequence[int]) -> tuple[list[Prediction], list[int]]:
+        """Predictions for the entities with features, in request order, and the ids without any."""
+
+        ids = list(dict.fromkeys(int(entity_id) for entity_id in entity_ids))
+        found, missing = self._cache.get_many(ids)
+        if missing:
+            loaded = self._load(missing)
+            self._cache.put_many(loaded.items())
+            found.update(loaded)
+        scored = [entity_id for entity_id in ids if entity_id in found]
+        if not scored:
+            return [], ids
+        rows = np.vstack([found[entity_id].vector for entity_id in scored])
+        scores = self._batcher.predict(rows, timeout=self._timeout)
+        predictions = [
+            Prediction(
+                entity_id=entity_id,
+                event_time=found[entity_id].event_time,
+                score=float(score),
+                prediction=int(score >= self._threshold),
+            )
+            for entity_id, score in zip(scored, scores)
+        ]
+        return predictions, [entity_id for entity_id in ids if entity_id not in found]
+
+    def _load(self, entity_ids: list[int]) -> dict[int, CachedFeatures]:
+        frame = self._repository.load_latest_features(entity_ids)
+        if frame.empty:
+            return {}
+        vectors = frame[self._feature_names].to_numpy(dtype=np.float64)
+        return {
+            int(entity_id): CachedFeatures(event_time=event_time, vector=vector)
+            for entity_id, event_time, vector in zip(frame["entity_id"], frame["event_time"], vectors)
+        }
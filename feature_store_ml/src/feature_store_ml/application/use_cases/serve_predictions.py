@@ -32,5 +32,6 @@ class ServePredictions:
         payload = feature_view[["entity_id", "event_time"]].copy()
         payload["score"] = scores
         payload["prediction"] = (payload["score"] >= self._threshold).astype(int)
-        self._repository.persist_predictions(payload[["event_time", "entity_id", "score"]])
+        payload["model_version"] = metadata.get("version", "")
+        self._repository.persist_predictions(payload[["event_time", "entity_id", "score", "model_version"]])
         return payload
@@ -4,6 +4,7 @@ from loguru import logger
 
 from feature_store_ml.domain.models.model_artifact import ModelArtifact
 from feature_store_ml.infrastructure.datasets.builder import DatasetBuilder
+from feature_store_ml.infrastructure.datasets.streaming import StreamingDatasetBuilder
 from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
 from feature_store_ml.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
 
@@ -14,12 +15,22 @@ class TrainModel:
         repository: ClickHouseRepository,
         dataset_builder: DatasetBuilder,
         trainer: LightGBMTrainer,
+        streaming: StreamingDatasetBuilder | None = None,
+        block_rows: int = 100_000,
     ) -> None:
         self._repository = repository
         self._dataset_builder = dataset_builder
         self._trainer = trainer
+        self._streaming = streaming
+        self._block_rows = block_rows
 
     def execute(self, lookback_hours: int) -> ModelArtifact:
+        if self._streaming is not None:
+            dataset = self._streaming.build(self._repository.stream_feature_view(lookback_hours, self._block_rows))
+            try:
+                return self._trainer.train_streamed(dataset)
+            finally:
+                dataset.remove()
         feature_view = self._repository.load_feature_view(lookback_hours)
         if feature_view.empty:
             raise RuntimeError("feature view is empty, run materialization first")
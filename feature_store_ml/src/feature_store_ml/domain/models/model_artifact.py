@@ -8,3 +8,4 @@ from pathlib import Path
 class ModelArtifact:
     model_path: Path
     feature_names: tuple[str, ...]
+    version: str | None = None
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True)
+class Prediction:
+    """Скор сущности по её последнему вектору фичей."""
+
+    entity_id: int
+    event_time: datetime
+    score: float
+    prediction: int
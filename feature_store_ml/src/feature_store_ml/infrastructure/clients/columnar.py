@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+from contextlib import AbstractContextManager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Mapping, Protocol, Sequence
+
+import numpy as np
+import pandas as pd
+
+Column = Sequence[Any] | np.ndarray | pd.Series
+
+
+class InsertClient(Protocol):
+    def insert(
+        self,
+        table: str,
+        data: Sequence[Sequence[Any]],
+        column_names: Sequence[str],
+        column_oriented: bool = False,
+        settings: dict[str, Any] | None = None,
+    ) -> Any:
+        ...
+
+    def raw_insert(
+        self,
+        table: str,
+        column_names: Sequence[str] | None = None,
+        insert_block: bytes | None = None,
+        settings: dict[str, Any] | None = None,
+        fmt: str | None = None,
+    ) -> Any:
+        ...
+
+
+class InsertClientFactory(Protocol):
+    def connect(self) -> AbstractContextManager[InsertClient]:
+        ...
+
+
+@dataclass(slots=True)
+class WriteMetrics:
+    inserts: int = 0
+    rows: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class ColumnarWriter:
+    """Bulk writes through clickhouse-connect's column-oriented ``insert``.
+
+    Callers hand over whole columns, so no per-row dict or tuple is built on
+    the way to the driver. Writes larger than ``batch_rows`` are split into
+    several inserts on one pooled client. With ``async_insert`` the server
+    buffers small inserts instead of creating a part for every call.
+    """
+
+    def __init__(
+        self,
+        factory: InsertClientFactory,
+        batch_rows: int = 100_000,
+        async_insert: bool = False,
+        wait_for_async_insert: bool = True,
+    ) -> None:
+        if batch_rows < 1:
+            raise ValueError("insert batch_rows must be positive")
+        self._factory = factory
+        self._batch_rows = batch_rows
+        self._settings: dict[str, Any] | None = (
+            {"async_insert": 1, "wait_for_async_insert": int(wait_for_async_insert)} if async_insert else None
+        )
+        self._lock = threading.Lock()
+        self._metrics = WriteMetrics()
+
+    @property
+    def metrics(self) -> WriteMetrics:
+        with self._lock:
+            return WriteMetrics(**self._metrics.as_dict())
+
+    def write(self, table: str, columns: Mapping[str, Column]) -> int:
+        """Insert equally long columns into ``table`` and return the number of rows written."""
+
+        names = list(columns)
+        data = [native_column(columns[name]) for name in names]
+        rows = len(data[0]) if data else 0
+        if any(len(column) != rows for column in data):
+            raise ValueError(f"columns written to {table} differ in length")
+        if not rows:
+            return 0
+        inserts = 0
+        with self._factory.connect() as client:
+            for start in range(0, rows, self._batch_rows):
+                batch = data if rows <= self._batch_rows else [c[start : start + self._batch_rows] for c in data]
+                client.insert(table, batch, column_names=names, column_oriented=True, settings=self._settings)
+                inserts += 1
+        with self._lock:
+            self._metrics.inserts += inserts
+            self._metrics.rows += rows
+        return rows
+
+    def write_frame(self, table: str, frame: pd.DataFrame, columns: Sequence[str] | None = None) -> int:
+        return self.write(table, {name: frame[name] for name in (columns or frame.columns)})
+
+    def write_native(
+        self, table: str, column_names: Sequence[str], rows: int, encode: Callable[[int, int], bytes]
+    ) -> int:
+        """Insert blocks that ``encode(start, stop)`` renders in ClickHouse's Native format.
+
+        Used where the caller can encode a block faster than the driver;
+        rows are still split into inserts of ``batch_rows``.
+        """
+
+        if not rows:
+            return 0
+        inserts = 0
+        with self._factory.connect() as client:
+            for start in range(0, rows, self._batch_rows):
+                block = encode(start, min(start + self._batch_rows, rows))
+                client.raw_insert(table, list(column_names), block, settings=self._settings, fmt="Native")
+                inserts += 1
+        with self._lock:
+            self._metrics.inserts += inserts
+            self._metrics.rows += rows
+        return rows
+
+
+def native_column(column: Column) -> list[Any]:
+    """Turn a column into the list of Python values the driver serializes.
+
+    NumPy data is converted in a single C-level ``tolist`` pass; datetimes
+    become epoch seconds, which ``DateTime`` columns accept as they are.
+    """
+
+    if isinstance(column, pd.Series):
+        column = column.to_numpy()
+    if isinstance(column, np.ndarray):
+        if column.dtype.kind == "M":
+            return column.astype("datetime64[s]").astype(np.int64).tolist()
+        return column.tolist()
+    return column if isinstance(column, list) else list(column)
@@ -13,6 +13,13 @@ class ClickHouseConfig:
     database: str
     username: str
     password: str
+    pool_size: int = 4
+    pool_idle_timeout: float = 300.0
+    pool_health_check_interval: float = 30.0
+    compression: bool | str = True
+    insert_batch_rows: int = 100_000
+    async_insert: bool = False
+    wait_for_async_insert: bool = True
 
 
 @dataclass(slots=True)
@@ -20,6 +27,12 @@ class FeatureConfig:
     lookback_hours: int
     bucket_minutes: int
     min_records: int
+    layout: str = "map"
+    read_dtype: str = "float64"
+    incremental: bool = False
+    engine: str = "pandas"
+    quantile_method: str = "exact"
+    local_engine: str = "pandas"
 
 
 @dataclass(slots=True)
@@ -29,12 +42,28 @@ class TrainingConfig:
     num_boost_round: int
     learning_rate: float
     max_depth: int
+    keep_versions: int = 3
+    dataset: str = "memory"
+    stream_block_rows: int = 100_000
+    dataset_dir: str | None = None
 
 
 @dataclass(slots=True)
 class ServingConfig:
     batch_size: int
     threshold: float
+    cache_size: int = 100_000
+    cache_ttl_seconds: float = 60.0
+    max_batch_rows: int = 1024
+    batch_wait_ms: float = 0.0
+    reload_interval_seconds: float = 5.0
+    engine: str = "lightgbm"
+    bulk_chunk_minutes: int = 60
+    bulk_entity_partitions: int = 1
+    bulk_workers: int = 2
+    bulk_queue_size: int = 4
+    bulk_lookback_hours: int = 24
+    bulk_checkpoint_path: str | None = None
 
 
 @dataclass(slots=True)
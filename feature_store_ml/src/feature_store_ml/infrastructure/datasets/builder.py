@@ -15,7 +15,9 @@ class DatasetBuilder:
         missing = [column for column in feature_columns if column not in frame.columns]
         if missing:
             raise KeyError(f"missing feature columns: {missing}")
-        features = frame[feature_columns].fillna(0.0)
+        features = frame[list(feature_columns)]
+        if features.isna().to_numpy().any():
+            features = features.fillna(0.0)
         target = frame.get("label")
         if target is None:
             target = pd.Series(0, index=frame.index)
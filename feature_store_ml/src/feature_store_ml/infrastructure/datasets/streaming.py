@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import resource
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from feature_store_ml.infrastructure.registry import FeatureRegistry
+
+_SPLITS = ("train", "valid")
+_SUFFIXES = ("features.f32", "target.u8")
+
+
+def peak_rss_mb() -> float:
+    """High-water mark of this process's resident memory (Linux reports ``ru_maxrss`` in KiB)."""
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def validation_mask(entity_ids: np.ndarray, fraction: float, seed: int = 0) -> np.ndarray:
+    """Rows of entities whose splitmix64 hash falls in the validation ``fraction``.
+
+    The hash depends only on the entity and ``seed``, so an entity lands on
+    the same side in every chunk and every run, and never on both.
+    """
+
+    hashed = entity_ids.astype(np.uint64) ^ np.uint64(seed & 0xFFFFFFFFFFFFFFFF)
+    hashed = hashed + np.uint64(0x9E3779B97F4A7C15)
+    hashed = (hashed ^ (hashed >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    hashed = (hashed ^ (hashed >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    hashed = hashed ^ (hashed >> np.uint64(31))
+    return (hashed >> np.uint64(11)) < np.uint64(int(fraction * (1 << 53)))
+
+
+@dataclass(slots=True)
+class StreamingStats:
+    chunks: int = 0
+    rows: int = 0
+    train_rows: int = 0
+    valid_rows: int = 0
+    largest_chunk_rows: int = 0
+    bytes_on_disk: int = 0
+    peak_rss_mb: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return asdict(self)
+
+
+@dataclass(frozen=True, slots=True)
+class TrainingMatrix:
+    """Float32 features and uint8 labels of one split, memory-mapped read-only from disk."""
+
+    features: np.ndarray
+    target: np.ndarray
+
+    @property
+    def rows(self) -> int:
+        return len(self.target)
+
+
+@dataclass(slots=True)
+class StreamedDataset:
+    train: TrainingMatrix
+    valid: TrainingMatrix
+    feature_names: tuple[str, ...]
+    directory: Path
+    stats: StreamingStats = field(default_factory=StreamingStats)
+
+    def remove(self) -> None:
+        """Delete the backing files; mappings still open keep working until they are dropped."""
+
+        _remove_files(self.directory)
+
+
+def _remove_files(directory: Path) -> None:
+    for split in _SPLITS:
+        for suffix in _SUFFIXES:
+            (directory / f"{split}.{suffix}").unlink(missing_ok=True)
+
+
+class StreamingDatasetBuilder:
+    """Writes feature view chunks to on-disk float32 matrices without holding the whole view.
+
+    Each chunk is converted to float32 (NaN filled with 0.0, as
+    ``DatasetBuilder`` does), split by a hash of ``entity_id`` and appended
+    to the train or validation files, so memory stays at one chunk however
+    long the range is. The result is memory-mapped and can be handed to
+    ``lgb.Dataset`` without another copy.
+    """
+
+    def __init__(
+        self, registry: FeatureRegistry, directory: Path, validation_fraction: float, seed: int = 0
+    ) -> None:
+        if not 0.0 < validation_fraction < 1.0:
+            raise ValueError("validation_fraction must be between 0 and 1")
+        self._registry = registry
+        self._directory = Path(directory)
+        self._validation_fraction = validation_fraction
+        self._seed = seed
+
+    def build(self, chunks: Iterable[pd.DataFrame]) -> StreamedDataset:
+        """Write ``chunks`` to disk and map them; on any failure the partly written files are deleted."""
+
+        try:
+            return self._build(chunks)
+        except BaseException:
+            _remove_files(self._directory)
+            raise
+
+    def _build(self, chunks: Iterable[pd.DataFrame]) -> StreamedDataset:
+        names = list(self._registry.feature_names)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        stats = StreamingStats()
+        rows = dict.fromkeys(_SPLITS, 0)
+        handles: dict[str, BinaryIO] = {}
+        try:
+            for split in _SPLITS:
+                for suffix in _SUFFIXES:
+                    handles[f"{split}.{suffix}"] = open(self._directory / f"{split}.{suffix}", "wb")
+            for frame in chunks:
+                if frame.empty:
+                    continue
+                missing = [column for column in names if column not in frame.columns]
+                if missing:
+                    raise KeyError(f"missing feature columns: {missing}")
+                matrix = frame[names].to_numpy(dtype=np.float32)
+                matrix[np.isnan(matrix)] = 0.0
+                labels = frame["label"].to_numpy() if "label" in frame.columns else np.zeros(len(frame))
+                target = (labels > 0).astype(np.uint8)
+                valid = validation_mask(frame["entity_id"].to_numpy(), self._validation_fraction, self._seed)
+                for split, mask in (("train", ~valid), ("valid", valid)):
+                    matrix[mask].tofile(handles[f"{split}.features.f32"])
+                    target[mask].tofile(handles[f"{split}.target.u8"])
+                    rows[split] += int(mask.sum())
+                stats.chunks += 1
+                stats.rows += len(frame)
+                stats.largest_chunk_rows = max(stats.largest_chunk_rows, len(frame))
+        finally:
+            for handle in handles.values():
+                handle.close()
+        stats.train_rows, stats.valid_rows = rows["train"], rows["valid"]
+        stats.bytes_on_disk = sum((self._directory / name).stat().st_size for name in handles)
+        stats.peak_rss_mb = peak_rss_mb()
+        if not stats.train_rows:
+            raise RuntimeError("feature view is empty, run materialization first")
+        logger.info(
+            "streamed {} rows in {} chunks to {} ({} train, {} validation, {:.1f} MB)",
+            stats.rows,
+            stats.chunks,
+            self._directory,
+            stats.train_rows,
+            stats.valid_rows,
+            stats.bytes_on_disk / 1e6,
+        )
+        return StreamedDataset(
+            train=self._open("train", rows["train"], len(names)),
+            valid=self._open("valid", rows["valid"], len(names)),
+            feature_names=tuple(names),
+            directory=self._directory,
+            stats=stats,
+        )
+
+    def _open(self, split: str, rows: int, width: int) -> TrainingMatrix:
+        if not rows:
+            return TrainingMatrix(np.empty((0, width), dtype=np.float32), np.empty(0, dtype=np.uint8))
+        features = np.memmap(self._directory / f"{split}.features.f32", dtype=np.float32, mode="r", shape=(rows, width))
+        target = np.memmap(self._directory / f"{split}.target.u8", dtype=np.uint8, mode="r", shape=(rows,))
+        return TrainingMatrix(features, target)
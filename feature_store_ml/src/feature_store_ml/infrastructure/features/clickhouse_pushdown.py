@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Protocol, Sequence
+
+import pandas as pd
+
+from feature_store_ml.infrastructure.registry import FeatureRegistry
+
+QUANTILE_FUNCTIONS = {
+    # quantilesExactInclusive interpolates linearly, exactly like pandas' default
+    "exact": "quantilesExactInclusive",
+    "tdigest": "quantilesTDigest",
+}
+
+
+class BucketStatsReader(Protocol):
+    def query_bucket_stats(
+        self,
+        expressions: Sequence[str],
+        bucket_minutes: int,
+        lookback_hours: int | None = None,
+        since: datetime | None = None,
+    ) -> pd.DataFrame:
+        ...
+
+
+class ClickHouseFeatureEngine:
+    """Computes the per-bucket part of the feature view inside ClickHouse.
+
+    One ``GROUP BY entity_id, bucket`` query returns every bucket statistic,
+    both quantiles and the label; only ``value_trend``/``value_volatility``,
+    which span consecutive buckets, are finished by the registry in pandas.
+    """
+
+    def __init__(self, reader: BucketStatsReader, registry: FeatureRegistry, quantile_method: str = "exact") -> None:
+        if quantile_method not in QUANTILE_FUNCTIONS:
+            raise ValueError(f"unknown quantile method {quantile_method}")
+        self._reader = reader
+        self._registry = registry
+        self._quantile_function = QUANTILE_FUNCTIONS[quantile_method]
+
+    def expressions(self) -> tuple[str, ...]:
+        # aliases must not reuse source column names: ClickHouse resolves aliases before columns
+        return (
+            "avg(value) AS value_mean",
+            "ifNotFinite(stddevSamp(value), 0) AS value_std",
+            "count() AS value_count",
+            f"{self._quantile_function}(0.05, 0.95)(value) AS value_quantiles",
+            "value_quantiles[1] AS value_p05",
+            "value_quantiles[2] AS value_p95",
+            "value_p95 - value_p05 AS value_iqr",
+            "avg(attribute) AS attribute_mean",
+            "max(label) AS label_max",
+        )
+
+    def compute(
+        self,
+        lookback_hours: int | None = None,
+        since: datetime | None = None,
+        history: pd.DataFrame | None = None,
+    ) -> pd.DataFrame:
+        """Feature view of the events in the lookback, or of those at or after ``since``."""
+
+        stats = self._reader.query_bucket_stats(
+            self.expressions(), self._registry.bucket_minutes, lookback_hours=lookback_hours, since=since
+        )
+        stats = stats.drop(columns="value_quantiles", errors="ignore").rename(columns={"label_max": "label"})
+        return self._registry.finish(stats, history)
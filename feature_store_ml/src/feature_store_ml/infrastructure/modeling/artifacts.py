@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Mapping
+
+import lightgbm as lgb
+from loguru import logger
+
+from feature_store_ml.infrastructure.modeling.compiled import CompiledTrees
+
+MODEL_FILE = "model.txt"
+MANIFEST_FILE = "manifest.json"
+COMPILED_DIR = "compiled"
+LATEST_FILE = "LATEST"
+
+
+@dataclass(frozen=True, slots=True)
+class ModelManifest:
+    """What ``manifest.json`` of a version directory records about its model."""
+
+    version: str
+    created_at: str
+    features: tuple[str, ...]
+    sha256: str
+    size: int
+    num_trees: int
+    auc: float | None = None
+    dtypes: dict[str, str] = field(default_factory=dict)
+    training: dict[str, float] = field(default_factory=dict)
+    model_file: str = MODEL_FILE
+    format: str = "lightgbm-text"
+
+    def as_dict(self) -> dict[str, object]:
+        return {**asdict(self), "features": list(self.features)}
+
+    @classmethod
+    def from_dict(cls, raw: Mapping[str, object]) -> "ModelManifest":
+        known = {name: raw[name] for name in cls.__dataclass_fields__ if name in raw}
+        return cls(**{**known, "features": tuple(raw["features"])})  # type: ignore[arg-type]
+
+
+class ModelVersion:
+    """One version directory; the booster is parsed on first use, not when the version is opened."""
+
+    def __init__(
+        self, directory: Path, manifest: ModelManifest, verify: bool = True, booster: lgb.Booster | None = None
+    ) -> None:
+        self.directory = directory
+        self.manifest = manifest
+        self._verify = verify
+        self._booster = booster
+        self._compiled: CompiledTrees | None = None
+        self._lock = threading.RLock()
+
+    @property
+    def version(self) -> str:
+        return self.manifest.version
+
+    @property
+    def model_path(self) -> Path:
+        return self.directory / self.manifest.model_file
+
+    @property
+    def booster(self) -> lgb.Booster:
+        if self._booster is None:
+            with self._lock:
+                if self._booster is None:
+                    self._booster = self._load()
+        return self._booster
+
+    @property
+    def compiled(self) -> CompiledTrees:
+        """The trees as NumPy arrays, memory-mapped from ``compiled/`` when training wrote them."""
+
+        if self._compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    self._compiled = self._load_compiled()
+        return self._compiled
+
+    def _load_compiled(self) -> CompiledTrees:
+        directory = self.directory / COMPILED_DIR
+        if directory.exists():
+            compiled = CompiledTrees.load(directory)
+        else:
+            compiled = CompiledTrees.from_booster(self.booster)
+        if compiled.feature_names != self.manifest.features:
+            raise ValueError(f"compiled trees of model {self.version} do not match the features of its manifest")
+        return compiled
+
+    def _load(self) -> lgb.Booster:
+        # the text is read through the page cache, which every process on the host shares
+        with open(self.model_path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            if self._verify and hashlib.sha256(view).hexdigest() != self.manifest.sha256:
+                raise ValueError(f"model {self.version} does not match the hash in its manifest")
+            text = str(view, "utf-8")
+        booster = lgb.Booster(model_str=text)
+        if tuple(booster.feature_name()) != self.manifest.features:
+            raise ValueError(f"manifest of model {self.version} lists features that do not match the booster")
+        return booster
+
+
+class ModelStore:
+    """Versioned model directories under ``root`` with a ``LATEST`` pointer.
+
+    Each version is ``<root>/<version>/`` holding the native LightGBM text
+    model, ``manifest.json`` (features, dtypes, AUC, tree count, training
+    stats and the SHA-256 of the model file) and, when the trees compile, their NumPy
+    arrays in ``compiled/``. A version is written to a temporary
+    directory and renamed into place before ``LATEST`` is replaced, so
+    readers never see a half written model. The newest ``keep`` versions
+    stay on disk for rollback.
+    """
+
+    def __init__(self, root: Path, keep: int = 3) -> None:
+        if keep < 1:
+            raise ValueError("keep must be at least 1")
+        self._root = Path(root)
+        self._keep = keep
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def publish(
+        self,
+        booster: lgb.Booster,
+        auc: float | None = None,
+        dtypes: Mapping[str, str] | None = None,
+        training: Mapping[str, float] | None = None,
+    ) -> ModelVersion:
+        text = booster.model_to_string().encode("utf-8")
+        digest = hashlib.sha256(text).hexdigest()
+        created = datetime.now(timezone.utc)
+        version = f"{created:%Y%m%dT%H%M%S%f}-{digest[:8]}"
+        manifest = ModelManifest(
+            version=version,
+            created_at=created.isoformat(),
+            features=tuple(booster.feature_name()),
+            sha256=digest,
+            size=len(text),
+            num_trees=booster.num_trees(),
+            auc=None if auc is None else float(auc),
+            dtypes=dict(dtypes or {}),
+            training=dict(training or {}),
+        )
+        self._root.mkdir(parents=True, exist_ok=True)
+        staging = self._root / f".{version}.tmp"
+        staging.mkdir()
+        (staging / MODEL_FILE).write_bytes(text)
+        (staging / MANIFEST_FILE).write_text(json.dumps(manifest.as_dict(), indent=2), encoding="utf-8")
+        try:
+            CompiledTrees.from_booster(booster).save(staging / COMPILED_DIR)
+        except ValueError as exc:
+            logger.info("model {} is served by LightGBM only: {}", version, exc)
+        os.replace(staging, self._root / version)
+        pointer = self._root / f".{LATEST_FILE}.tmp"
+        pointer.write_text(version, encoding="utf-8")
+        os.replace(pointer, self._root / LATEST_FILE)
+        self._prune(version)
+        logger.info("published model {} ({} trees, {} bytes)", version, manifest.num_trees, manifest.size)
+        return ModelVersion(self._root / version, manifest, booster=booster)
+
+    def latest_version(self) -> str | None:
+        try:
+            return (self._root / LATEST_FILE).read_text(encoding="utf-8").strip() or None
+        except FileNotFoundError:
+            return None
+
+    def versions(self) -> list[str]:
+        """Versions on disk, oldest first; the names sort by creation time."""
+
+        if not self._root.exists():
+            return []
+        return sorted(
+            path.name for path in self._root.iterdir() if path.is_dir() and not path.name.startswith(".")
+        )
+
+    def open(self, version: str | None = None, verify: bool = True) -> ModelVersion:
+        """Read the manifest of ``version`` (default: the latest); the booster itself loads lazily."""
+
+        version = version or self.latest_version()
+        if version is None:
+            raise FileNotFoundError(f"no model has been published to {self._root}, run training first")
+        directory = self._root / version
+        raw = json.loads((directory / MANIFEST_FILE).read_text(encoding="utf-8"))
+        return ModelVersion(directory, ModelManifest.from_dict(raw), verify=verify)
+
+    def _prune(self, latest: str) -> None:
+        versions = self.versions()
+        for version in versions[: max(0, len(versions) - self._keep)]:
+            if version != latest:
+                shutil.rmtree(self._root / version, ignore_errors=True)
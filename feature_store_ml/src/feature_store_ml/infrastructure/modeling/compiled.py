@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import lightgbm as lgb
+import numpy as np
+
+# objectives whose prediction is the raw tree sum
+_IDENTITY_OBJECTIVES = {"regression", "regression_l1", "huber", "fair", "quantile", "mape"}
+# LightGBM treats |x| <= kZeroThreshold as zero for zero_as_missing splits
+_ZERO_THRESHOLD = 1e-35
+_ARRAYS = ("feature", "threshold", "children", "nan_left", "default_left", "zero_missing", "value", "roots")
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledTrees:
+    """A booster's trees as flat node arrays, evaluated with vectorized NumPy traversal.
+
+    Node ``i`` sends a row to ``children[i, 1]`` when its ``feature`` is
+    ``<= threshold[i]`` and to ``children[i, 0]`` otherwise; leaves point at
+    themselves, so every row simply takes ``depth`` steps from each root and
+    ends on a leaf. Thresholds are rounded down to float32, which keeps the
+    comparisons of float32 rows identical to LightGBM's float64 ones.
+    """
+
+    feature: np.ndarray
+    threshold: np.ndarray
+    children: np.ndarray
+    nan_left: np.ndarray
+    default_left: np.ndarray
+    zero_missing: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    depth: int
+    sigmoid: float | None
+    feature_names: tuple[str, ...]
+
+    @classmethod
+    def from_booster(cls, booster: lgb.Booster) -> "CompiledTrees":
+        """Compile ``booster``; raises ``ValueError`` for models this engine cannot evaluate."""
+
+        dump = booster.dump_model()
+        objective, *options = dump["objective"].split()
+        if dump["num_tree_per_iteration"] != 1 or dump.get("average_output"):
+            raise ValueError("only single-output gradient boosted models can be compiled")
+        if objective == "binary":
+            sigmoid: float | None = float(dict(option.split(":") for option in options).get("sigmoid", 1.0))
+        elif objective in _IDENTITY_OBJECTIVES:
+            sigmoid = None
+        else:
+            raise ValueError(f"objective {objective} cannot be compiled")
+
+        nodes: list[tuple[int, float, bool, bool, bool, float]] = []
+        children: list[list[int]] = []
+        depth = 0
+
+        def walk(node: dict, level: int) -> int:
+            nonlocal depth
+            index = len(nodes)
+            children.append([index, index])
+            if "leaf_value" in node:
+                nodes.append((0, 0.0, True, True, False, node["leaf_value"]))
+                depth = max(depth, level)
+                return index
+            if node["decision_type"] != "<=":
+                raise ValueError("categorical splits cannot be compiled")
+            threshold, missing = node["threshold"], node["missing_type"]
+            default_left = bool(node["default_left"])
+            # without a missing type LightGBM reads NaN as 0.0
+            nan_left = default_left if missing in ("NaN", "Zero") else 0.0 <= threshold
+            nodes.append((node["split_feature"], threshold, nan_left, default_left, missing == "Zero", 0.0))
+            children[index] = [walk(node["right_child"], level + 1), walk(node["left_child"], level + 1)]
+            return index
+
+        roots = [walk(tree["tree_structure"], 0) for tree in dump["tree_info"]]
+        feature, threshold, nan_left, default_left, zero_missing, value = zip(*nodes)
+        exact = np.asarray(threshold, dtype=np.float64)
+        with np.errstate(over="ignore"):
+            rounded = exact.astype(np.float32)
+        rounded = np.where(rounded > exact, np.nextafter(rounded, np.float32(-np.inf)), rounded)
+        return cls(
+            feature=np.asarray(feature, dtype=np.intp),
+            threshold=rounded.astype(np.float32),
+            children=np.asarray(children, dtype=np.intp),
+            nan_left=np.asarray(nan_left, dtype=bool),
+            default_left=np.asarray(default_left, dtype=bool),
+            zero_missing=np.asarray(zero_missing, dtype=bool),
+            value=np.asarray(value, dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            depth=depth,
+            sigmoid=sigmoid,
+            feature_names=tuple(dump["feature_names"]),
+        )
+
+    def predict(self, rows: np.ndarray, block: int = 1 << 15) -> np.ndarray:
+        """Score a 2-D matrix whose columns follow ``feature_names``; rows are evaluated as float32."""
+
+        rows = np.ascontiguousarray(rows, dtype=np.float32)
+        if rows.ndim != 2 or rows.shape[1] != len(self.feature_names):
+            raise ValueError(f"expected rows with {len(self.feature_names)} features, got shape {rows.shape}")
+        # rows * trees nodes are walked at once; blocks keep those arrays in cache
+        step = max(1, block // max(1, len(self.roots)))
+        raw = np.zeros(len(rows))
+        for start in range(0, len(rows), step):
+            raw[start : start + step] = self._raw(rows[start : start + step])
+        if self.sigmoid is None:
+            return raw
+        return 1.0 / (1.0 + np.exp(-self.sigmoid * raw))
+
+    def _raw(self, rows: np.ndarray) -> np.ndarray:
+        count, width = rows.shape
+        flat = rows.ravel()
+        offsets = np.repeat(np.arange(count, dtype=np.intp) * width, len(self.roots))
+        node = np.tile(self.roots, count)
+        children = self.children.ravel()
+        has_nan = bool(np.isnan(flat).any())
+        has_zero_missing = bool(self.zero_missing.any())
+        for _ in range(self.depth):
+            values = flat.take(offsets + self.feature.take(node))
+            left = values <= self.threshold.take(node)
+            if has_nan:
+                missing = np.isnan(values)
+                left[missing] = self.nan_left.take(node[missing])
+            if has_zero_missing:
+                zero = (np.abs(values) <= _ZERO_THRESHOLD) & self.zero_missing.take(node)
+                left[zero] = self.default_left.take(node[zero])
+            node = children.take(node * 2 + left)
+        return self.value.take(node).reshape(count, -1).sum(axis=1)
+
+    def save(self, directory: Path) -> None:
+        """One ``.npy`` per array, so :meth:`load` can memory-map them."""
+
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        meta = {"depth": self.depth, "sigmoid": self.sigmoid, "feature_names": list(self.feature_names)}
+        (directory / "trees.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: Path) -> "CompiledTrees":
+        """Map the arrays read-only: processes scoring the same model share their pages."""
+
+        meta = json.loads((directory / "trees.json").read_text(encoding="utf-8"))
+        arrays = {name: np.asarray(np.load(directory / f"{name}.npy", mmap_mode="r")) for name in _ARRAYS}
+        return cls(
+            **arrays, depth=meta["depth"], sigmoid=meta["sigmoid"], feature_names=tuple(meta["feature_names"])
+        )
@@ -2,15 +2,17 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import joblib
 import lightgbm as lgb
-import pandas as pd
+import numpy as np
+from loguru import logger
 from sklearn.metrics import roc_auc_score
 from sklearn.model_selection import train_test_split
 
 from feature_store_ml.domain.models.dataset import FeatureDataset
 from feature_store_ml.domain.models.model_artifact import ModelArtifact
 from feature_store_ml.infrastructure.config import TrainingConfig
+from feature_store_ml.infrastructure.datasets.streaming import StreamedDataset, peak_rss_mb
+from feature_store_ml.infrastructure.modeling.artifacts import ModelStore, ModelVersion
 
 
 class LightGBMTrainer:
@@ -18,6 +20,11 @@ class LightGBMTrainer:
         self._config = config
         self._artifacts_dir = artifacts_dir
         self._artifacts_dir.mkdir(parents=True, exist_ok=True)
+        self._store = ModelStore(artifacts_dir / "models", keep=config.keep_versions)
+
+    @property
+    def store(self) -> ModelStore:
+        return self._store
 
     def train(self, dataset: FeatureDataset) -> ModelArtifact:
         X_train, X_test, y_train, y_test = train_test_split(
@@ -29,31 +36,70 @@ class LightGBMTrainer:
         )
         train_set = lgb.Dataset(X_train, label=y_train)
         valid_set = lgb.Dataset(X_test, label=y_test)
+        booster = self._fit(train_set, valid_set)
+        predictions = booster.predict(X_test)
+        auc = roc_auc_score(y_test, predictions)
+        return self._publish(
+            booster,
+            auc=auc,
+            dtypes={name: str(dtype) for name, dtype in dataset.features.dtypes.items()},
+        )
+
+    def train_streamed(self, dataset: StreamedDataset) -> ModelArtifact:
+        """Train on the memory-mapped splits of a streamed dataset; LightGBM bins rows straight from the mapping."""
+
+        names = list(dataset.feature_names)
+        train_set = lgb.Dataset(dataset.train.features, label=dataset.train.target, feature_name=names)
+        valid_set = None
+        if dataset.valid.rows:
+            valid_set = train_set.create_valid(dataset.valid.features, label=dataset.valid.target)
+        booster = self._fit(train_set, valid_set)
+        auc = None
+        if len(np.unique(dataset.valid.target)) == 2:
+            auc = roc_auc_score(dataset.valid.target, booster.predict(dataset.valid.features))
+        training = {**dataset.stats.as_dict(), "peak_rss_mb_trained": peak_rss_mb()}
+        logger.info("trained on {} rows, peak rss {:.0f} MB", dataset.train.rows, training["peak_rss_mb_trained"])
+        return self._publish(booster, auc=auc, dtypes=dict.fromkeys(names, "float32"), training=training)
+
+    def artifact_version(self) -> str | None:
+        """The latest published model version; ``None`` before the first training run."""
+
+        return self._store.latest_version()
+
+    def open(self, version: str | None = None) -> ModelVersion:
+        """The manifest of ``version`` (default: the latest) with a lazily parsed booster."""
+
+        return self._store.open(version)
+
+    def load(self, version: str | None = None) -> tuple[lgb.Booster, dict[str, object]]:
+        model = self.open(version)
+        return model.booster, model.manifest.as_dict()
+
+    def _fit(self, train_set: lgb.Dataset, valid_set: lgb.Dataset | None) -> lgb.Booster:
         params = {
             "objective": "binary",
             "learning_rate": self._config.learning_rate,
             "max_depth": self._config.max_depth,
             "metric": ["auc"],
+            "verbose": -1,
         }
-        booster = lgb.train(
+        return lgb.train(
             params=params,
             train_set=train_set,
             num_boost_round=self._config.num_boost_round,
-            valid_sets=[valid_set],
-            verbose_eval=False,
+            valid_sets=[valid_set] if valid_set is not None else None,
         )
-        predictions = booster.predict(X_test)
-        auc = roc_auc_score(y_test, predictions)
-        model_path = self._artifacts_dir / "lightgbm_model.pkl"
-        joblib.dump(booster, model_path)
-        metadata = {
-            "auc": auc,
-            "features": list(dataset.features.columns),
-        }
-        joblib.dump(metadata, self._artifacts_dir / "metadata.pkl")
-        return ModelArtifact(model_path=model_path, feature_names=tuple(dataset.features.columns))
 
-    def load(self) -> tuple[lgb.Booster, dict[str, object]]:
-        model = joblib.load(self._artifacts_dir / "lightgbm_model.pkl")
-        metadata = joblib.load(self._artifacts_dir / "metadata.pkl")
-        return model, metadata
+    def _publish(
+        self,
+        booster: lgb.Booster,
+        auc: float | None,
+        dtypes: dict[str, str],
+        training: dict[str, float] | None = None,
+    ) -> ModelArtifact:
+        published = self._store.publish(booster, auc=auc, dtypes=dtypes, training=training)
+        return ModelArtifact(
+            model_path=published.model_path,
+            feature_names=published.manifest.features,
+            version=published.version,
+        )
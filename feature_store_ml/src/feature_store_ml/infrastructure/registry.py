@@ -31,10 +31,23 @@ class FeatureRegistry:
             "value_volatility",
         )
 
-    def compute(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+    @property
+    def context_rows(self) -> int:
+        """Earlier rows per entity that ``value_trend``/``value_volatility`` of a row depend on."""
+
+        return 2
+
+    def compute(self, dataframe: pd.DataFrame, history: pd.DataFrame | None = None) -> pd.DataFrame:
+        """Bucket features of ``dataframe``.
+
+        ``history`` holds already materialized ``entity_id``/``event_time``/
+        ``value_mean`` rows preceding the buckets in ``dataframe``; the
+        derived features of the first buckets then continue from them
+        instead of starting over.
+        """
+
         if dataframe.empty:
-            columns = ["entity_id", "event_time", "label", *self.feature_names]
-            return pd.DataFrame(columns=columns)
+            return self.finish(pd.DataFrame())
 
         frame = dataframe.copy()
         frame["bucket"] = frame["event_time"].dt.floor(f"{self.bucket_minutes}min")
@@ -54,8 +67,26 @@ class FeatureRegistry:
 
         attribute = grouped["attribute"].agg(attribute_mean="mean")
         stats = stats.join(attribute)
+        stats = stats.join(grouped["label"].max())
 
         stats = stats.reset_index().rename(columns={"bucket": "event_time"})
+        return self.finish(stats, history)
+
+    def finish(self, stats: pd.DataFrame, history: pd.DataFrame | None = None) -> pd.DataFrame:
+        """Add the cross-bucket features to per-bucket stats.
+
+        ``stats`` has one row per entity and bucket (``event_time``) with the
+        label and every feature except ``value_trend``/``value_volatility``,
+        which follow from consecutive buckets of an entity.
+        """
+
+        columns = ["entity_id", "event_time", "label", *self.feature_names]
+        if stats.empty:
+            return pd.DataFrame(columns=columns)
+        dtypes = stats.dtypes
+        if history is not None and not history.empty:
+            context = history[["entity_id", "event_time", "value_mean"]].assign(_context=True)
+            stats = pd.concat([context, stats.assign(_context=False)], ignore_index=True)
         stats = stats.sort_values(["entity_id", "event_time"]).reset_index(drop=True)
 
         stats["value_trend"] = stats.groupby("entity_id")["value_mean"].diff().fillna(0.0)
@@ -66,9 +97,9 @@ class FeatureRegistry:
             .reset_index(level=0, drop=True)
             .fillna(0.0)
         )
-
-        target = grouped["label"].max().reset_index().rename(columns={"bucket": "event_time", "label": "label"})
-        stats = stats.merge(target, on=["entity_id", "event_time"], how="left")
+        if "_context" in stats.columns:
+            stats = stats[~stats.pop("_context").astype(bool)].reset_index(drop=True)
+            stats = stats.astype(dtypes.to_dict())
         stats["label"] = stats["label"].fillna(0).astype(int)
 
-        return stats[["entity_id", "event_time", "label", *self.feature_names]]
+        return stats[columns]
@@ -1,15 +1,104 @@
 from __future__ import annotations
 
+from datetime import datetime
+from typing import Iterator, Sequence
+
+import numpy as np
 import pandas as pd
+from clickhouse_connect.driver.client import Client
+from clickhouse_connect.driver.query import format_str, quote_identifier
+from loguru import logger
 
 from feature_store_ml.infrastructure.clients.clickhouse import ClickHouseFactory
+from feature_store_ml.infrastructure.clients.columnar import ColumnarWriter
+from feature_store_ml.infrastructure.repositories.native_encoding import (
+    datetime_column,
+    float_map_column,
+    native_block,
+    numeric_column,
+)
+
+KEY_COLUMNS = ("entity_id", "event_time", "label")
+VERSION_COLUMN = "materialized_at"
+FEATURE_TABLES = {"map": "entity_features", "wide": "entity_features_wide"}
+FEATURE_TABLE_DDL = {
+    "entity_features": """
+    CREATE TABLE IF NOT EXISTS entity_features (
+        event_time DateTime,
+        entity_id UInt64,
+        label UInt8,
+        feature_map Map(String, Float64),
+        materialized_at DateTime64(3) DEFAULT now64(3)
+    ) ENGINE = ReplacingMergeTree(materialized_at) ORDER BY (event_time, entity_id)
+    """,
+    "entity_features_wide": """
+    CREATE TABLE IF NOT EXISTS entity_features_wide (
+        event_time DateTime,
+        entity_id UInt64,
+        label UInt8,
+        materialized_at DateTime64(3) DEFAULT now64(3)
+    ) ENGINE = ReplacingMergeTree(materialized_at) ORDER BY (event_time, entity_id)
+    """,
+}
+PREDICTIONS_DDL = """
+CREATE TABLE IF NOT EXISTS predictions (
+    event_time DateTime,
+    entity_id UInt64,
+    score Float64,
+    model_version String DEFAULT '',
+    scored_at DateTime64(3) DEFAULT now64(3)
+) ENGINE = ReplacingMergeTree(scored_at) ORDER BY (event_time, entity_id, model_version)
+"""
+REPLACING_TABLE_DDL = {**FEATURE_TABLE_DDL, "predictions": PREDICTIONS_DDL}
 
 
 class ClickHouseRepository:
-    def __init__(self, factory: ClickHouseFactory) -> None:
+    """ClickHouse access for events, the feature view and predictions.
+
+    The feature view is stored in one of two layouts: ``map`` keeps every
+    feature of a row in the ``feature_map`` Map column of ``entity_features``,
+    ``wide`` gives each feature its own Float64 column in
+    ``entity_features_wide``; new features are added as columns on write.
+    ``migrate_feature_layout`` copies the view from one layout to the other,
+    ``rebuild_tables`` recreates feature and prediction tables created
+    before they became ``ReplacingMergeTree``.
+
+    ``predictions`` keeps one row per ``(event_time, entity_id,
+    model_version)``: rescoring a range with the same model replaces its
+    rows. Readers use ``FINAL`` and pick a ``model_version`` (or the row with
+    the latest ``scored_at``) per event and entity.
+
+    Reads project ``feature_names`` (every stored feature when not given)
+    as ``feature_dtype`` columns.
+    """
+
+    def __init__(
+        self,
+        factory: ClickHouseFactory,
+        writer: ColumnarWriter | None = None,
+        feature_layout: str = "map",
+        feature_names: Sequence[str] | None = None,
+        feature_dtype: str = "float64",
+    ) -> None:
+        if feature_layout not in FEATURE_TABLES:
+            raise ValueError(f"unknown feature layout {feature_layout}")
+        if feature_dtype not in {"float32", "float64"}:
+            raise ValueError(f"unsupported feature dtype {feature_dtype}")
         self._factory = factory
+        self._writer = writer or factory.writer()
+        self._layout = feature_layout
+        self._wide_columns: set[str] | None = None
+        self._feature_names = list(feature_names) if feature_names is not None else None
+        self._feature_dtype = feature_dtype
+
+    def ensure_schema(self, require_replacing: bool = False) -> None:
+        """Create missing tables.
+
+        With ``require_replacing`` (incremental materialization) a feature
+        table of the configured layout that is not a ``ReplacingMergeTree``
+        is an error, since re-materialized buckets would duplicate its rows.
+        """
 
-    def ensure_schema(self) -> None:
         ddl_statements = [
             """
             CREATE TABLE IF NOT EXISTS events (
@@ -21,24 +110,69 @@ class ClickHouseRepository:
             ) ENGINE = MergeTree ORDER BY (event_time, entity_id)
             """,
             """
-            CREATE TABLE IF NOT EXISTS entity_features (
-                event_time DateTime,
-                entity_id UInt64,
-                label UInt8,
-                feature_map Map(String, Float64)
-            ) ENGINE = MergeTree ORDER BY (event_time, entity_id)
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS predictions (
-                event_time DateTime,
-                entity_id UInt64,
-                score Float64
-            ) ENGINE = MergeTree ORDER BY (event_time, entity_id)
+            CREATE TABLE IF NOT EXISTS feature_watermarks (
+                bucket DateTime,
+                events UInt64,
+                max_event_time DateTime,
+                materialized_at DateTime64(3) DEFAULT now64(3)
+            ) ENGINE = ReplacingMergeTree(materialized_at) ORDER BY bucket
             """,
+            *REPLACING_TABLE_DDL.values(),
+            # predictions tables created before scores were versioned
+            "ALTER TABLE predictions ADD COLUMN IF NOT EXISTS model_version String DEFAULT ''",
         ]
         with self._factory.connect() as client:
             for ddl in ddl_statements:
                 client.command(ddl)
+            stale = self._stale_tables(client)
+        if require_replacing and FEATURE_TABLES[self._layout] in stale:
+            raise RuntimeError(
+                f"{FEATURE_TABLES[self._layout]} is not a ReplacingMergeTree and incremental materialization would "
+                "duplicate its rows, recreate it with `migrate-features --rebuild`"
+            )
+        if stale:
+            logger.warning(
+                "{} predate ReplacingMergeTree, rewritten rows duplicate there until `migrate-features --rebuild` "
+                "recreates them",
+                stale,
+            )
+
+    def rebuild_tables(self) -> dict[str, int]:
+        """Recreate feature and prediction tables that are not ``ReplacingMergeTree``; returns the rows copied.
+
+        The old table is renamed to ``<name>_merge_tree``, the new one is
+        filled from it server-side and the old one is dropped. Duplicate rows
+        it holds collapse under ``FINAL`` into the one with the latest
+        ``materialized_at``/``scored_at`` if the old table has that column,
+        otherwise into any of them.
+        """
+
+        self.ensure_schema()
+        copied: dict[str, int] = {}
+        with self._factory.connect() as client:
+            for table in self._stale_tables(client):
+                legacy = f"{table}_merge_tree"
+                columns = [
+                    row[0]
+                    for row in client.query(
+                        """
+                        SELECT name FROM system.columns
+                        WHERE database = currentDatabase() AND table = {table:String}
+                        ORDER BY position
+                        """,
+                        parameters={"table": table},
+                    ).result_rows
+                ]
+                client.command(f"RENAME TABLE {table} TO {legacy}")
+                client.command(REPLACING_TABLE_DDL[table])
+                if table == FEATURE_TABLES["wide"]:
+                    self._wide_columns = None
+                    self._ensure_wide_columns([name for name in columns if name not in (*KEY_COLUMNS, VERSION_COLUMN)])
+                names = ", ".join(quote_identifier(name) for name in columns)
+                copied[table] = self._copy_features(client, legacy, table, names, names)
+                client.command(f"DROP TABLE {legacy}")
+                logger.info("recreated {} as ReplacingMergeTree with {} rows", table, copied[table])
+        return copied
 
     def fetch_events(self, lookback_hours: int) -> pd.DataFrame:
         cutoff = lookback_hours or 24
@@ -51,64 +185,284 @@ class ClickHouseRepository:
             frame = client.query_df(query)
         return frame
 
+    def fetch_events_since(self, start: datetime) -> pd.DataFrame:
+        query = """
+        SELECT * FROM events
+        WHERE event_time >= {start:DateTime}
+        ORDER BY event_time
+        """
+        with self._factory.connect() as client:
+            return client.query_df(query, parameters={"start": start})
+
+    def query_bucket_stats(
+        self,
+        expressions: Sequence[str],
+        bucket_minutes: int,
+        lookback_hours: int | None = None,
+        since: datetime | None = None,
+    ) -> pd.DataFrame:
+        """Aggregate ``events`` per entity and bucket; the bucket comes back as ``event_time``.
+
+        Rows are limited to the lookback (as ``fetch_events`` does) or, with
+        ``since``, to events at or after it.
+        """
+
+        if since is not None:
+            where, parameters = "event_time >= {since:DateTime}", {"since": since}
+        else:
+            where, parameters = f"event_time >= now() - INTERVAL {int(lookback_hours or 24)} HOUR", None
+        query = f"""
+        SELECT entity_id, toStartOfInterval(event_time, INTERVAL {int(bucket_minutes)} MINUTE) AS bucket,
+               {", ".join(expressions)}
+        FROM events
+        WHERE {where}
+        GROUP BY entity_id, bucket
+        ORDER BY entity_id, bucket
+        """
+        with self._factory.connect() as client:
+            frame = client.query_df(query, parameters=parameters)
+        return frame.rename(columns={"bucket": "event_time"})
+
+    def bucket_watermarks(self, lookback_hours: int, bucket_minutes: int) -> pd.DataFrame:
+        """Event count and latest event time of every bucket in the lookback.
+
+        The lookback is widened to start on a bucket boundary, so the oldest
+        bucket is complete and its watermark does not move as time passes.
+        """
+
+        bucket = f"INTERVAL {int(bucket_minutes)} MINUTE"
+        query = f"""
+        SELECT toStartOfInterval(event_time, {bucket}) AS bucket, count() AS events, max(event_time) AS max_event_time
+        FROM events
+        WHERE event_time >= toStartOfInterval(now() - INTERVAL {int(lookback_hours)} HOUR, {bucket})
+        GROUP BY bucket
+        ORDER BY bucket
+        """
+        with self._factory.connect() as client:
+            return client.query_df(query)
+
+    def load_feature_watermarks(self) -> pd.DataFrame:
+        with self._factory.connect() as client:
+            return client.query_df(
+                "SELECT bucket, events, max_event_time FROM feature_watermarks FINAL ORDER BY bucket"
+            )
+
+    def save_feature_watermarks(self, watermarks: pd.DataFrame) -> None:
+        self._writer.write_frame("feature_watermarks", watermarks, columns=["bucket", "events", "max_event_time"])
+
+    def load_feature_history(self, since: datetime, before: datetime, rows_per_entity: int) -> pd.DataFrame:
+        """The last ``rows_per_entity`` materialized ``value_mean`` rows of each entity in ``[since, before)``."""
+
+        value_mean = "feature_map['value_mean']" if self._layout == "map" else "value_mean"
+        query = f"""
+        SELECT entity_id, event_time, {value_mean} AS value_mean
+        FROM {FEATURE_TABLES[self._layout]} FINAL
+        WHERE event_time >= {{since:DateTime}} AND event_time < {{before:DateTime}}
+        ORDER BY entity_id, event_time DESC
+        LIMIT {int(rows_per_entity)} BY entity_id
+        """
+        with self._factory.connect() as client:
+            return client.query_df(query, parameters={"since": since, "before": before})
+
     def persist_feature_view(self, features: pd.DataFrame) -> None:
         if features.empty:
             return
-        rows = []
-        for _, row in features.iterrows():
-            feature_map = {
-                column: float(row[column])
-                for column in features.columns
-                if column not in {"entity_id", "event_time", "label"}
-            }
-            rows.append(
-                {
-                    "entity_id": int(row["entity_id"]),
-                    "event_time": row["event_time"],
-                    "label": int(row.get("label", 0)),
-                    "feature_map": feature_map,
-                }
-            )
-        with self._factory.connect() as client:
-            client.insert_dicts("entity_features", rows)
+        names = [column for column in features.columns if column not in KEY_COLUMNS]
+        times = features["event_time"].to_numpy(dtype="datetime64[ns]")
+        entity_ids = features["entity_id"].to_numpy(dtype=np.uint64)
+        if "label" in features.columns:
+            labels = features["label"].to_numpy(dtype=np.uint8)
+        else:
+            labels = np.zeros(len(features), dtype=np.uint8)
+        values = [features[name].to_numpy(dtype=np.float64) for name in names]
+        wide = self._layout == "wide"
+        if wide:
+            self._ensure_wide_columns(names)
+
+        def encode(start: int, stop: int) -> bytes:
+            columns = [
+                ("event_time", "DateTime", datetime_column(times[start:stop])),
+                ("entity_id", "UInt64", numeric_column(entity_ids[start:stop], "<u8")),
+                ("label", "UInt8", numeric_column(labels[start:stop], "u1")),
+            ]
+            if wide:
+                columns.extend(
+                    (name, "Float64", numeric_column(column[start:stop], "<f8")) for name, column in zip(names, values)
+                )
+            else:
+                matrix = np.empty((stop - start, len(values)))
+                for idx, column in enumerate(values):
+                    matrix[:, idx] = column[start:stop]
+                columns.append(("feature_map", "Map(String, Float64)", float_map_column(names, matrix)))
+            return native_block(stop - start, columns)
+
+        column_names = ["event_time", "entity_id", "label", *(names if wide else ["feature_map"])]
+        self._writer.write_native(FEATURE_TABLES[self._layout], column_names, len(features), encode)
 
     def load_feature_view(self, lookback_hours: int) -> pd.DataFrame:
-        query = f"""
-        SELECT entity_id, event_time, label, feature_map
-        FROM entity_features
-        WHERE event_time >= now() - INTERVAL {lookback_hours} HOUR
-        ORDER BY event_time
-        """
+        where = f"WHERE event_time >= now() - INTERVAL {lookback_hours} HOUR"
+        return self._read_feature_view(where, "ORDER BY event_time")
+
+    def stream_feature_view(self, lookback_hours: int, block_rows: int = 100_000) -> Iterator[pd.DataFrame]:
+        """The rows ``load_feature_view`` reads, as one query streamed in frames of at most ``block_rows`` rows."""
+
+        where = f"WHERE event_time >= now() - INTERVAL {lookback_hours} HOUR"
+        query = self._feature_view_query(where, "")
         with self._factory.connect() as client:
-            frame = client.query_df(query)
-        return self._expand_feature_map(frame)
+            with client.query_df_stream(query, settings={"max_block_size": block_rows}) as stream:
+                yield from stream
 
     def fetch_inference_candidates(self, batch_size: int) -> pd.DataFrame:
-        query = f"""
-        SELECT entity_id, event_time, label, feature_map
-        FROM entity_features
-        ORDER BY event_time DESC
-        LIMIT {batch_size}
+        return self._read_feature_view("", f"ORDER BY event_time DESC LIMIT {batch_size}")
+
+    def load_latest_features(self, entity_ids: Sequence[int]) -> pd.DataFrame:
+        """The most recent feature row of each of ``entity_ids``; entities without one are absent."""
+
+        if not entity_ids:
+            return pd.DataFrame(columns=list(KEY_COLUMNS))
+        where = f"WHERE entity_id IN ({', '.join(str(int(entity_id)) for entity_id in entity_ids)})"
+        return self._read_feature_view(where, "ORDER BY entity_id, event_time DESC LIMIT 1 BY entity_id")
+
+    def load_feature_chunk(
+        self, start: datetime, end: datetime, partition: int = 0, partitions: int = 1
+    ) -> pd.DataFrame:
+        """Feature rows with ``start <= event_time < end`` whose ``entity_id % partitions`` is ``partition``."""
+
+        where = "WHERE event_time >= {start:DateTime} AND event_time < {end:DateTime}"
+        if partitions > 1:
+            where += f" AND entity_id % {int(partitions)} = {int(partition)}"
+        return self._read_feature_view(where, "", parameters={"start": start, "end": end})
+
+    def migrate_feature_layout(self, target: str, replace: bool = False) -> int:
+        """Copy the feature view into the ``target`` layout server-side and return the rows copied.
+
+        Features missing from a row of the map layout become 0.0 in the wide
+        one, the same value reads of the map layout fill in.
         """
+
+        if target not in FEATURE_TABLES:
+            raise ValueError(f"unknown feature layout {target}")
+        source = "wide" if target == "map" else "map"
+        self.ensure_schema()
         with self._factory.connect() as client:
-            frame = client.query_df(query)
-        return self._expand_feature_map(frame)
+            existing = client.command(f"SELECT count() FROM {FEATURE_TABLES[target]}")
+            if existing and not replace:
+                raise RuntimeError(f"{FEATURE_TABLES[target]} already holds {existing} rows, pass replace to overwrite")
+            if existing:
+                client.command(f"TRUNCATE TABLE {FEATURE_TABLES[target]}")
+            if target == "wide":
+                keys = client.query(
+                    "SELECT arraySort(groupUniqArrayArray(mapKeys(feature_map))) FROM entity_features"
+                ).result_rows[0][0]
+                self._ensure_wide_columns(keys)
+                columns = ", ".join(quote_identifier(key) for key in keys)
+                projection = ", ".join(f"feature_map[{format_str(key)}]" for key in keys)
+            else:
+                keys = [name for name in self._load_wide_columns() if name not in (*KEY_COLUMNS, VERSION_COLUMN)]
+                columns = "feature_map"
+                pairs = ", ".join(f"{format_str(key)}, {quote_identifier(key)}" for key in keys)
+                projection = f"map({pairs})" if keys else "map()"
+            return self._copy_features(
+                client,
+                FEATURE_TABLES[source],
+                FEATURE_TABLES[target],
+                f"event_time, entity_id, label, {columns}",
+                f"event_time, entity_id, label, {projection}",
+            )
 
     def persist_predictions(self, payload: pd.DataFrame) -> None:
+        """Write ``event_time``, ``entity_id``, ``score`` and, when present, ``model_version``."""
+
         if payload.empty:
             return
-        rows = payload.to_dict(orient="records")
-        with self._factory.connect() as client:
-            client.insert_dicts("predictions", rows)
+        self._writer.write_frame("predictions", payload)
 
     def list_reports(self) -> pd.DataFrame:
+        """The latest 1000 predictions, one per event and entity: the most recently scored model's."""
+
         with self._factory.connect() as client:
-            return client.query_df("SELECT * FROM predictions ORDER BY event_time DESC LIMIT 1000")
+            return client.query_df(
+                """
+                SELECT * FROM predictions FINAL
+                ORDER BY event_time DESC, entity_id, scored_at DESC
+                LIMIT 1 BY event_time, entity_id
+                LIMIT 1000
+                """
+            )
+
+    @staticmethod
+    def _copy_features(client: Client, source: str, target: str, columns: str, projection: str) -> int:
+        client.command(f"INSERT INTO {target} ({columns}) SELECT {projection} FROM {source}")
+        return int(client.command(f"SELECT count() FROM {target}"))
 
     @staticmethod
-    def _expand_feature_map(frame: pd.DataFrame) -> pd.DataFrame:
-        if frame.empty:
-            return frame
-        feature_map = frame.pop("feature_map")
-        features = pd.DataFrame(feature_map.tolist()).fillna(0.0)
-        return pd.concat([frame.reset_index(drop=True), features], axis=1)
+    def _stale_tables(client: Client) -> list[str]:
+        engines = client.query(
+            """
+            SELECT name, engine FROM system.tables
+            WHERE database = currentDatabase() AND has({names:Array(String)}, name)
+            """,
+            parameters={"names": list(REPLACING_TABLE_DDL)},
+        ).result_rows
+        return sorted(name for name, engine in engines if engine != "ReplacingMergeTree")
+
+    def _read_feature_view(self, where: str, order: str, parameters: dict[str, object] | None = None) -> pd.DataFrame:
+        """Read the view with one numeric column per feature, decoded by the server.
+
+        Map values are projected as ``feature_map['name']``, so the client
+        never materializes a dict per row; a key missing from a row reads as 0.
+        """
+
+        query = self._feature_view_query(where, order, parameters)
+        with self._factory.connect() as client:
+            return client.query_df(query, parameters=parameters)
+
+    def _feature_view_query(self, where: str, order: str, parameters: dict[str, object] | None = None) -> str:
+        names = (
+            self._feature_names if self._feature_names is not None else self._stored_feature_names(where, parameters)
+        )
+        projections = ", ".join(["entity_id", "event_time", "label", *map(self._feature_expression, names)])
+        return f"""
+        SELECT {projections}
+        FROM {FEATURE_TABLES[self._layout]} FINAL
+        {where}
+        {order}
+        """
+
+    def _feature_expression(self, name: str) -> str:
+        source = f"feature_map[{format_str(name)}]" if self._layout == "map" else quote_identifier(name)
+        if self._feature_dtype == "float32":
+            source = f"toFloat32({source})"
+        return f"{source} AS {quote_identifier(name)}"
+
+    def _stored_feature_names(self, where: str, parameters: dict[str, object] | None = None) -> list[str]:
+        if self._layout == "wide":
+            return [name for name in self._load_wide_columns() if name not in (*KEY_COLUMNS, VERSION_COLUMN)]
+        with self._factory.connect() as client:
+            result = client.query(
+                f"SELECT arraySort(groupUniqArrayArray(mapKeys(feature_map))) FROM entity_features {where}",
+                parameters=parameters,
+            )
+        return list(result.result_rows[0][0])
+
+    def _ensure_wide_columns(self, names: Sequence[str]) -> None:
+        known = self._wide_columns if self._wide_columns is not None else set(self._load_wide_columns())
+        missing = [name for name in names if name not in known]
+        if missing:
+            with self._factory.connect() as client:
+                for name in missing:
+                    client.command(
+                        f"ALTER TABLE entity_features_wide ADD COLUMN IF NOT EXISTS {quote_identifier(name)} Float64"
+                    )
+        self._wide_columns = known | set(missing)
+
+    def _load_wide_columns(self) -> list[str]:
+        with self._factory.connect() as client:
+            result = client.query(
+                """
+                SELECT name FROM system.columns
+                WHERE database = currentDatabase() AND table = 'entity_features_wide'
+                ORDER BY position
+                """
+            )
+        return [row[0] for row in result.result_rows]
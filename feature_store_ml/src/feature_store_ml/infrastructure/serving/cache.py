@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True, slots=True)
+class CachedFeatures:
+    event_time: pd.Timestamp
+    vector: np.ndarray
+
+
+@dataclass(slots=True)
+class CacheMetrics:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evicted: int = 0
+    size: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class FeatureCache:
+    """LRU cache of the latest feature vector per entity.
+
+    Entries older than ``ttl_seconds`` count as misses, so a vector is
+    re-read at least that often after new features are materialized; past
+    ``max_entries`` the least recently used entity is evicted.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("feature cache max_entries must be positive")
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, CachedFeatures]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = CacheMetrics()
+
+    @property
+    def metrics(self) -> CacheMetrics:
+        with self._lock:
+            return replace(self._metrics, size=len(self._entries))
+
+    def get_many(self, entity_ids: Sequence[int]) -> tuple[dict[int, CachedFeatures], list[int]]:
+        """Cached features of ``entity_ids`` and the ids that have to be loaded."""
+
+        now = self._clock()
+        found: dict[int, CachedFeatures] = {}
+        missing: list[int] = []
+        with self._lock:
+            for entity_id in entity_ids:
+                entry = self._entries.get(entity_id)
+                if entry is not None and now - entry[0] >= self._ttl:
+                    del self._entries[entity_id]
+                    self._metrics.expired += 1
+                    entry = None
+                if entry is None:
+                    missing.append(entity_id)
+                    continue
+                self._entries.move_to_end(entity_id)
+                found[entity_id] = entry[1]
+            self._metrics.hits += len(found)
+            self._metrics.misses += len(missing)
+        return found, missing
+
+    def put_many(self, entries: Iterable[tuple[int, CachedFeatures]]) -> None:
+        now = self._clock()
+        with self._lock:
+            for entity_id, features in entries:
+                self._entries[entity_id] = (now, features)
+                self._entries.move_to_end(entity_id)
+            overflow = len(self._entries) - self._max_entries
+            for _ in range(max(overflow, 0)):
+                self._entries.popitem(last=False)
+            self._metrics.evicted += max(overflow, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+
+@dataclass(frozen=True, slots=True)
+class ScoringRun:
+    """What a bulk scoring run covers; a checkpoint only resumes the identical run."""
+
+    start: datetime
+    end: datetime
+    chunk_minutes: int
+    entity_partitions: int
+    model_version: str
+
+    def as_dict(self) -> dict[str, object]:
+        return {**asdict(self), "start": self.start.isoformat(), "end": self.end.isoformat()}
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, object]) -> "ScoringRun":
+        return cls(
+            start=datetime.fromisoformat(str(raw["start"])),
+            end=datetime.fromisoformat(str(raw["end"])),
+            chunk_minutes=int(raw["chunk_minutes"]),  # type: ignore[arg-type]
+            entity_partitions=int(raw["entity_partitions"]),  # type: ignore[arg-type]
+            model_version=str(raw["model_version"]),
+        )
+
+
+class ScoringCheckpoint:
+    """The run and its finished chunks as JSON, replaced atomically after every chunk."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+
+    def load(self) -> tuple[ScoringRun, set[str]] | None:
+        if not self._path.exists():
+            return None
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+            return ScoringRun.from_dict(raw["run"]), set(raw["done"])
+        except (OSError, ValueError, TypeError, KeyError) as exc:
+            logger.warning("ignoring unreadable scoring checkpoint {}: {}", self._path, exc)
+            return None
+
+    def save(self, run: ScoringRun, done: set[str]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"run": run.as_dict(), "done": sorted(done)}), encoding="utf-8")
+        os.replace(tmp, self._path)
+
+    def clear(self) -> None:
+        self._path.unlink(missing_ok=True)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Sequence
+
+import lightgbm as lgb
+import numpy as np
+from loguru import logger
+
+from feature_store_ml.infrastructure.modeling.compiled import CompiledTrees
+from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
+
+ENGINES = ("lightgbm", "numpy")
+
+
+@dataclass(frozen=True, slots=True)
+class LoadedModel:
+    booster: lgb.Booster | CompiledTrees
+    feature_names: tuple[str, ...]
+    version: str
+    loaded_at: float
+
+
+@dataclass(slots=True)
+class ReloadMetrics:
+    reloads: int = 0
+    failed: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class LiveModel:
+    """Keeps the trained booster in memory and swaps in new artifacts.
+
+    A background thread compares ``trainer.artifact_version()`` every
+    ``reload_interval`` seconds and loads a newly published version off the
+    request path; requests keep scoring with the previous model until the
+    new one is ready. Versions that fail to load, or whose model file does
+    not match its manifest, are skipped and tried again on the next poll.
+    With ``engine="numpy"`` the version's compiled trees score requests and
+    the LightGBM model is never parsed.
+    """
+
+    def __init__(self, trainer: LightGBMTrainer, reload_interval: float = 5.0, engine: str = "lightgbm") -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"unknown scoring engine {engine}, expected one of {ENGINES}")
+        self._trainer = trainer
+        self._engine = engine
+        self._reload_interval = reload_interval
+        self._model: LoadedModel | None = None
+        self._lock = threading.Lock()
+        self._metrics = ReloadMetrics()
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+
+    @property
+    def current(self) -> LoadedModel | None:
+        return self._model
+
+    @property
+    def metrics(self) -> ReloadMetrics:
+        with self._lock:
+            return replace(self._metrics)
+
+    def start(self) -> None:
+        self.reload()
+        if self._reload_interval > 0 and self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="model-reloader", daemon=True)
+            self._worker.start()
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def predict(self, rows: np.ndarray, feature_names: Sequence[str]) -> np.ndarray:
+        """Score ``rows``, whose columns are ``feature_names``, with the current model."""
+
+        model = self._model
+        if model is None:
+            raise RuntimeError("no trained model is loaded, run training first")
+        positions = {name: idx for idx, name in enumerate(feature_names)}
+        missing = [name for name in model.feature_names if name not in positions]
+        if missing:
+            raise ValueError(f"model {model.version} needs features that are not served: {missing}")
+        return model.booster.predict(rows[:, [positions[name] for name in model.feature_names]])
+
+    def reload(self) -> bool:
+        """Load the latest version if it changed since the last load; ``True`` when a new model was swapped in."""
+
+        version = self._trainer.artifact_version()
+        if version is None or (self._model is not None and self._model.version == version):
+            return False
+        try:
+            published = self._trainer.open(version)
+            booster = published.compiled if self._engine == "numpy" else published.booster
+            features = published.manifest.features
+        except Exception as exc:  # noqa: BLE001 - keep serving the loaded model
+            with self._lock:
+                self._metrics.failed += 1
+            logger.warning("skipping model artifacts {}: {}", version, exc)
+            return False
+        self._model = LoadedModel(booster=booster, feature_names=features, version=version, loaded_at=time.time())
+        with self._lock:
+            self._metrics.reloads += 1
+        logger.info("loaded model {} with {} features", version, len(features))
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._reload_interval):
+            self.reload()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+from dataclasses import asdict
+from functools import partial
+from pathlib import Path
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+from feature_store_ml.application.use_cases.predict_online import PredictOnline
+from feature_store_ml.infrastructure.clients.clickhouse import ClickHouseFactory
+from feature_store_ml.infrastructure.config import StoreConfig
+from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
+from feature_store_ml.infrastructure.registry import FeatureRegistry
+from feature_store_ml.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+from feature_store_ml.infrastructure.serving.batcher import MicroBatcher
+from feature_store_ml.infrastructure.serving.cache import FeatureCache
+from feature_store_ml.infrastructure.serving.live_model import LiveModel
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[3] / "config" / "store.yaml"
+CONFIG_PATH = Path(os.environ.get("FEATURE_STORE_CONFIG", DEFAULT_CONFIG_PATH))
+
+app = FastAPI(title="Feature Store Online Scoring")
+
+
+class PredictRequest(BaseModel):
+    entity_ids: list[int] = Field(min_length=1)
+
+
+@app.on_event("startup")
+def bootstrap() -> None:
+    config = StoreConfig.load(CONFIG_PATH)
+    registry = FeatureRegistry.from_config(config.features)
+    app.state.factory = ClickHouseFactory(config.clickhouse)
+    repository = ClickHouseRepository(
+        factory=app.state.factory,
+        feature_layout=config.features.layout,
+        feature_names=registry.feature_names,
+        feature_dtype=config.features.read_dtype,
+    )
+    trainer = LightGBMTrainer(config=config.training, artifacts_dir=CONFIG_PATH.parent / "artifacts")
+    app.state.model = LiveModel(
+        trainer, reload_interval=config.serving.reload_interval_seconds, engine=config.serving.engine
+    )
+    app.state.model.start()
+    app.state.cache = FeatureCache(config.serving.cache_size, config.serving.cache_ttl_seconds)
+    app.state.batcher = MicroBatcher(
+        partial(app.state.model.predict, feature_names=registry.feature_names),
+        max_batch_rows=config.serving.max_batch_rows,
+        max_wait=config.serving.batch_wait_ms / 1000.0,
+    )
+    app.state.predictor = PredictOnline(
+        repository=repository,
+        cache=app.state.cache,
+        batcher=app.state.batcher,
+        feature_names=registry.feature_names,
+        threshold=config.serving.threshold,
+    )
+
+
+@app.on_event("shutdown")
+def teardown() -> None:
+    app.state.batcher.close()
+    app.state.model.close()
+    app.state.factory.close()
+
+
+@app.post("/predict")
+def predict(request: PredictRequest) -> dict[str, object]:
+    try:
+        predictions, missing = app.state.predictor.execute(request.entity_ids)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    model = app.state.model.current
+    return {
+        "model_version": model.version if model else None,
+        "predictions": [asdict(prediction) for prediction in predictions],
+        "missing": missing,
+    }
+
+
+@app.get("/predict/{entity_id}")
+def predict_one(entity_id: int) -> dict[str, object]:
+    try:
+        predictions, _ = app.state.predictor.execute([entity_id])
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    if not predictions:
+        raise HTTPException(status_code=404, detail=f"no features for entity {entity_id}")
+    return asdict(predictions[0])
+
+
+@app.get("/health")
+def health() -> dict[str, object]:
+    model = app.state.model.current
+    if model is None:
+        raise HTTPException(status_code=503, detail="no trained model is loaded")
+    return {"model_version": model.version, "loaded_at": model.loaded_at, "features": list(model.feature_names)}
+
+
+@app.get("/metrics")
+def metrics() -> dict[str, dict[str, float]]:
+    return {
+        "cache": app.state.cache.metrics.as_dict(),
+        "batches": app.state.batcher.metrics.as_dict(),
+        "model": app.state.model.metrics.as_dict(),
+        "clickhouse_pool": app.state.factory.pool_metrics.as_dict(),
+    }
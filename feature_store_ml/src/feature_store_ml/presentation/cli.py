@@ -1,26 +1,38 @@
 from __future__ import annotations
 
+from datetime import datetime
 from pathlib import Path
 
 import typer
+from loguru import logger
 
+from feature_store_ml.application.use_cases.bulk_score_predictions import BulkScorePredictions
 from feature_store_ml.application.use_cases.materialize_features import MaterializeFeatures
 from feature_store_ml.application.use_cases.serve_predictions import ServePredictions
 from feature_store_ml.application.use_cases.train_model import TrainModel
 from feature_store_ml.infrastructure.clients.clickhouse import ClickHouseFactory
 from feature_store_ml.infrastructure.config import StoreConfig
 from feature_store_ml.infrastructure.datasets.builder import DatasetBuilder
+from feature_store_ml.infrastructure.datasets.streaming import StreamingDatasetBuilder
+from feature_store_ml.infrastructure.features.clickhouse_pushdown import ClickHouseFeatureEngine
+from feature_store_ml.infrastructure.features.fused import FusedFeatureEngine
 from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
 from feature_store_ml.infrastructure.registry import FeatureRegistry
 from feature_store_ml.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+from feature_store_ml.infrastructure.serving.checkpoint import ScoringCheckpoint
 
 app = typer.Typer()
 
 
 def _bootstrap(config_path: Path) -> tuple[StoreConfig, ClickHouseRepository, FeatureRegistry, LightGBMTrainer]:
     cfg = StoreConfig.load(config_path)
-    repository = ClickHouseRepository(factory=ClickHouseFactory(cfg.clickhouse))
     registry = FeatureRegistry.from_config(cfg.features)
+    repository = ClickHouseRepository(
+        factory=ClickHouseFactory(cfg.clickhouse),
+        feature_layout=cfg.features.layout,
+        feature_names=registry.feature_names,
+        feature_dtype=cfg.features.read_dtype,
+    )
     trainer = LightGBMTrainer(config=cfg.training, artifacts_dir=config_path.parent / "artifacts")
     return cfg, repository, registry, trainer
 
@@ -28,7 +40,19 @@ def _bootstrap(config_path: Path) -> tuple[StoreConfig, ClickHouseRepository, Fe
 @app.command()
 def materialize(config: Path = typer.Option(..., exists=True)) -> None:
     cfg, repository, registry, trainer = _bootstrap(config)
-    use_case = MaterializeFeatures(repository=repository, registry=registry)
+    pushdown = (
+        ClickHouseFeatureEngine(repository, registry, quantile_method=cfg.features.quantile_method)
+        if cfg.features.engine == "clickhouse"
+        else None
+    )
+    fused = FusedFeatureEngine(registry) if cfg.features.local_engine == "fused" else None
+    use_case = MaterializeFeatures(
+        repository=repository,
+        registry=registry,
+        incremental=cfg.features.incremental,
+        pushdown=pushdown,
+        fused=fused,
+    )
     use_case.execute(lookback_hours=cfg.features.lookback_hours, min_records=cfg.features.min_records)
 
 
@@ -36,10 +60,20 @@ def materialize(config: Path = typer.Option(..., exists=True)) -> None:
 def train(config: Path = typer.Option(..., exists=True)) -> None:
     cfg, repository, registry, trainer = _bootstrap(config)
     dataset_builder = DatasetBuilder(registry=registry)
+    streaming = None
+    if cfg.training.dataset == "streaming":
+        streaming = StreamingDatasetBuilder(
+            registry=registry,
+            directory=config.parent / (cfg.training.dataset_dir or "artifacts/dataset"),
+            validation_fraction=cfg.training.test_size,
+            seed=cfg.training.random_state,
+        )
     use_case = TrainModel(
         repository=repository,
         dataset_builder=dataset_builder,
         trainer=trainer,
+        streaming=streaming,
+        block_rows=cfg.training.stream_block_rows,
     )
     use_case.execute(lookback_hours=cfg.features.lookback_hours)
 
@@ -56,5 +90,51 @@ def serve(config: Path = typer.Option(..., exists=True)) -> None:
     use_case.execute()
 
 
+@app.command("serve-bulk")
+def serve_bulk(
+    config: Path = typer.Option(..., exists=True),
+    start: datetime | None = typer.Option(None, help="first event_time to score (default: resume or the lookback)"),
+    end: datetime | None = typer.Option(None, help="end of the range, exclusive (default: now)"),
+    fresh: bool = typer.Option(False, help="drop the checkpoint and score the whole range again"),
+) -> None:
+    cfg, repository, _, trainer = _bootstrap(config)
+    serving = cfg.serving
+    checkpoint = (
+        ScoringCheckpoint(config.parent / serving.bulk_checkpoint_path) if serving.bulk_checkpoint_path else None
+    )
+    if fresh and checkpoint is not None:
+        checkpoint.clear()
+    use_case = BulkScorePredictions(
+        repository=repository,
+        trainer=trainer,
+        checkpoint=checkpoint,
+        chunk_minutes=serving.bulk_chunk_minutes,
+        entity_partitions=serving.bulk_entity_partitions,
+        workers=serving.bulk_workers,
+        queue_size=serving.bulk_queue_size,
+        lookback_hours=serving.bulk_lookback_hours,
+    )
+    report = use_case.execute(start=start, end=end)
+    logger.info("bulk scoring done: {}", report)
+
+
+@app.command("migrate-features")
+def migrate_features(
+    config: Path = typer.Option(..., exists=True),
+    to: str | None = typer.Option(None, help="target layout: map | wide"),
+    replace: bool = typer.Option(False, help="truncate the target table first"),
+    rebuild: bool = typer.Option(False, help="recreate feature and prediction tables that predate ReplacingMergeTree"),
+) -> None:
+    if to is None and not rebuild:
+        raise typer.BadParameter("pass --to and/or --rebuild")
+    _, repository, _, _ = _bootstrap(config)
+    if rebuild:
+        copied = repository.rebuild_tables()
+        logger.info("recreated tables: {}", copied or "none needed it")
+    if to is not None:
+        rows = repository.migrate_feature_layout(to, replace=replace)
+        logger.info("copied {} feature rows into the {} layout, set features.layout: {} to use it", rows, to, to)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,108 @@
+import threading
+from datetime import datetime
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store_ml.application.use_cases.bulk_score_predictions import BulkScorePredictions, plan_chunks
+from feature_store_ml.infrastructure.config import TrainingConfig
+from feature_store_ml.infrastructure.modeling.artifacts import ModelStore
+from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
+from feature_store_ml.infrastructure.serving.checkpoint import ScoringCheckpoint, ScoringRun
+
+FEATURES = ["value_mean", "value_std", "value_count"]
+TRAINING = TrainingConfig(test_size=0.2, random_state=0, num_boost_round=5, learning_rate=0.1, max_depth=3)
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 1, 6)
+
+
+class FeatureStore:
+    """Feature rows in memory; ``fail_on`` makes the insert of one chunk fail once."""
+
+    def __init__(self, rows, fail_on=None):
+        self.rows = rows
+        self.fail_on = fail_on
+        self.predictions = []
+        self.reads = []
+        self.lock = threading.Lock()
+
+    def load_feature_chunk(self, start, end, partition=0, partitions=1):
+        with self.lock:
+            self.reads.append((start, partition))
+        rows = self.rows[(self.rows["event_time"] >= start) & (self.rows["event_time"] < end)]
+        return rows[rows["entity_id"] % partitions == partition]
+
+    def persist_predictions(self, payload):
+        if self.fail_on is not None and not payload.empty and payload["event_time"].min() >= self.fail_on:
+            self.fail_on = None
+            raise ConnectionError("insert failed")
+        self.predictions.append(payload)
+
+
+def _store(tmp_path, fail_on=None):
+    rng = np.random.default_rng(0)
+    rows = pd.DataFrame(
+        {
+            "entity_id": rng.integers(0, 50, 3_000),
+            "event_time": START + pd.to_timedelta(rng.integers(0, 6 * 3600, 3_000), unit="s"),
+            **{name: rng.normal(size=3_000) for name in FEATURES},
+        }
+    )
+    booster = lgb.train(
+        {"objective": "binary", "verbose": -1},
+        lgb.Dataset(rows[FEATURES], label=(rows["value_mean"] > 0).astype(int)),
+        num_boost_round=5,
+    )
+    ModelStore(tmp_path / "models").publish(booster)
+    return FeatureStore(rows, fail_on=fail_on), booster
+
+
+def _scored(store):
+    return pd.concat(store.predictions).sort_values(["event_time", "entity_id"]).reset_index(drop=True)
+
+
+def test_chunks_cover_the_range_by_time_and_entity_partition():
+    chunks = plan_chunks(ScoringRun(START, datetime(2024, 1, 1, 2, 30), 60, 2, "v1"))
+
+    assert len(chunks) == 6
+    assert chunks[-1].start == datetime(2024, 1, 1, 2) and chunks[-1].end == datetime(2024, 1, 1, 2, 30)
+    assert len({chunk.key for chunk in chunks}) == 6
+
+
+def test_bulk_scoring_scores_every_row_once(tmp_path):
+    store, booster = _store(tmp_path)
+    use_case = BulkScorePredictions(
+        store, LightGBMTrainer(TRAINING, tmp_path), chunk_minutes=30, entity_partitions=3, workers=3, queue_size=2
+    )
+
+    report = use_case.execute(start=START, end=END)
+
+    scored = _scored(store)
+    expected = store.rows.sort_values(["event_time", "entity_id"]).reset_index(drop=True)
+    assert (report.chunks, report.scored, report.rows) == (36, 36, len(store.rows))
+    np.testing.assert_allclose(scored["score"], booster.predict(expected[FEATURES]))
+    assert set(scored["model_version"]) == {ModelStore(tmp_path / "models").latest_version()}
+
+
+def test_failed_run_resumes_from_the_checkpoint(tmp_path):
+    store, _ = _store(tmp_path, fail_on=datetime(2024, 1, 1, 3))
+    checkpoint = ScoringCheckpoint(tmp_path / "bulk.json")
+    use_case = BulkScorePredictions(
+        store, LightGBMTrainer(TRAINING, tmp_path), checkpoint=checkpoint, chunk_minutes=60, workers=1, queue_size=1
+    )
+
+    with pytest.raises(ConnectionError):
+        use_case.execute(start=START, end=END)
+    run, done = checkpoint.load()
+    assert run.start == START and len(done) == 3
+
+    store.reads.clear()
+    report = use_case.execute()
+
+    assert (report.resumed, report.scored) == (3, 3)
+    assert sorted(start for start, _ in store.reads) == [datetime(2024, 1, 1, hour) for hour in (3, 4, 5)]
+    scored = _scored(store)
+    assert len(scored) == len(store.rows)
+    assert not scored.duplicated(["event_time", "entity_id", "score"]).any()
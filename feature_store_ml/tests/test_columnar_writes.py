@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from clickhouse_connect.datatypes.registry import get_from_name
+from clickhouse_connect.driver.insert import InsertContext
+from clickhouse_connect.driver.transform import NativeTransform
+
+from feature_store_ml.infrastructure.clients.columnar import ColumnarWriter
+from feature_store_ml.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+
+
+class RecordingClient:
+    def __init__(self):
+        self.inserts = []
+        self.raw_inserts = []
+        self.commands = []
+
+    def insert(self, table, data, column_names, column_oriented=False, settings=None):
+        assert column_oriented
+        self.inserts.append((table, dict(zip(column_names, data))))
+
+    def raw_insert(self, table, column_names=None, insert_block=None, settings=None, fmt=None):
+        assert fmt == "Native"
+        self.raw_inserts.append((table, list(column_names), insert_block))
+
+    def query(self, sql):
+        return SimpleNamespace(result_rows=[("event_time",), ("entity_id",), ("label",), ("value_mean",)])
+
+    def command(self, sql):
+        self.commands.append(" ".join(sql.split()))
+
+
+class RecordingFactory:
+    def __init__(self):
+        self.client = RecordingClient()
+
+    @contextmanager
+    def connect(self):
+        yield self.client
+
+    def writer(self):
+        return ColumnarWriter(self)
+
+
+def _features():
+    return pd.DataFrame(
+        {
+            "entity_id": [1, 2, 3],
+            "event_time": pd.date_range("2024-01-01", periods=3, freq="15min"),
+            "label": [0.0, 1.0, 0.0],
+            "value_mean": [1.0, 2.0, 3.0],
+            "value_count": np.array([4, 5, 6]),
+        }
+    )
+
+
+def _driver_block(table, names, types, data):
+    context = InsertContext(table, names, [get_from_name(name) for name in types], data=data, column_oriented=True)
+    payload = b"".join(NativeTransform.build_insert(context))
+    return payload[payload.index(b"FORMAT Native\n") + len(b"FORMAT Native\n") :]
+
+
+def test_map_layout_blocks_match_driver_serialization():
+    factory = RecordingFactory()
+    repository = ClickHouseRepository(factory, writer=ColumnarWriter(factory, batch_rows=2))
+    features = _features()
+
+    repository.persist_feature_view(features)
+
+    blocks = factory.client.raw_inserts
+    assert [table for table, _, _ in blocks] == ["entity_features", "entity_features"]
+    assert blocks[0][1] == ["event_time", "entity_id", "label", "feature_map"]
+    seconds = (features["event_time"].astype("int64") // 10**9).tolist()
+    maps = [{"value_mean": mean, "value_count": float(count)} for mean, count in zip([1.0, 2.0, 3.0], [4, 5, 6])]
+    types = ["DateTime", "UInt64", "UInt8", "Map(String, Float64)"]
+    names = blocks[0][1]
+    assert blocks[0][2] == _driver_block("entity_features", names, types, [seconds[:2], [1, 2], [0, 1], maps[:2]])
+    assert blocks[1][2] == _driver_block("entity_features", names, types, [seconds[2:], [3], [0], maps[2:]])
+
+
+def test_wide_layout_adds_missing_feature_columns():
+    factory = RecordingFactory()
+    repository = ClickHouseRepository(factory, feature_layout="wide")
+
+    repository.persist_feature_view(_features())
+
+    assert factory.client.commands == [
+        "ALTER TABLE entity_features_wide ADD COLUMN IF NOT EXISTS `value_count` Float64"
+    ]
+    ((table, names, block),) = factory.client.raw_inserts
+    assert table == "entity_features_wide"
+    assert names == ["event_time", "entity_id", "label", "value_mean", "value_count"]
+    seconds = (_features()["event_time"].astype("int64") // 10**9).tolist()
+    types = ["DateTime", "UInt64", "UInt8", "Float64", "Float64"]
+    expected = _driver_block(table, names, types, [seconds, [1, 2, 3], [0, 1, 0], [1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    assert block == expected
+
+
+def test_predictions_are_written_column_wise():
+    factory = RecordingFactory()
+    repository = ClickHouseRepository(factory)
+    times = pd.date_range("2024-01-01", periods=3, freq="15min")
+    payload = pd.DataFrame({"event_time": times, "entity_id": [1, 2, 3], "score": [0.1, 0.2, 0.3]})
+
+    repository.persist_predictions(payload)
+
+    ((table, predictions),) = factory.client.inserts
+    assert table == "predictions"
+    assert predictions["score"] == [0.1, 0.2, 0.3]
+    assert predictions["event_time"][0] == int(times[0].timestamp())
@@ -0,0 +1,76 @@
+import lightgbm as lgb
+import numpy as np
+import pytest
+
+from feature_store_ml.infrastructure.config import TrainingConfig
+from feature_store_ml.infrastructure.modeling.artifacts import ModelStore
+from feature_store_ml.infrastructure.modeling.compiled import CompiledTrees
+from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
+from feature_store_ml.infrastructure.serving.live_model import LiveModel
+
+TRAINING = TrainingConfig(test_size=0.2, random_state=0, num_boost_round=5, learning_rate=0.1, max_depth=3)
+
+
+def _matrix(seed=0):
+    rng = np.random.default_rng(seed)
+    matrix = rng.normal(size=(2_000, 4)).astype(np.float32)
+    matrix[rng.random(matrix.shape) < 0.05] = np.nan
+    matrix[rng.random(matrix.shape) < 0.1] = 0.0
+    return matrix
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"objective": "binary"},
+        {"objective": "binary", "zero_as_missing": True},
+        {"objective": "binary", "use_missing": False, "sigmoid": 0.5},
+        {"objective": "regression", "num_leaves": 63},
+    ],
+)
+def test_compiled_trees_match_booster_predict(params):
+    matrix = _matrix()
+    target = np.nan_to_num(matrix[:, 0]) + np.nan_to_num(matrix[:, 1]) * 0.5
+    label = (target > 0).astype(int) if params["objective"] == "binary" else target
+    booster = lgb.train({**params, "verbose": -1}, lgb.Dataset(matrix, label), num_boost_round=20)
+
+    compiled = CompiledTrees.from_booster(booster)
+
+    rows = _matrix(seed=1)
+    np.testing.assert_allclose(compiled.predict(rows), booster.predict(rows), rtol=1e-12, atol=1e-15)
+    np.testing.assert_allclose(compiled.predict(rows[:1]), booster.predict(rows[:1]), rtol=1e-12)
+    assert compiled.predict(rows[:0]).shape == (0,)
+
+
+def test_unsupported_models_are_rejected():
+    matrix = np.abs(_matrix())
+    categorical = lgb.train(
+        {"objective": "binary", "verbose": -1, "min_data_per_group": 5},
+        lgb.Dataset(np.nan_to_num(matrix).round(), (matrix[:, 0] > 1).astype(int), categorical_feature=[0]),
+        num_boost_round=3,
+    )
+    poisson = lgb.train({"objective": "poisson", "verbose": -1}, lgb.Dataset(matrix, np.nan_to_num(matrix[:, 0])), 3)
+
+    with pytest.raises(ValueError, match="categorical"):
+        CompiledTrees.from_booster(categorical)
+    with pytest.raises(ValueError, match="poisson"):
+        CompiledTrees.from_booster(poisson)
+
+
+def test_live_model_scores_with_memory_mapped_compiled_trees(tmp_path):
+    matrix = np.nan_to_num(_matrix())
+    names = ["value_mean", "value_std", "value_count", "value_p95"]
+    booster = lgb.train(
+        {"objective": "binary", "verbose": -1},
+        lgb.Dataset(matrix, (matrix[:, 0] > 0).astype(int), feature_name=names),
+        num_boost_round=10,
+    )
+    published = ModelStore(tmp_path / "models").publish(booster)
+    assert (published.directory / "compiled" / "trees.json").exists()
+
+    live = LiveModel(LightGBMTrainer(TRAINING, tmp_path), reload_interval=0, engine="numpy")
+    live.start()
+
+    assert isinstance(live.current.booster, CompiledTrees)
+    served = matrix[:, ::-1]
+    np.testing.assert_allclose(live.predict(served, names[::-1]), booster.predict(matrix), rtol=1e-12)
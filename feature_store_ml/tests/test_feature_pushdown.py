@@ -0,0 +1,173 @@
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store_ml.application.use_cases.materialize_features import MaterializeFeatures
+from feature_store_ml.infrastructure.features.clickhouse_pushdown import ClickHouseFeatureEngine
+from feature_store_ml.infrastructure.registry import FeatureRegistry
+from feature_store_ml.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+
+
+def _events(rows=2_000, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "event_time": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 4 * 3600, rows), unit="s"),
+            "entity_id": rng.integers(1, 8, rows),
+            "value": rng.normal(size=rows),
+            "attribute": rng.random(rows),
+            "label": rng.integers(0, 2, rows),
+        }
+    )
+
+
+class PandasStatsReader:
+    """Evaluates the engine's aggregates the way ClickHouse does, one row per entity and bucket."""
+
+    def __init__(self, events):
+        self.events = events
+        self.calls = []
+
+    def query_bucket_stats(self, expressions, bucket_minutes, lookback_hours=None, since=None):
+        self.calls.append({"expressions": expressions, "lookback_hours": lookback_hours, "since": since})
+        events = self.events if since is None else self.events[self.events["event_time"] >= since]
+        bucket = events["event_time"].dt.floor(f"{bucket_minutes}min").rename("bucket")
+        grouped = events.groupby([events["entity_id"], bucket], sort=True)
+        stats = grouped.agg(
+            value_mean=("value", "mean"),
+            value_std=("value", "std"),
+            value_count=("value", "count"),
+            attribute_mean=("attribute", "mean"),
+            label_max=("label", "max"),
+        )
+        stats["value_std"] = stats["value_std"].fillna(0.0)
+        stats["value_quantiles"] = grouped["value"].agg(lambda values: list(values.quantile([0.05, 0.95])))
+        stats["value_p05"] = stats["value_quantiles"].str[0]
+        stats["value_p95"] = stats["value_quantiles"].str[1]
+        stats["value_iqr"] = stats["value_p95"] - stats["value_p05"]
+        return stats.reset_index().rename(columns={"bucket": "event_time"})
+
+
+class EventlessRepository:
+    def __init__(self):
+        self.persisted = []
+
+    def ensure_schema(self, require_replacing=False):
+        pass
+
+    def fetch_events(self, lookback_hours):
+        raise AssertionError("raw events must stay in ClickHouse")
+
+    def fetch_events_since(self, start):
+        raise AssertionError("raw events must stay in ClickHouse")
+
+    def bucket_watermarks(self, lookback_hours, bucket_minutes):
+        return pd.DataFrame(
+            {
+                "bucket": pd.date_range("2024-01-01", periods=16, freq=f"{bucket_minutes}min"),
+                "events": 10,
+                "max_event_time": pd.date_range("2024-01-01 00:14", periods=16, freq=f"{bucket_minutes}min"),
+            }
+        )
+
+    def load_feature_watermarks(self):
+        stored = self.bucket_watermarks(24, 15)
+        stored.loc[12:, "events"] = 9
+        return stored
+
+    def load_feature_history(self, since, before, rows_per_entity):
+        return pd.DataFrame(columns=["entity_id", "event_time", "value_mean"])
+
+    def persist_feature_view(self, features):
+        self.persisted.append(features)
+
+    def save_feature_watermarks(self, watermarks):
+        pass
+
+
+def test_pushed_down_stats_finish_like_the_pandas_registry():
+    events = _events()
+    registry = FeatureRegistry(bucket_minutes=15)
+    engine = ClickHouseFeatureEngine(PandasStatsReader(events), registry)
+
+    pd.testing.assert_frame_equal(engine.compute(lookback_hours=24), registry.compute(events))
+
+
+def test_materialize_with_pushdown_never_reads_events():
+    events = _events()
+    registry = FeatureRegistry(bucket_minutes=15)
+    reader = PandasStatsReader(events)
+    repository = EventlessRepository()
+    use_case = MaterializeFeatures(repository, registry, pushdown=ClickHouseFeatureEngine(reader, registry))
+
+    view = use_case.execute(lookback_hours=6, min_records=len(events))
+
+    assert reader.calls[0]["lookback_hours"] == 6
+    assert repository.persisted[0] is view
+    with pytest.raises(ValueError, match="not enough rows"):
+        use_case.execute(lookback_hours=6, min_records=len(events) + 1)
+
+
+def test_incremental_pushdown_aggregates_from_the_first_changed_bucket():
+    events = _events()
+    registry = FeatureRegistry(bucket_minutes=15)
+    reader = PandasStatsReader(events)
+    use_case = MaterializeFeatures(
+        EventlessRepository(), registry, incremental=True, pushdown=ClickHouseFeatureEngine(reader, registry)
+    )
+
+    view = use_case.execute(lookback_hours=24, min_records=10)
+
+    assert reader.calls[0]["since"] == datetime(2024, 1, 1, 3)
+    assert view["event_time"].min() == pd.Timestamp("2024-01-01 03:00")
+
+
+def test_quantile_method_selects_the_aggregate():
+    registry = FeatureRegistry(bucket_minutes=15)
+    exact = ClickHouseFeatureEngine(PandasStatsReader(_events()), registry).expressions()
+    tdigest = ClickHouseFeatureEngine(PandasStatsReader(_events()), registry, quantile_method="tdigest").expressions()
+
+    assert "quantilesExactInclusive(0.05, 0.95)(value) AS value_quantiles" in exact
+    assert "quantilesTDigest(0.05, 0.95)(value) AS value_quantiles" in tdigest
+    with pytest.raises(ValueError):
+        ClickHouseFeatureEngine(PandasStatsReader(_events()), registry, quantile_method="median")
+
+
+class QueryClient:
+    def __init__(self):
+        self.queries = []
+
+    def query_df(self, sql, parameters=None):
+        self.queries.append((" ".join(sql.split()), parameters))
+        return pd.DataFrame({"entity_id": [1], "bucket": [pd.Timestamp("2024-01-01")], "value_mean": [0.5]})
+
+
+class QueryFactory:
+    def __init__(self):
+        self.client = QueryClient()
+
+    @contextmanager
+    def connect(self):
+        yield self.client
+
+    def writer(self):
+        return None
+
+
+def test_bucket_stats_are_one_group_by_query():
+    factory = QueryFactory()
+    repository = ClickHouseRepository(factory)
+    since = datetime(2024, 1, 1, 3)
+
+    frame = repository.query_bucket_stats(["avg(value) AS value_mean"], 15, since=since)
+
+    sql, parameters = factory.client.queries[0]
+    assert sql == (
+        "SELECT entity_id, toStartOfInterval(event_time, INTERVAL 15 MINUTE) AS bucket, avg(value) AS value_mean "
+        "FROM events WHERE event_time >= {since:DateTime} GROUP BY entity_id, bucket ORDER BY entity_id, bucket"
+    )
+    assert parameters == {"since": since}
+    assert list(frame.columns) == ["entity_id", "event_time", "value_mean"]
@@ -0,0 +1,164 @@
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from feature_store_ml.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+
+
+class QueryClient:
+    def __init__(self, result_rows):
+        self.result_rows = result_rows
+        self.queries = []
+
+    def query(self, sql, parameters=None):
+        self.queries.append(" ".join(sql.split()))
+        self.parameters = parameters
+        return SimpleNamespace(result_rows=self.result_rows)
+
+    def query_df(self, sql, parameters=None):
+        self.queries.append(" ".join(sql.split()))
+        self.parameters = parameters
+        return pd.DataFrame()
+
+    @contextmanager
+    def query_df_stream(self, sql, settings=None):
+        self.queries.append(" ".join(sql.split()))
+        self.settings = settings
+        yield iter([pd.DataFrame({"entity_id": [1]}), pd.DataFrame({"entity_id": [2]})])
+
+
+class SchemaClient:
+    """Feature tables created as a plain MergeTree, before they replaced rows."""
+
+    def __init__(self):
+        self.commands = []
+
+    def command(self, sql):
+        self.commands.append(" ".join(sql.split()))
+        return 5
+
+    def query(self, sql, parameters=None):
+        if "system.tables" in sql:
+            tables = ("entity_features", "entity_features_wide", "predictions")
+            return SimpleNamespace(result_rows=[(name, "MergeTree") for name in tables])
+        columns = [("event_time",), ("entity_id",), ("label",)]
+        if parameters == {"table": "entity_features"}:
+            return SimpleNamespace(result_rows=[*columns, ("feature_map",)])
+        if parameters == {"table": "predictions"}:
+            return SimpleNamespace(result_rows=[*columns[:2], ("score",), ("model_version",)])
+        if parameters == {"table": "entity_features_wide"}:
+            return SimpleNamespace(result_rows=[*columns, ("value_mean",)])
+        # the recreated wide table has no feature columns yet
+        return SimpleNamespace(result_rows=[*columns, ("materialized_at",)])
+
+
+class QueryFactory:
+    def __init__(self, result_rows=(), client=None):
+        self.client = client or QueryClient(list(result_rows))
+
+    @contextmanager
+    def connect(self):
+        yield self.client
+
+    def writer(self):
+        return None
+
+
+def test_map_reads_project_registry_features_server_side():
+    factory = QueryFactory()
+    repository = ClickHouseRepository(factory, feature_names=("value_mean", "value_p95"), feature_dtype="float32")
+
+    repository.load_feature_view(lookback_hours=6)
+
+    (query,) = factory.client.queries
+    assert query.startswith(
+        "SELECT entity_id, event_time, label, "
+        "toFloat32(feature_map['value_mean']) AS `value_mean`, toFloat32(feature_map['value_p95']) AS `value_p95` "
+        "FROM entity_features FINAL WHERE event_time >= now() - INTERVAL 6 HOUR"
+    )
+
+
+def test_reads_without_feature_names_use_the_stored_ones():
+    factory = QueryFactory(result_rows=[(["value_mean", "value_std"],)])
+    ClickHouseRepository(factory).fetch_inference_candidates(batch_size=10)
+    keys, query = factory.client.queries
+    assert "groupUniqArrayArray(mapKeys(feature_map))" in keys
+    assert query.endswith("AS `value_std` FROM entity_features FINAL ORDER BY event_time DESC LIMIT 10")
+
+    factory = QueryFactory(result_rows=[("event_time",), ("entity_id",), ("label",), ("value_mean",)])
+    ClickHouseRepository(factory, feature_layout="wide").fetch_inference_candidates(batch_size=10)
+    _, query = factory.client.queries
+    assert "label, `value_mean` AS `value_mean` FROM entity_features_wide FINAL" in query
+
+
+def test_latest_features_read_one_row_per_requested_entity():
+    factory = QueryFactory()
+    repository = ClickHouseRepository(factory, feature_names=("value_mean",))
+
+    repository.load_latest_features([3, 1])
+    assert repository.load_latest_features([]).empty
+
+    (query,) = factory.client.queries
+    assert query.endswith(
+        "FROM entity_features FINAL WHERE entity_id IN (3, 1) ORDER BY entity_id, event_time DESC LIMIT 1 BY entity_id"
+    )
+
+
+def test_feature_chunks_bind_the_time_range_and_filter_the_entity_partition():
+    factory = QueryFactory()
+    repository = ClickHouseRepository(factory, feature_names=("value_mean",))
+
+    repository.load_feature_chunk(datetime(2024, 1, 1), datetime(2024, 1, 1, 1), partition=2, partitions=4)
+
+    (query,) = factory.client.queries
+    assert query.endswith(
+        "FROM entity_features FINAL WHERE event_time >= {start:DateTime} AND event_time < {end:DateTime} "
+        "AND entity_id % 4 = 2"
+    )
+    assert factory.client.parameters == {"start": datetime(2024, 1, 1), "end": datetime(2024, 1, 1, 1)}
+
+
+def test_feature_view_streams_one_query_in_blocks():
+    factory = QueryFactory()
+    repository = ClickHouseRepository(factory, feature_names=("value_mean",))
+
+    frames = list(repository.stream_feature_view(lookback_hours=720, block_rows=50_000))
+
+    assert [frame["entity_id"].tolist() for frame in frames] == [[1], [2]]
+    (query,) = factory.client.queries
+    assert query.endswith("FROM entity_features FINAL WHERE event_time >= now() - INTERVAL 720 HOUR")
+    assert factory.client.settings == {"max_block_size": 50_000}
+
+
+def test_incremental_mode_refuses_feature_tables_that_do_not_replace_rows():
+    repository = ClickHouseRepository(QueryFactory(client=SchemaClient()))
+
+    repository.ensure_schema()
+    with pytest.raises(RuntimeError, match="migrate-features --rebuild"):
+        repository.ensure_schema(require_replacing=True)
+
+
+def test_rebuild_recreates_merge_tree_tables_server_side():
+    factory = QueryFactory(client=SchemaClient())
+
+    copied = ClickHouseRepository(factory).rebuild_tables()
+
+    assert copied == {"entity_features": 5, "entity_features_wide": 5, "predictions": 5}
+    commands = factory.client.commands
+    start = commands.index("RENAME TABLE entity_features TO entity_features_merge_tree")
+    assert commands[start + 1].startswith("CREATE TABLE IF NOT EXISTS entity_features (")
+    assert commands[start + 2] == (
+        "INSERT INTO entity_features (`event_time`, `entity_id`, `label`, `feature_map`) "
+        "SELECT `event_time`, `entity_id`, `label`, `feature_map` FROM entity_features_merge_tree"
+    )
+    assert "DROP TABLE entity_features_merge_tree" in commands
+    assert "ALTER TABLE entity_features_wide ADD COLUMN IF NOT EXISTS `value_mean` Float64" in commands
+    engine = "ENGINE = ReplacingMergeTree(scored_at) ORDER BY (event_time, entity_id, model_version)"
+    assert engine in " ".join(commands)
+    assert (
+        "INSERT INTO predictions (`event_time`, `entity_id`, `score`, `model_version`) "
+        "SELECT `event_time`, `entity_id`, `score`, `model_version` FROM predictions_merge_tree"
+    ) in commands
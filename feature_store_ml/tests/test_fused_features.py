@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from feature_store_ml.application.use_cases.materialize_features import MaterializeFeatures
+from feature_store_ml.infrastructure.features.fused import FusedFeatureEngine
+from feature_store_ml.infrastructure.registry import FeatureRegistry
+
+
+def _events(rows=5_000, seed=0):
+    rng = np.random.default_rng(seed)
+    events = pd.DataFrame(
+        {
+            "event_time": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 6 * 3600, rows), unit="s"),
+            "entity_id": rng.integers(1, 40, rows).astype(np.uint64),
+            "value": rng.normal(100.0, 15.0, rows),
+            "attribute": rng.random(rows),
+            "label": rng.integers(0, 2, rows),
+        }
+    )
+    events.loc[rng.integers(0, rows, 50), "value"] = np.nan
+    events.loc[events["entity_id"] == 7, "value"] = np.nan
+    return events
+
+
+def test_fused_engine_matches_the_pandas_registry():
+    events = _events()
+    registry = FeatureRegistry(bucket_minutes=15)
+
+    fused = FusedFeatureEngine(registry).compute(events)
+
+    pd.testing.assert_frame_equal(fused, registry.compute(events), check_exact=False, rtol=1e-12)
+    pd.testing.assert_frame_equal(
+        FusedFeatureEngine(registry).compute(events.head(1)), registry.compute(events.head(1))
+    )
+    assert FusedFeatureEngine(registry).compute(pd.DataFrame()).empty
+
+
+def test_fused_engine_continues_from_history():
+    events = _events()
+    registry = FeatureRegistry(bucket_minutes=15)
+    full = registry.compute(events)
+    cut = pd.Timestamp("2024-01-01 03:00")
+    history = full.loc[full["event_time"] < cut, ["entity_id", "event_time", "value_mean"]]
+    history = history.groupby("entity_id").tail(registry.context_rows)
+
+    fused = FusedFeatureEngine(registry).compute(events[events["event_time"] >= cut], history=history)
+
+    expected = full[full["event_time"] >= cut].reset_index(drop=True)
+    pd.testing.assert_frame_equal(fused, expected, check_exact=False, rtol=1e-9)
+
+
+class EventsRepository:
+    def __init__(self, events):
+        self.events = events
+        self.persisted = []
+
+    def ensure_schema(self, require_replacing=False):
+        pass
+
+    def fetch_events(self, lookback_hours):
+        return self.events
+
+    def persist_feature_view(self, features):
+        self.persisted.append(features)
+
+
+def test_materialize_uses_the_fused_engine():
+    events = _events()
+    registry = FeatureRegistry(bucket_minutes=15)
+    repository = EventsRepository(events)
+    use_case = MaterializeFeatures(repository, registry, fused=FusedFeatureEngine(registry))
+
+    view = use_case.execute(lookback_hours=6, min_records=10)
+
+    assert repository.persisted[0] is view
+    pd.testing.assert_frame_equal(view, registry.compute(events), check_exact=False, rtol=1e-12)
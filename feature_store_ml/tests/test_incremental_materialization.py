@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+from feature_store_ml.application.use_cases.materialize_features import MaterializeFeatures
+from feature_store_ml.infrastructure.config import FeatureConfig
+from feature_store_ml.infrastructure.registry import FeatureRegistry
+
+BUCKET = pd.Timedelta(minutes=15)
+
+
+class InMemoryRepository:
+    """Mirrors the ClickHouse queries with pandas; features replace rows by (event_time, entity_id)."""
+
+    def __init__(self, events, now):
+        self.events = events
+        self.now = now
+        self.features = None
+        self.watermarks = None
+        self.persisted = []
+
+    def ensure_schema(self, require_replacing=False):
+        pass
+
+    def bucket_watermarks(self, lookback_hours, bucket_minutes):
+        start = (self.now - pd.Timedelta(hours=lookback_hours)).floor(f"{bucket_minutes}min")
+        window = self.events[self.events["event_time"] >= start]
+        grouped = window.groupby(window["event_time"].dt.floor(f"{bucket_minutes}min"))["event_time"]
+        frame = grouped.agg(events="count", max_event_time="max").reset_index()
+        return frame.rename(columns={"event_time": "bucket"})
+
+    def load_feature_watermarks(self):
+        if self.watermarks is None:
+            return pd.DataFrame(columns=["bucket", "events", "max_event_time"])
+        return self.watermarks
+
+    def save_feature_watermarks(self, watermarks):
+        if self.watermarks is not None:
+            kept = self.watermarks[~self.watermarks["bucket"].isin(watermarks["bucket"])]
+            watermarks = pd.concat([kept, watermarks], ignore_index=True)
+        self.watermarks = watermarks
+
+    def fetch_events_since(self, start):
+        return self.events[self.events["event_time"] >= start].reset_index(drop=True)
+
+    def load_feature_history(self, since, before, rows_per_entity):
+        if self.features is None:
+            return pd.DataFrame(columns=["entity_id", "event_time", "value_mean"])
+        rows = self.features[(self.features["event_time"] >= since) & (self.features["event_time"] < before)]
+        rows = rows.sort_values(["entity_id", "event_time"]).groupby("entity_id").tail(rows_per_entity)
+        return rows[["entity_id", "event_time", "value_mean"]]
+
+    def persist_feature_view(self, features):
+        self.persisted.append(len(features))
+        if self.features is not None:
+            features = pd.concat([self.features, features], ignore_index=True)
+        self.features = features.drop_duplicates(["event_time", "entity_id"], keep="last")
+
+    def view(self):
+        return self.features.sort_values(["entity_id", "event_time"]).reset_index(drop=True)
+
+
+def _events(start, periods, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "event_time": pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, periods * 60, periods * 4), unit="s"),
+            "entity_id": rng.integers(1, 6, periods * 4),
+            "value": rng.normal(size=periods * 4),
+            "attribute": rng.random(periods * 4),
+            "label": rng.integers(0, 2, periods * 4),
+        }
+    ).sort_values("event_time", ignore_index=True)
+
+
+def test_incremental_runs_match_a_full_recompute():
+    registry = FeatureRegistry.from_config(FeatureConfig(lookback_hours=24, bucket_minutes=15, min_records=10))
+    repository = InMemoryRepository(_events("2024-01-01 00:00", 180, seed=1), now=pd.Timestamp("2024-01-01 03:00"))
+    use_case = MaterializeFeatures(repository, registry, incremental=True)
+
+    def full_view():
+        return registry.compute(repository.events).sort_values(["entity_id", "event_time"]).reset_index(drop=True)
+
+    use_case.execute(lookback_hours=24, min_records=10)
+    pd.testing.assert_frame_equal(repository.view(), full_view())
+    buckets_before = len(repository.watermarks)
+
+    # nothing new: nothing is recomputed or written
+    assert use_case.execute(lookback_hours=24, min_records=10).empty
+    assert len(repository.persisted) == 1
+
+    # new events only touch the latest bucket and open a new one
+    repository.events = pd.concat([repository.events, _events("2024-01-01 02:55", 15, seed=2)], ignore_index=True)
+    repository.now = pd.Timestamp("2024-01-01 03:15")
+    recomputed = use_case.execute(lookback_hours=24, min_records=10)
+    assert recomputed["event_time"].min() == pd.Timestamp("2024-01-01 02:45")
+    assert len(repository.watermarks) == buckets_before + 1
+    pd.testing.assert_frame_equal(repository.view(), full_view())
+
+    # a late event lands in an old bucket: that bucket and the ones after it are redone
+    late = _events("2024-01-01 01:00", 1, seed=3).head(1)
+    repository.events = pd.concat([repository.events, late], ignore_index=True)
+    recomputed = use_case.execute(lookback_hours=24, min_records=10)
+    assert recomputed["event_time"].min() == late["event_time"].iloc[0].floor(BUCKET)
+    pd.testing.assert_frame_equal(repository.view(), full_view())
@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store_ml.domain.models.dataset import FeatureDataset
+from feature_store_ml.infrastructure.config import TrainingConfig
+from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
+
+TRAINING = TrainingConfig(
+    test_size=0.25, random_state=0, num_boost_round=5, learning_rate=0.1, max_depth=3, keep_versions=2
+)
+
+
+def _dataset(seed=0):
+    rng = np.random.default_rng(seed)
+    features = pd.DataFrame(
+        {"value_mean": rng.normal(size=400), "value_count": rng.integers(0, 9, 400).astype("float32")}
+    )
+    return FeatureDataset(features=features, target=(features["value_mean"] > 0).astype(int))
+
+
+def test_training_publishes_a_versioned_native_model_with_a_manifest(tmp_path):
+    trainer = LightGBMTrainer(TRAINING, tmp_path)
+    dataset = _dataset()
+
+    artifact = trainer.train(dataset)
+
+    assert trainer.artifact_version() == artifact.version
+    manifest = json.loads((artifact.model_path.parent / "manifest.json").read_text())
+    assert manifest["features"] == ["value_mean", "value_count"]
+    assert manifest["dtypes"] == {"value_mean": "float64", "value_count": "float32"}
+    assert 0.5 < manifest["auc"] <= 1.0 and manifest["num_trees"] == 5
+    assert artifact.model_path.read_text().startswith("tree\n")
+    booster, metadata = trainer.load()
+    assert metadata["features"] == ["value_mean", "value_count"]
+    scores = booster.predict(dataset.features)
+    assert ((scores > 0.5) == dataset.target).mean() > 0.9
+
+
+def test_trainer_keeps_the_newest_versions_side_by_side(tmp_path):
+    trainer = LightGBMTrainer(TRAINING, tmp_path)
+
+    versions = [trainer.train(_dataset(seed)).version for seed in range(3)]
+
+    assert trainer.store.versions() == versions[1:]
+    assert trainer.open(versions[1]).manifest.version == versions[1]
+    assert trainer.artifact_version() == versions[2]
+
+
+def test_models_load_lazily_and_are_checked_against_their_hash(tmp_path):
+    trainer = LightGBMTrainer(TRAINING, tmp_path)
+    artifact = trainer.train(_dataset())
+    artifact.model_path.write_text(artifact.model_path.read_text().replace("tree\n", "tree \n", 1))
+
+    model = trainer.open()
+
+    assert model.manifest.features == ("value_mean", "value_count")
+    with pytest.raises(ValueError, match="hash"):
+        model.booster
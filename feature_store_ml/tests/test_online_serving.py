@@ -0,0 +1,160 @@
+import threading
+from functools import partial
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from feature_store_ml.application.use_cases.predict_online import PredictOnline
+from feature_store_ml.infrastructure.config import TrainingConfig
+from feature_store_ml.infrastructure.modeling.artifacts import ModelStore
+from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
+from feature_store_ml.infrastructure.serving.batcher import MicroBatcher
+from feature_store_ml.infrastructure.serving.cache import CachedFeatures, FeatureCache
+from feature_store_ml.infrastructure.serving.live_model import LiveModel
+from feature_store_ml.presentation import api
+
+FEATURES = ("value_mean", "value_std", "value_count")
+TRAINING = TrainingConfig(test_size=0.2, random_state=0, num_boost_round=5, learning_rate=0.1, max_depth=3)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _features(value):
+    return CachedFeatures(event_time=pd.Timestamp("2024-01-01"), vector=np.array([value]))
+
+
+def test_cache_evicts_least_recently_used_and_expires_by_ttl():
+    clock = Clock()
+    cache = FeatureCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.put_many([(1, _features(1.0)), (2, _features(2.0))])
+
+    assert cache.get_many([1])[1] == []
+    cache.put_many([(3, _features(3.0))])
+    found, missing = cache.get_many([1, 2, 3])
+    assert sorted(found) == [1, 3] and missing == [2]
+
+    clock.now = 10.0
+    assert cache.get_many([1, 3]) == ({}, [1, 3])
+    metrics = cache.metrics
+    assert (metrics.evicted, metrics.expired, metrics.size) == (1, 2, 0)
+
+
+def test_batcher_scores_concurrent_requests_in_one_call():
+    calls = []
+    batcher = MicroBatcher(lambda rows: calls.append(len(rows)) or rows[:, 0] * 2, max_wait=0.2)
+    futures = [batcher.submit(np.full((size, 1), float(size))) for size in (1, 2, 3)]
+
+    results = [future.result(timeout=5) for future in futures]
+    batcher.close()
+
+    assert calls == [6]
+    assert [result.tolist() for result in results] == [[2.0], [4.0, 4.0], [6.0, 6.0, 6.0]]
+    assert batcher.metrics.requests == 3
+
+
+def test_batcher_hands_failures_to_every_request():
+    batcher = MicroBatcher(lambda rows: 1 / 0, max_wait=0.0)
+
+    with pytest.raises(ZeroDivisionError):
+        batcher.predict(np.ones((1, 1)), timeout=5)
+    batcher.close()
+    assert batcher.metrics.failed == 1
+
+
+def _write_model(directory, features=FEATURES, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(rng.normal(size=(200, len(features))), columns=list(features))
+    booster = lgb.train(
+        {"objective": "binary", "verbose": -1, "min_data_in_leaf": 5},
+        lgb.Dataset(frame, label=(frame.iloc[:, 0] > 0).astype(int)),
+        num_boost_round=5,
+    )
+    ModelStore(directory / "models").publish(booster)
+    return booster, frame
+
+
+def test_live_model_swaps_in_new_artifacts_and_skips_inconsistent_ones(tmp_path):
+    live = LiveModel(LightGBMTrainer(TRAINING, tmp_path), reload_interval=0)
+    live.start()
+    assert live.current is None
+
+    booster, frame = _write_model(tmp_path)
+    assert live.reload()
+    served = frame[list(reversed(FEATURES))].to_numpy()
+    np.testing.assert_allclose(live.predict(served, list(reversed(FEATURES))), booster.predict(frame))
+    assert not live.reload()
+
+    version = live.current.version
+    _write_model(tmp_path, seed=1)
+    ModelStore(tmp_path / "models").open().model_path.write_text("tree\n", encoding="utf-8")
+    assert not live.reload()
+    assert live.current.version == version
+    assert live.metrics.failed == 1
+
+
+class LatestFeatures:
+    def __init__(self, rows):
+        self.rows = rows
+        self.requested = []
+
+    def load_latest_features(self, entity_ids):
+        self.requested.append(list(entity_ids))
+        return self.rows[self.rows["entity_id"].isin(entity_ids)]
+
+
+def test_predict_endpoint_scores_cached_features(tmp_path):
+    booster, frame = _write_model(tmp_path)
+    live = LiveModel(LightGBMTrainer(TRAINING, tmp_path), reload_interval=0)
+    live.start()
+    rows = frame.head(3).assign(entity_id=[10, 11, 12], event_time=pd.Timestamp("2024-01-01"), label=0)
+    repository = LatestFeatures(rows)
+    api.app.state.model = live
+    api.app.state.cache = FeatureCache()
+    api.app.state.batcher = MicroBatcher(partial(live.predict, feature_names=FEATURES), max_wait=0.0)
+    api.app.state.predictor = PredictOnline(
+        repository, api.app.state.cache, api.app.state.batcher, FEATURES, threshold=0.5
+    )
+    client = TestClient(api.app)
+
+    response = client.post("/predict", json={"entity_ids": [12, 10, 99, 10]})
+    again = client.get("/predict/12")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["entity_id"] for item in body["predictions"]] == [12, 10]
+    expected = booster.predict(frame.head(3))
+    assert body["predictions"][0]["score"] == pytest.approx(expected[2])
+    assert body["missing"] == [99]
+    assert again.json()["score"] == pytest.approx(expected[2])
+    assert repository.requested == [[12, 10, 99]]
+    assert client.get("/predict/99").status_code == 404
+    api.app.state.batcher.close()
+
+
+def test_concurrent_predictions_share_batches(tmp_path):
+    _write_model(tmp_path)
+    live = LiveModel(LightGBMTrainer(TRAINING, tmp_path), reload_interval=0)
+    live.start()
+    batcher = MicroBatcher(partial(live.predict, feature_names=FEATURES), max_wait=0.05)
+    cache = FeatureCache()
+    cache.put_many((entity_id, CachedFeatures(pd.Timestamp("2024-01-01"), np.ones(3))) for entity_id in range(8))
+    predictor = PredictOnline(LatestFeatures(pd.DataFrame()), cache, batcher, FEATURES, threshold=0.5)
+
+    threads = [threading.Thread(target=predictor.execute, args=([entity_id],)) for entity_id in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert batcher.metrics.requests == 8
+    assert batcher.metrics.batches < 8
@@ -0,0 +1,96 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store_ml.application.use_cases.train_model import TrainModel
+from feature_store_ml.infrastructure.config import FeatureConfig, TrainingConfig
+from feature_store_ml.infrastructure.datasets.builder import DatasetBuilder
+from feature_store_ml.infrastructure.datasets.streaming import StreamingDatasetBuilder, validation_mask
+from feature_store_ml.infrastructure.modeling.trainer import LightGBMTrainer
+from feature_store_ml.infrastructure.registry import FeatureRegistry
+
+REGISTRY = FeatureRegistry.from_config(FeatureConfig(lookback_hours=24, bucket_minutes=60, min_records=1))
+TRAINING = TrainingConfig(test_size=0.25, random_state=7, num_boost_round=10, learning_rate=0.1, max_depth=3)
+
+
+def _feature_view(rows=6_000, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(rng.normal(size=(rows, len(REGISTRY.feature_names))), columns=list(REGISTRY.feature_names))
+    frame.iloc[rng.random(rows) < 0.05, 0] = np.nan
+    frame.insert(0, "entity_id", rng.integers(0, 400, rows))
+    frame.insert(1, "event_time", pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(rows), unit="min"))
+    frame.insert(2, "label", (frame["value_mean"].fillna(0) > 0).astype(int))
+    return frame
+
+
+class StreamedFeatureView:
+    def __init__(self, frame):
+        self.frame = frame
+        self.block_rows = None
+
+    def stream_feature_view(self, lookback_hours, block_rows=100_000):
+        self.block_rows = block_rows
+        for start in range(0, len(self.frame), block_rows):
+            yield self.frame.iloc[start : start + block_rows]
+
+
+def test_validation_split_is_a_deterministic_hash_of_the_entity():
+    entities = np.arange(100_000)
+
+    mask = validation_mask(entities, 0.2, seed=7)
+
+    assert abs(mask.mean() - 0.2) < 0.01
+    np.testing.assert_array_equal(validation_mask(entities[::-1], 0.2, seed=7), mask[::-1])
+    assert (validation_mask(entities, 0.2, seed=8) != mask).any()
+
+
+def test_streamed_matrices_match_the_in_memory_dataset(tmp_path):
+    frame = _feature_view()
+    builder = StreamingDatasetBuilder(REGISTRY, tmp_path, validation_fraction=0.25, seed=7)
+
+    dataset = builder.build(StreamedFeatureView(frame).stream_feature_view(24, block_rows=1_000))
+
+    valid = validation_mask(frame["entity_id"].to_numpy(), 0.25, seed=7)
+    expected = DatasetBuilder(REGISTRY).build(frame)
+    np.testing.assert_array_equal(dataset.train.features, expected.features[~valid].to_numpy(np.float32))
+    np.testing.assert_array_equal(dataset.valid.target, expected.target[valid].to_numpy())
+    assert not set(frame["entity_id"][valid]) & set(frame["entity_id"][~valid])
+    stats = dataset.stats
+    assert (stats.chunks, stats.rows, stats.largest_chunk_rows) == (6, 6_000, 1_000)
+    assert stats.train_rows + stats.valid_rows == 6_000
+    assert stats.bytes_on_disk == 6_000 * (len(REGISTRY.feature_names) * 4 + 1)
+
+
+def test_streaming_training_records_memory_stats_and_cleans_up(tmp_path):
+    repository = StreamedFeatureView(_feature_view())
+    trainer = LightGBMTrainer(TRAINING, tmp_path / "artifacts")
+    streaming = StreamingDatasetBuilder(REGISTRY, tmp_path / "dataset", validation_fraction=0.25, seed=7)
+    use_case = TrainModel(repository, DatasetBuilder(REGISTRY), trainer, streaming=streaming, block_rows=2_000)
+
+    artifact = use_case.execute(lookback_hours=24)
+
+    assert repository.block_rows == 2_000
+    manifest = json.loads((artifact.model_path.parent / "manifest.json").read_text())
+    assert manifest["auc"] > 0.9
+    assert manifest["dtypes"]["value_mean"] == "float32"
+    assert manifest["training"]["rows"] == 6_000
+    assert manifest["training"]["peak_rss_mb_trained"] >= manifest["training"]["peak_rss_mb"] > 0
+    assert list((tmp_path / "dataset").iterdir()) == []
+
+
+def test_failed_build_deletes_the_partial_files(tmp_path):
+    builder = StreamingDatasetBuilder(REGISTRY, tmp_path, validation_fraction=0.25, seed=7)
+
+    def broken_view():
+        yield _feature_view(rows=1_000)
+        raise ConnectionError("stream interrupted")
+
+    with pytest.raises(ConnectionError):
+        builder.build(broken_view())
+    assert list(tmp_path.iterdir()) == []
+
+    with pytest.raises(RuntimeError, match="feature view is empty"):
+        builder.build(iter([_feature_view().iloc[:0]]))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,70 @@
+"""Per-metric vs fused local aggregation.
+
+Usage: poetry run python benchmarks/bench_aggregates.py --rows 5000000
+"""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import typer
+
+from pipeline_anomaly.application.use_cases.compute_aggregates import ComputeAggregates
+from pipeline_anomaly.infrastructure.aggregations.fused import FusedAggregateEngine
+from pipeline_anomaly.infrastructure.config import AggregationConfig, AggregationMetricConfig
+
+app = typer.Typer()
+
+
+def _metrics(count: int) -> tuple[AggregationMetricConfig, ...]:
+    fixed = (
+        AggregationMetricConfig(name="count", type="count"),
+        AggregationMetricConfig(name="mean_value", type="mean", column="value"),
+        AggregationMetricConfig(name="std_value", type="std", column="value"),
+        AggregationMetricConfig(name="median_value", type="median", column="value"),
+        AggregationMetricConfig(name="iqr_value", type="iqr", column="value"),
+        AggregationMetricConfig(name="min_value", type="min", column="value"),
+        AggregationMetricConfig(name="max_value", type="max", column="value"),
+    )
+    levels = np.linspace(0.01, 0.99, max(count - len(fixed), 0))
+    quantiles = tuple(
+        AggregationMetricConfig(name=f"p{idx}_value", type="quantile", column="value", q=float(level))
+        for idx, level in enumerate(levels)
+    )
+    return (fixed + quantiles)[:count]
+
+
+def _time(aggregator: ComputeAggregates, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        aggregator.execute()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@app.command()
+def main(rows: int = 5_000_000, repeats: int = 3, seed: int = 42) -> None:
+    rng = np.random.default_rng(seed)
+    dataframe = pd.DataFrame(
+        {
+            "event_time": pd.date_range("2024-01-01", periods=rows, freq="s"),
+            "value": rng.normal(100.0, 15.0, size=rows),
+        }
+    )
+    writer = Mock()
+    writer.read_latest_window.return_value = dataframe
+
+    print(f"rows={rows:,}")
+    for count in (10, 50):
+        config = AggregationConfig(window_minutes=120, metrics=_metrics(count))
+        per_metric = _time(ComputeAggregates(writer=writer, config=config), repeats)
+        fused = _time(ComputeAggregates(writer=writer, config=config, fused=FusedAggregateEngine()), repeats)
+        print(f"metrics={count:>3} per_metric={per_metric:.3f}s fused={fused:.3f}s speedup={per_metric / fused:.1f}x")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,65 @@
+"""DBSCAN detector modes across window sizes.
+
+Usage: poetry run python benchmarks/bench_dbscan.py --exact-max-rows 100000
+"""
+
+from __future__ import annotations
+
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import typer
+
+from pipeline_anomaly.infrastructure.detectors.dbscan import DBSCANDetector
+
+app = typer.Typer()
+
+SIZES = (10_000, 100_000, 1_000_000, 5_000_000)
+
+
+def _window(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    values = rng.normal(100.0, 15.0, size=rows)
+    anomalies = max(1, rows // 1000)
+    values[rng.choice(rows, size=anomalies, replace=False)] *= rng.uniform(2, 5, size=anomalies)
+    return pd.DataFrame({"value": values, "attribute": rng.uniform(0, 1, size=rows)})
+
+
+def _measure(detector: DBSCANDetector, dataframe: pd.DataFrame) -> tuple[float, float, int]:
+    started = time.perf_counter()
+    flagged = int(detector.fit_predict(dataframe).sum())
+    elapsed = time.perf_counter() - started
+    # ru_maxrss is in KiB on Linux; every run gets a fresh process so the peak is its own
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, flagged
+
+
+@app.command()
+def main(
+    eps: float = 0.7,
+    min_samples: int = 15,
+    n_jobs: int = 4,
+    exact_max_rows: int = 100_000,
+    max_samples: int = 50_000,
+    seed: int = 42,
+) -> None:
+    modes = {
+        "exact": DBSCANDetector(eps, min_samples, mode="exact", algorithm="kd_tree", n_jobs=n_jobs),
+        "grid": DBSCANDetector(eps, min_samples, mode="grid", n_jobs=n_jobs),
+        "subsample": DBSCANDetector(eps, min_samples, mode="subsample", n_jobs=n_jobs, max_samples=max_samples),
+    }
+    for rows in SIZES:
+        dataframe = _window(rows, seed)
+        for mode, detector in modes.items():
+            if mode == "exact" and rows > exact_max_rows:
+                print(f"rows={rows:>9,} mode={mode:<9} skipped (neighbourhoods do not fit in memory)")
+                continue
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                elapsed, peak_mb, flagged = executor.submit(_measure, detector, dataframe).result()
+            print(f"rows={rows:>9,} mode={mode:<9} time={elapsed:8.2f}s peak_rss={peak_mb:9.1f}MiB flagged={flagged}")
+
+
+if __name__ == "__main__":
+    app()
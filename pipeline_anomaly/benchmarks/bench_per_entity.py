@@ -0,0 +1,89 @@
+"""Per-entity detection (zscore, mad, rolling_mad with ``per_entity``) on ``entities x events`` rows.
+
+The window is ordered by ``event_time`` like the ClickHouse read, and the
+three detectors share one ``ColumnStatisticsContext`` as in the pipeline,
+so the first one pays for the entity codes. Each scale runs in a fresh
+process; peak RSS includes the window itself (~32 bytes a row).
+
+Usage: poetry run python benchmarks/bench_per_entity.py --entities 1000000 --events 100 --n-jobs 4
+"""
+
+from __future__ import annotations
+
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import typer
+
+from pipeline_anomaly.infrastructure.detectors.median_absolute_deviation import MedianAbsoluteDeviationDetector
+from pipeline_anomaly.infrastructure.detectors.rolling_mad import RollingMADDetector
+from pipeline_anomaly.infrastructure.detectors.statistics import ColumnStatisticsContext
+from pipeline_anomaly.infrastructure.detectors.zscore import ZScoreDetector
+
+app = typer.Typer()
+
+
+def _window(entities: int, events: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    rows = entities * events
+    values = rng.normal(100.0, 15.0, size=rows)
+    anomalies = max(1, rows // 1000)
+    values[rng.choice(rows, size=anomalies, replace=False)] *= rng.uniform(2, 5, size=anomalies)
+    return pd.DataFrame(
+        {
+            "event_time": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(rows) // 100, unit="s"),
+            "entity_id": rng.integers(0, entities, size=rows, dtype=np.int64),
+            "value": values,
+        }
+    )
+
+
+def _measure(entities: int, events: int, n_jobs: int, seed: int) -> list[tuple[str, float]]:
+    dataframe = _window(entities, events, seed)
+    statistics = ColumnStatisticsContext(column="value")
+    detectors = [
+        ZScoreDetector(threshold=3.0, statistics=statistics, per_entity=True),
+        MedianAbsoluteDeviationDetector(threshold=3.5, statistics=statistics, per_entity=True),
+        RollingMADDetector(
+            window=60, threshold=4.0, min_periods=30, per_entity=True, statistics=statistics, n_jobs=n_jobs
+        ),
+    ]
+    timings = []
+    for detector in detectors:
+        started = time.perf_counter()
+        detector.fit_predict(dataframe)
+        timings.append((detector.name, time.perf_counter() - started))
+    # ru_maxrss is in KiB on Linux
+    timings.append(("peak_rss_mb", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+    return timings
+
+
+@app.command()
+def main(
+    entities: list[int] = typer.Option([200_000, 400_000, 1_000_000]),
+    events: int = 100,
+    n_jobs: int = 4,
+    seed: int = 42,
+) -> None:
+    print(f"cores={os.cpu_count()} n_jobs={n_jobs}")
+    for count in entities:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            try:
+                timings = executor.submit(_measure, count, events, n_jobs, seed).result()
+            except Exception as exc:  # noqa: BLE001 - a worker killed for memory ends only its own scale
+                print(f"entities={count:>9,} rows={count * events:>11,} failed: {exc!r}")
+                continue
+        *detectors, (_, peak_mb) = timings
+        total = sum(seconds for _, seconds in detectors)
+        columns = " ".join(f"{name}={seconds:6.1f}s" for name, seconds in detectors)
+        print(
+            f"entities={count:>9,} rows={count * events:>11,} {columns} total={total:6.1f}s peak_rss={peak_mb:,.0f}MiB"
+        )
+
+
+if __name__ == "__main__":
+    app()
@@ -6,6 +6,8 @@ import pandas as pd
 
 from pipeline_anomaly.domain.models.aggregate import Aggregate, AggregateCollection
 from pipeline_anomaly.domain.services.interfaces import ClickHouseWriter
+from pipeline_anomaly.infrastructure.aggregations.clickhouse_pushdown import ClickHouseAggregateEngine
+from pipeline_anomaly.infrastructure.aggregations.fused import FusedAggregateEngine
 from pipeline_anomaly.infrastructure.config import AggregationConfig, AggregationMetricConfig
 
 
@@ -16,20 +18,40 @@ class ComputeAggregates:
         AggregationMetricConfig(name="std_value", type="std", column="value"),
     )
 
-    def __init__(self, writer: ClickHouseWriter, config: AggregationConfig) -> None:
+    def __init__(
+        self,
+        writer: ClickHouseWriter,
+        config: AggregationConfig,
+        pushdown: ClickHouseAggregateEngine | None = None,
+        fused: FusedAggregateEngine | None = None,
+    ) -> None:
         self._writer = writer
         self._config = config
+        self._pushdown = pushdown
+        self._fused = fused
 
     def execute(self) -> AggregateCollection:
-        dataframe = self._writer.read_latest_window(minutes=self._config.window_minutes)
-        window_start = dataframe["event_time"].min()
-        window_end = dataframe["event_time"].max()
+        metrics = tuple(self._config.metrics or self.DEFAULT_METRICS)
+        pushed = [idx for idx, cfg in enumerate(metrics) if self._pushdown and self._pushdown.supports(cfg)]
+        local = [idx for idx in range(len(metrics)) if idx not in pushed]
 
-        aggregates = [
-            self._materialize(metric_cfg, dataframe, window_start, window_end)
-            for metric_cfg in (self._config.metrics or self.DEFAULT_METRICS)
-        ]
+        computed: dict[int, Aggregate] = {}
+        if pushed:
+            # only scalars leave ClickHouse, raw events are read just for local metrics
+            results = self._pushdown.compute([metrics[idx] for idx in pushed], self._config.window_minutes)
+            computed.update(zip(pushed, results))
+        if local:
+            dataframe = self._writer.read_latest_window(minutes=self._config.window_minutes)
+            window_start = dataframe["event_time"].min()
+            window_end = dataframe["event_time"].max()
+            if self._fused:
+                results = self._fused.compute([metrics[idx] for idx in local], dataframe, window_start, window_end)
+                computed.update(zip(local, results))
+            else:
+                for idx in local:
+                    computed[idx] = self._materialize(metrics[idx], dataframe, window_start, window_end)
 
+        aggregates = [computed[idx] for idx in range(len(metrics))]
         collection = AggregateCollection(aggregates=tuple(aggregates))
         self._writer.persist_aggregates(collection)
         return collection
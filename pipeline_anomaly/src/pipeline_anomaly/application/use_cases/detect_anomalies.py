@@ -4,9 +4,10 @@ from datetime import datetime
 
 import pandas as pd
 
-from pipeline_anomaly.domain.models.anomaly import Anomaly, AnomalyReport
-from pipeline_anomaly.domain.services.interfaces import AnomalyDetector, ClickHouseWriter
+from pipeline_anomaly.domain.models.anomaly import Anomaly, AnomalyReport, DetectorRun, EntityAnomaly
+from pipeline_anomaly.domain.services.interfaces import AnomalyDetector, ClickHouseWriter, DetectorExecutor
 from pipeline_anomaly.application.services.ensemble import WeightedAnomalyEnsemble
+from pipeline_anomaly.infrastructure.detectors.executors import SequentialDetectorExecutor
 
 
 class DetectAnomalies:
@@ -16,31 +17,37 @@ class DetectAnomalies:
         detectors: list[AnomalyDetector],
         threshold: float,
         ensemble: WeightedAnomalyEnsemble | None = None,
+        window_minutes: int | None = None,
+        executor: DetectorExecutor | None = None,
+        top_k_entities: int = 0,
     ) -> None:
         self._writer = writer
         self._detectors = detectors
         self._threshold = threshold
-
+        self._window_minutes = window_minutes
         self._ensemble = ensemble
-
+        self._executor = executor or SequentialDetectorExecutor(top_k=top_k_entities)
+        self._top_k_entities = top_k_entities
 
     def execute(self) -> AnomalyReport:
         dataframe = self._writer.read_latest_window(minutes=self._window_minutes)
         window_start = dataframe["event_time"].min()
         window_end = dataframe["event_time"].max()
 
-        anomalies: list[Anomaly] = []
-        for detector in self._detectors:
-            scores = detector.fit_predict(dataframe)
-            severity = detector.severity(scores)
-            anomalies.append(
-                Anomaly(
-                    detector=detector.name,
-                    score=float(scores.mean()),
-                    severity=float(severity),
-                    description=f"{detector.name} severity={severity:.3f}",
-                )
+        runs = self._executor.run(self._detectors, dataframe)
+        # runs come back in detector order, so the ensemble input is deterministic
+        anomalies: list[Anomaly] = [
+            Anomaly(
+                detector=run.detector,
+                score=run.score,
+                severity=run.severity,
+                description=(
+                    f"{run.detector} timed out" if run.timed_out else f"{run.detector} severity={run.severity:.3f}"
+                ),
+                duration_ms=run.duration_ms,
             )
+            for run in runs
+        ]
 
         if self._ensemble:
             ensemble_anomaly = self._ensemble.combine(anomalies)
@@ -52,9 +59,32 @@ class DetectAnomalies:
             window_start=window_start,
             window_end=window_end,
             anomalies=tuple(anomalies),
+            top_entities=self._rank_entities(runs),
         )
         self._writer.persist_report(report)
         return report
 
+    def _rank_entities(self, runs: list[DetectorRun]) -> tuple[EntityAnomaly, ...]:
+        """Merges the per-detector top-k lists, ranking entities by flagged events across detectors."""
+
+        if not self._top_k_entities:
+            return ()
+        merged: dict[int, EntityAnomaly] = {}
+        for run in runs:
+            for entity in run.entities:
+                known = merged.get(entity.entity_id)
+                merged[entity.entity_id] = (
+                    entity
+                    if known is None
+                    else EntityAnomaly(
+                        entity_id=entity.entity_id,
+                        flagged=known.flagged + entity.flagged,
+                        events=max(known.events, entity.events),
+                        detectors=known.detectors + entity.detectors,
+                    )
+                )
+        ranked = sorted(merged.values(), key=lambda item: (-len(item.detectors), -item.flagged, item.entity_id))
+        return tuple(ranked[: self._top_k_entities])
+
     def is_alert(self, report: AnomalyReport) -> bool:
         return report.highest_severity() >= self._threshold
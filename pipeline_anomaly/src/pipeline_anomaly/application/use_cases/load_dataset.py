@@ -1,18 +1,91 @@
 from __future__ import annotations
 
+import queue
+import threading
+
 from loguru import logger
 
+from pipeline_anomaly.domain.models.batch import RecordBatch
 from pipeline_anomaly.domain.services.interfaces import ClickHouseWriter, DatasetGenerator
 
 
 class LoadSyntheticDataset:
-    def __init__(self, generator: DatasetGenerator, writer: ClickHouseWriter) -> None:
+    def __init__(
+        self,
+        generator: DatasetGenerator,
+        writer: ClickHouseWriter,
+        streaming: bool = False,
+        max_in_flight: int = 2,
+        queue_size: int = 2,
+    ) -> None:
+        if max_in_flight < 1 or queue_size < 1:
+            raise ValueError("max_in_flight and queue_size must be positive")
+        if streaming and generator.reuses_buffers:
+            # queued and in-flight batches would be overwritten by the next one
+            raise ValueError("streaming ingest cannot use a generator with reuse_buffers, disable one of them")
         self._generator = generator
         self._writer = writer
+        self._streaming = streaming
+        self._max_in_flight = max_in_flight
+        self._queue_size = queue_size
 
     def execute(self) -> None:
         logger.info("ensure schema")
         self._writer.ensure_schema()
-        for idx, batch in enumerate(self._generator.batches(), start=1):
+        if self._streaming:
+            self._execute_streaming()
+            return
+        # each batch is inserted before the next is generated, which reuse_buffers relies on
+        for idx, batch in enumerate(self._generator.iter_batches(), start=1):
             logger.info("ingesting batch {}/{} rows", idx, batch.size)
             self._writer.ingest_batch(batch)
+
+    def _execute_streaming(self) -> None:
+        """Overlap generation with inserts through a bounded queue.
+
+        At most ``queue_size`` generated batches wait for a writer and at most
+        ``max_in_flight`` are being inserted, so memory does not depend on
+        ``row_count``.
+        """
+
+        pending: queue.Queue[RecordBatch | None] = queue.Queue(maxsize=self._queue_size)
+        stop = threading.Event()
+        errors: list[BaseException] = []
+
+        def consume() -> None:
+            while True:
+                batch = pending.get()
+                if batch is None:
+                    return
+                if stop.is_set():
+                    continue
+                try:
+                    self._writer.ingest_batch(batch)
+                except BaseException as exc:  # noqa: BLE001
+                    errors.append(exc)
+                    stop.set()
+
+        consumers = [
+            threading.Thread(target=consume, name=f"ingest-{idx}", daemon=True)
+            for idx in range(self._max_in_flight)
+        ]
+        for consumer in consumers:
+            consumer.start()
+
+        try:
+            for idx, batch in enumerate(self._generator.iter_batches(), start=1):
+                if stop.is_set():
+                    break
+                logger.info("ingesting batch {}/{} rows", idx, batch.size)
+                pending.put(batch)
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            for _ in consumers:
+                pending.put(None)
+            for consumer in consumers:
+                consumer.join()
+
+        if errors:
+            raise errors[0]
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from pipeline_anomaly.domain.models.anomaly import Anomaly, AnomalyReport, EntityAnomaly
+from pipeline_anomaly.domain.services.interfaces import AlertSink, ClickHouseWriter, EventSource, OnlineDetector
+
+
+class StreamAnomalies:
+    """Long-running detection over an event stream.
+
+    Every batch from the source is scored by the online detectors in event
+    time order. When at least ``min_agreement`` of the detectors flag the
+    same event, a report covering the batch is sent to the alert sink right
+    away (and persisted when a writer is given, retried ``persist_retries``
+    times). A failing sink or writer is logged and counted in
+    ``publish_failures`` instead of ending the service. Detector state and
+    the source watermark are checkpointed to ``state_path``.
+    """
+
+    def __init__(
+        self,
+        source: EventSource,
+        detectors: Sequence[OnlineDetector],
+        alert_sink: AlertSink,
+        writer: ClickHouseWriter | None = None,
+        min_agreement: float = 0.5,
+        top_k_entities: int = 10,
+        state_path: Path | None = None,
+        checkpoint_interval: float = 30.0,
+        persist_retries: int = 2,
+        retry_backoff: float = 0.5,
+    ) -> None:
+        self._source = source
+        self._detectors = list(detectors)
+        self._alert_sink = alert_sink
+        self._writer = writer
+        self._min_agreement = min_agreement
+        self._top_k = top_k_entities
+        self._state_path = Path(state_path) if state_path else None
+        self._checkpoint_interval = checkpoint_interval
+        self._persist_retries = persist_retries
+        self._retry_backoff = retry_backoff
+        self._last_checkpoint = time.monotonic()
+        self.events_seen = 0
+        self.alerts_sent = 0
+        self.publish_failures = 0
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        self._restore()
+        batches = self._source.batches()
+        try:
+            while stop is None or not stop.is_set():
+                next_batch = asyncio.ensure_future(anext(batches))
+                waiters: set[asyncio.Future[object]] = {next_batch}
+                if stop is not None:
+                    waiters.add(asyncio.ensure_future(stop.wait()))
+                done, pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                for future in pending:
+                    future.cancel()
+                # the generator must be idle again before it can be closed
+                await asyncio.gather(*pending, return_exceptions=True)
+                if next_batch not in done:
+                    break
+                try:
+                    frame = next_batch.result()
+                except StopAsyncIteration:
+                    break
+                # scoring is CPU-bound; a worker thread keeps the source responsive meanwhile
+                report = await asyncio.to_thread(self.process, frame)
+                if report is not None:
+                    await asyncio.to_thread(self._publish, report)
+                if time.monotonic() - self._last_checkpoint >= self._checkpoint_interval:
+                    await asyncio.to_thread(self.checkpoint)
+        finally:
+            await batches.aclose()
+            self.checkpoint()
+
+    def process(self, frame: pd.DataFrame) -> AnomalyReport | None:
+        if frame.empty:
+            return None
+        ordered = frame.sort_values("event_time", kind="stable")
+        values = ordered["value"].to_numpy(dtype=np.float64)
+        self.events_seen += len(values)
+        flags = np.zeros((len(self._detectors), len(values)), dtype=bool)
+        anomalies: list[Anomaly] = []
+        for idx, detector in enumerate(self._detectors):
+            scores = detector.score(values)
+            flags[idx] = scores > detector.threshold
+            flagged = int(flags[idx].sum())
+            peak = float(np.nanmax(scores)) if np.isfinite(scores).any() else 0.0
+            anomalies.append(
+                Anomaly(
+                    detector=detector.name,
+                    score=peak,
+                    severity=flagged / len(values),
+                    description=f"{detector.name} flagged {flagged}/{len(values)} events, peak score={peak:.2f}",
+                )
+            )
+        agreement = flags.sum(axis=0) / max(len(self._detectors), 1)
+        alerting = agreement >= self._min_agreement
+        if not alerting.any():
+            return None
+        return AnomalyReport(
+            generated_at=datetime.utcnow(),
+            window_start=ordered["event_time"].min(),
+            window_end=ordered["event_time"].max(),
+            anomalies=tuple(anomalies),
+            top_entities=self._entities(ordered, flags, alerting),
+        )
+
+    def checkpoint(self) -> None:
+        self._last_checkpoint = time.monotonic()
+        if self._state_path is None:
+            return
+        watermark = getattr(self._source, "watermark", None)
+        state = {
+            "watermark": watermark.isoformat() if watermark is not None else None,
+            "detectors": {detector.name: detector.snapshot() for detector in self._detectors},
+        }
+        self._state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self._state_path)
+
+    def _restore(self) -> None:
+        if self._state_path is None or not self._state_path.exists():
+            return
+        state = json.loads(self._state_path.read_text(encoding="utf-8"))
+        for detector in self._detectors:
+            snapshot = state["detectors"].get(detector.name)
+            if snapshot is not None:
+                detector.restore(snapshot)
+        if state.get("watermark") and hasattr(self._source, "watermark"):
+            self._source.watermark = datetime.fromisoformat(state["watermark"])
+        logger.info("resumed streaming detection from {}", state.get("watermark"))
+
+    def _publish(self, report: AnomalyReport) -> None:
+        self.alerts_sent += 1
+        try:
+            self._alert_sink.send(report)
+        except Exception as exc:  # noqa: BLE001 - a broken sink must not end the service
+            self.publish_failures += 1
+            logger.error("alert sink failed for window ending {}: {}", report.window_end, exc)
+        if self._writer is None:
+            return
+        for attempt in range(self._persist_retries + 1):
+            try:
+                self._writer.persist_report(report)
+                return
+            except Exception as exc:  # noqa: BLE001 - ClickHouse errors are retried, then logged
+                if attempt == self._persist_retries:
+                    self.publish_failures += 1
+                    logger.error("persisting report failed after {} attempts: {}", attempt + 1, exc)
+                    return
+                time.sleep(self._retry_backoff * 2**attempt)
+
+    def _entities(self, ordered: pd.DataFrame, flags: np.ndarray, alerting: np.ndarray) -> tuple[EntityAnomaly, ...]:
+        if not self._top_k or "entity_id" not in ordered.columns:
+            return ()
+        entity_ids = ordered["entity_id"].to_numpy()[alerting]
+        hits = flags[:, alerting]
+        names = [detector.name for detector in self._detectors]
+        ids, inverse, counts = np.unique(entity_ids, return_inverse=True, return_counts=True)
+        events = dict(zip(*np.unique(ordered["entity_id"].to_numpy(), return_counts=True)))
+        ranked = np.argsort(-counts, kind="stable")[: self._top_k]
+        return tuple(
+            EntityAnomaly(
+                entity_id=int(ids[code]),
+                flagged=int(counts[code]),
+                events=int(events[ids[code]]),
+                detectors=tuple(name for row, name in enumerate(names) if hits[row, inverse == code].any()),
+            )
+            for code in ranked
+        )
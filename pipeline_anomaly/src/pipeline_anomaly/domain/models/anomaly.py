@@ -11,6 +11,29 @@ class Anomaly:
     score: float
     severity: float
     description: str
+    duration_ms: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class EntityAnomaly:
+    """An entity ranked by how many of its events were flagged in the window."""
+
+    entity_id: int
+    flagged: int
+    events: int
+    detectors: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class DetectorRun:
+    """Outcome of one detector over a window, produced by a detector executor."""
+
+    detector: str
+    score: float
+    severity: float
+    duration_ms: float
+    timed_out: bool = False
+    entities: tuple[EntityAnomaly, ...] = ()
 
 
 @dataclass(frozen=True, slots=True)
@@ -19,6 +42,7 @@ class AnomalyReport:
     window_start: datetime
     window_end: datetime
     anomalies: Sequence[Anomaly]
+    top_entities: Sequence[EntityAnomaly] = ()
 
     def highest_severity(self) -> float:
         if not self.anomalies:
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
-from typing import Protocol
+from typing import AsyncIterator, Iterator, Protocol, Sequence
 
+import numpy as np
 import pandas as pd
 
 from pipeline_anomaly.domain.models.aggregate import AggregateCollection
-from pipeline_anomaly.domain.models.anomaly import AnomalyReport
+from pipeline_anomaly.domain.models.anomaly import AnomalyReport, DetectorRun
 from pipeline_anomaly.domain.models.batch import RecordBatch
 
 
 class DatasetGenerator(Protocol):
+    @property
+    def reuses_buffers(self) -> bool:
+        ...
+
     def batches(self) -> list[RecordBatch]:
         ...
 
+    def iter_batches(self) -> Iterator[RecordBatch]:
+        ...
+
 
 class ClickHouseWriter(Protocol):
     def ensure_schema(self) -> None:
@@ -41,6 +49,30 @@ class AnomalyDetector(Protocol):
         ...
 
 
+class DetectorExecutor(Protocol):
+    def run(self, detectors: Sequence[AnomalyDetector], dataframe: pd.DataFrame) -> list[DetectorRun]:
+        ...
+
+
 class AlertSink(Protocol):
     def send(self, report: AnomalyReport) -> None:
         ...
+
+
+class OnlineDetector(Protocol):
+    name: str
+    threshold: float
+
+    def score(self, values: np.ndarray) -> np.ndarray:
+        ...
+
+    def snapshot(self) -> dict[str, object]:
+        ...
+
+    def restore(self, snapshot: dict[str, object]) -> None:
+        ...
+
+
+class EventSource(Protocol):
+    def batches(self) -> AsyncIterator[pd.DataFrame]:
+        ...
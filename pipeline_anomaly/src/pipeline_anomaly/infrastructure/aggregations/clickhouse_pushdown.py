@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol, Sequence
+
+from pipeline_anomaly.domain.models.aggregate import Aggregate
+from pipeline_anomaly.infrastructure.config import AggregationMetricConfig
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+QUANTILE_FUNCTIONS = {
+    # quantileExactInclusive interpolates linearly, exactly like pandas' default
+    "exact": "quantilesExactInclusive",
+    "tdigest": "quantilesTDigest",
+}
+
+
+class WindowScalarReader(Protocol):
+    def query_window_scalars(self, expressions: Sequence[str], minutes: int | None = None) -> tuple[object, ...]:
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledAggregateQuery:
+    """SELECT list for all pushed-down metrics plus how to read each one back."""
+
+    expressions: tuple[str, ...]
+    quantile_levels: dict[str, tuple[float, ...]]
+
+    def position(self, expression: str) -> int:
+        return self.expressions.index(expression)
+
+
+class ClickHouseAggregateEngine:
+    """Computes window aggregates inside ClickHouse with a single query."""
+
+    SUPPORTED_TYPES = frozenset({"count", "mean", "std", "median", "min", "max", "quantile", "iqr"})
+
+    def __init__(self, reader: WindowScalarReader, quantile_method: str = "exact") -> None:
+        if quantile_method not in QUANTILE_FUNCTIONS:
+            raise ValueError(f"unknown quantile method {quantile_method}")
+        self._reader = reader
+        self._quantile_function = QUANTILE_FUNCTIONS[quantile_method]
+
+    def supports(self, cfg: AggregationMetricConfig) -> bool:
+        return cfg.type.lower() in self.SUPPORTED_TYPES
+
+    def compile(self, metrics: Sequence[AggregationMetricConfig]) -> CompiledAggregateQuery:
+        expressions: list[str] = ["count()", "min(event_time)", "max(event_time)"]
+        levels: dict[str, list[float]] = {}
+
+        def add(expression: str) -> None:
+            if expression not in expressions:
+                expressions.append(expression)
+
+        for cfg in metrics:
+            column = self._column(cfg)
+            metric_type = cfg.type.lower()
+            if metric_type == "mean":
+                add(f"avg({column})")
+            elif metric_type == "std":
+                add(f"ifNotFinite(stddevSamp({column}), 0)")
+            elif metric_type == "min":
+                add(f"min({column})")
+            elif metric_type == "max":
+                add(f"max({column})")
+            elif metric_type in {"median", "quantile", "iqr"}:
+                column_levels = levels.setdefault(column, [])
+                for q in self._levels(cfg):
+                    if q not in column_levels:
+                        column_levels.append(q)
+            elif metric_type != "count":
+                raise ValueError(f"metric type {cfg.type} cannot be pushed down")
+
+        quantile_levels = {column: tuple(sorted(values)) for column, values in levels.items()}
+        for column, values in quantile_levels.items():
+            add(self._quantiles_expression(column, values))
+        return CompiledAggregateQuery(expressions=tuple(expressions), quantile_levels=quantile_levels)
+
+    def compute(self, metrics: Sequence[AggregationMetricConfig], window_minutes: int) -> list[Aggregate]:
+        compiled = self.compile(metrics)
+        row = self._reader.query_window_scalars(compiled.expressions, minutes=window_minutes)
+        rows, window_start, window_end = int(row[0]), row[1], row[2]
+        if rows == 0:
+            raise RuntimeError("events table is empty")
+        return [self._materialize(cfg, compiled, row, rows, window_start, window_end) for cfg in metrics]
+
+    def _materialize(
+        self,
+        cfg: AggregationMetricConfig,
+        compiled: CompiledAggregateQuery,
+        row: tuple[object, ...],
+        rows: int,
+        window_start: datetime,
+        window_end: datetime,
+    ) -> Aggregate:
+        column = self._column(cfg)
+        metric_type = cfg.type.lower()
+        extra = None
+        if metric_type == "count":
+            value = float(rows)
+        elif metric_type == "mean":
+            value = float(row[compiled.position(f"avg({column})")])
+        elif metric_type == "std":
+            value = float(row[compiled.position(f"ifNotFinite(stddevSamp({column}), 0)")])
+        elif metric_type == "min":
+            value = float(row[compiled.position(f"min({column})")])
+        elif metric_type == "max":
+            value = float(row[compiled.position(f"max({column})")])
+        else:
+            levels = compiled.quantile_levels[column]
+            quantiles = row[compiled.position(self._quantiles_expression(column, levels))]
+            by_level = {level: float(quantiles[idx]) for idx, level in enumerate(levels)}
+            if metric_type == "median":
+                value = by_level[0.5]
+            elif metric_type == "quantile":
+                q = cfg.q or 0.5
+                value = by_level[q]
+                extra = {"quantile": q}
+            else:
+                q75, q25 = by_level[0.75], by_level[0.25]
+                value = q75 - q25
+                extra = {"q75": q75, "q25": q25}
+        return Aggregate(metric=cfg.name, value=value, window_start=window_start, window_end=window_end, extra=extra)
+
+    def _quantiles_expression(self, column: str, levels: Sequence[float]) -> str:
+        params = ", ".join(repr(float(level)) for level in levels)
+        return f"{self._quantile_function}({params})({column})"
+
+    @staticmethod
+    def _levels(cfg: AggregationMetricConfig) -> tuple[float, ...]:
+        metric_type = cfg.type.lower()
+        if metric_type == "median":
+            return (0.5,)
+        if metric_type == "iqr":
+            return (0.25, 0.75)
+        q = cfg.q or 0.5
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"quantile {q} is outside [0, 1]")
+        return (q,)
+
+    @staticmethod
+    def _column(cfg: AggregationMetricConfig) -> str:
+        column = cfg.column or "value"
+        if not _IDENTIFIER.match(column):
+            raise ValueError(f"invalid column name {column!r}")
+        return column
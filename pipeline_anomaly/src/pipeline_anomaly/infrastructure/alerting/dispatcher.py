@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Protocol, Sequence
+
+from loguru import logger
+
+from pipeline_anomaly.domain.models.anomaly import AnomalyReport
+from pipeline_anomaly.infrastructure.alerting.file_sink import FileAlertSink
+from pipeline_anomaly.infrastructure.alerting.stdout_sink import StdOutAlertSink
+from pipeline_anomaly.infrastructure.alerting.webhook_sink import WebhookAlertSink
+
+_STOP = object()
+
+
+class BatchAlertSink(Protocol):
+    def send(self, report: AnomalyReport) -> None:
+        ...
+
+    def send_many(self, reports: Sequence[AnomalyReport]) -> None:
+        ...
+
+
+@dataclass(slots=True)
+class DispatchMetrics:
+    enqueued: int = 0
+    delivered: int = 0
+    batches: int = 0
+    coalesced: int = 0
+    suppressed: int = 0
+    dropped: int = 0
+    abandoned: int = 0
+    failed: int = 0
+    retries: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    last_delivery_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return asdict(self)
+
+
+class AlertDispatcher:
+    """Non-blocking ``AlertSink`` that delivers reports from a background worker.
+
+    ``send`` only enqueues into a bounded queue; when it is full the report is
+    dropped (or waits up to ``enqueue_timeout``) and counted, so a slow sink
+    never stalls detection. The worker collects reports for ``batch_window``
+    seconds, merges reports of the same window into one, drops anomalies
+    already delivered for the same detector and window within
+    ``dedup_window`` seconds and hands the batch to the sink in one call.
+    """
+
+    def __init__(
+        self,
+        sink: BatchAlertSink,
+        queue_size: int = 1000,
+        batch_window: float = 1.0,
+        max_batch: int = 100,
+        dedup_window: float = 300.0,
+        retries: int = 2,
+        retry_backoff: float = 0.5,
+        enqueue_timeout: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._sink = sink
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=queue_size)
+        self._batch_window = batch_window
+        self._max_batch = max_batch
+        self._dedup_window = dedup_window
+        self._retries = retries
+        self._retry_backoff = retry_backoff
+        self._enqueue_timeout = enqueue_timeout
+        self._clock = clock
+        self._sent: dict[tuple[str, datetime, datetime], float] = {}
+        self._lock = threading.Lock()
+        self._metrics = DispatchMetrics()
+        self._closed = False
+        self._stopping = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+        self._worker.start()
+
+    @property
+    def metrics(self) -> DispatchMetrics:
+        with self._lock:
+            snapshot = replace(self._metrics)
+        snapshot.queue_depth = self._queue.qsize()
+        return snapshot
+
+    def send(self, report: AnomalyReport) -> None:
+        if self._closed:
+            raise RuntimeError("alert dispatcher is closed")
+        try:
+            if self._enqueue_timeout > 0:
+                self._queue.put(report, timeout=self._enqueue_timeout)
+            else:
+                self._queue.put_nowait(report)
+        except queue.Full:
+            with self._lock:
+                self._metrics.dropped += 1
+            logger.warning("alert queue is full, dropping report for {}", report.window_end)
+            return
+        with self._lock:
+            self._metrics.enqueued += 1
+            self._metrics.max_queue_depth = max(self._metrics.max_queue_depth, self._queue.qsize())
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Delivers what is queued within ``timeout`` seconds and stops the worker.
+
+        Reports still queued when the time is up are counted as ``abandoned``.
+        """
+
+        if self._closed:
+            return
+        self._closed = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        # the worker stops after the batch it is delivering
+        self._stopping.set()
+        abandoned = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            abandoned += item is not _STOP
+        if abandoned:
+            with self._lock:
+                self._metrics.abandoned += abandoned
+            logger.warning("alert dispatcher closed with {} undelivered reports", abandoned)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = self._clock() + self._batch_window
+            stopping = False
+            while len(batch) < self._max_batch:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._deliver(batch)  # type: ignore[arg-type]
+            if stopping:
+                return
+
+    def _deliver(self, batch: list[AnomalyReport]) -> None:
+        reports = self._fresh(self._coalesce(batch))
+        if not reports:
+            return
+        started = time.perf_counter()
+        for attempt in range(self._retries + 1):
+            try:
+                self._sink.send_many(reports)
+                break
+            except Exception as exc:  # noqa: BLE001 - any sink failure is retried, then counted
+                if attempt == self._retries:
+                    with self._lock:
+                        self._metrics.failed += len(reports)
+                    logger.error("alert sink failed after {} attempts: {}", attempt + 1, exc)
+                    return
+                with self._lock:
+                    self._metrics.retries += 1
+                time.sleep(self._retry_backoff * 2**attempt)
+        now = self._clock()
+        with self._lock:
+            for report in reports:
+                for anomaly in report.anomalies:
+                    self._sent[(anomaly.detector, report.window_start, report.window_end)] = now
+            self._metrics.delivered += len(reports)
+            self._metrics.batches += 1
+            self._metrics.last_delivery_ms = (time.perf_counter() - started) * 1000.0
+
+    def _coalesce(self, batch: list[AnomalyReport]) -> list[AnomalyReport]:
+        """One report per window; later anomalies of a detector replace earlier ones."""
+
+        merged: dict[tuple[datetime, datetime], AnomalyReport] = {}
+        for report in batch:
+            key = (report.window_start, report.window_end)
+            previous = merged.get(key)
+            if previous is None:
+                merged[key] = report
+                continue
+            anomalies = {anomaly.detector: anomaly for anomaly in previous.anomalies}
+            anomalies.update({anomaly.detector: anomaly for anomaly in report.anomalies})
+            merged[key] = replace(
+                report,
+                anomalies=tuple(anomalies.values()),
+                top_entities=report.top_entities or previous.top_entities,
+            )
+        with self._lock:
+            self._metrics.coalesced += len(batch) - len(merged)
+        return list(merged.values())
+
+    def _fresh(self, reports: list[AnomalyReport]) -> list[AnomalyReport]:
+        now = self._clock()
+        with self._lock:
+            self._sent = {key: sent for key, sent in self._sent.items() if now - sent < self._dedup_window}
+            fresh: list[AnomalyReport] = []
+            for report in reports:
+                anomalies = tuple(
+                    anomaly
+                    for anomaly in report.anomalies
+                    if (anomaly.detector, report.window_start, report.window_end) not in self._sent
+                )
+                if not anomalies:
+                    self._metrics.suppressed += 1
+                    continue
+                fresh.append(replace(report, anomalies=anomalies))
+            return fresh
+
+
+def build_alert_sink(
+    kind: str,
+    path: Path | None = None,
+    url: str | None = None,
+    timeout: float = 5.0,
+) -> BatchAlertSink:
+    if kind == "stdout":
+        return StdOutAlertSink()
+    if kind == "file":
+        if path is None:
+            raise ValueError("file alert sink needs alerting.path")
+        return FileAlertSink(path)
+    if kind == "webhook":
+        if not url:
+            raise ValueError("webhook alert sink needs alerting.url")
+        return WebhookAlertSink(url, timeout=timeout)
+    raise ValueError(f"unknown alert sink {kind}")
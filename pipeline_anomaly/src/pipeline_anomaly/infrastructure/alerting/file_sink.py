@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Sequence
+
+from pipeline_anomaly.domain.models.anomaly import AnomalyReport
+from pipeline_anomaly.infrastructure.alerting.payload import report_payload
+
+
+class FileAlertSink:
+    """Appends every report as one JSON line."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    def send(self, report: AnomalyReport) -> None:
+        self.send_many([report])
+
+    def send_many(self, reports: Sequence[AnomalyReport]) -> None:
+        lines = "".join(json.dumps(report_payload(report), ensure_ascii=False) + "\n" for report in reports)
+        with self._lock:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.open("a", encoding="utf-8") as file:
+                file.write(lines)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from pipeline_anomaly.domain.models.anomaly import AnomalyReport
+
+
+def report_payload(report: AnomalyReport) -> dict[str, object]:
+    return {
+        "generated_at": report.generated_at.isoformat(),
+        "window_start": report.window_start.isoformat(),
+        "window_end": report.window_end.isoformat(),
+        "anomalies": [
+            {
+                "detector": anomaly.detector,
+                "score": anomaly.score,
+                "severity": anomaly.severity,
+                "description": anomaly.description,
+            }
+            for anomaly in report.anomalies
+        ],
+        "top_entities": [
+            {
+                "entity_id": entity.entity_id,
+                "flagged": entity.flagged,
+                "events": entity.events,
+                "detectors": list(entity.detectors),
+            }
+            for entity in report.top_entities
+        ],
+    }
@@ -1,26 +1,18 @@
 from __future__ import annotations
 
 import json
+from typing import Sequence
 
 from loguru import logger
 
 from pipeline_anomaly.domain.models.anomaly import AnomalyReport
+from pipeline_anomaly.infrastructure.alerting.payload import report_payload
 
 
 class StdOutAlertSink:
     def send(self, report: AnomalyReport) -> None:
-        payload = {
-            "generated_at": report.generated_at.isoformat(),
-            "window_start": report.window_start.isoformat(),
-            "window_end": report.window_end.isoformat(),
-            "anomalies": [
-                {
-                    "detector": anomaly.detector,
-                    "score": anomaly.score,
-                    "severity": anomaly.severity,
-                    "description": anomaly.description,
-                }
-                for anomaly in report.anomalies
-            ],
-        }
-        logger.error("ANOMALY ALERT: {}", json.dumps(payload, ensure_ascii=False))
+        logger.error("ANOMALY ALERT: {}", json.dumps(report_payload(report), ensure_ascii=False))
+
+    def send_many(self, reports: Sequence[AnomalyReport]) -> None:
+        for report in reports:
+            self.send(report)
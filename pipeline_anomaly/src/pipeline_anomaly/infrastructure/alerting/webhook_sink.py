@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Sequence
+
+from loguru import logger
+
+from pipeline_anomaly.domain.models.anomaly import AnomalyReport
+from pipeline_anomaly.infrastructure.alerting.payload import report_payload
+
+
+class WebhookAlertSink:
+    """POSTs ``{"alerts": [...]}`` to ``url``; a batch of reports is one request."""
+
+    def __init__(self, url: str, timeout: float = 5.0, headers: dict[str, str] | None = None) -> None:
+        self._url = url
+        self._timeout = timeout
+        self._headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def send(self, report: AnomalyReport) -> None:
+        self.send_many([report])
+
+    def send_many(self, reports: Sequence[AnomalyReport]) -> None:
+        body = json.dumps({"alerts": [report_payload(report) for report in reports]}, ensure_ascii=False).encode()
+        request = urllib.request.Request(self._url, data=body, headers=self._headers, method="POST")
+        # urlopen raises HTTPError for non-2xx answers, the dispatcher counts and retries them
+        with urllib.request.urlopen(request, timeout=self._timeout) as response:
+            response.read()
+
+
+class WebhookStub:
+    """Local webhook receiver for development and tests; keeps what it was sent."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.received: list[dict[str, object]] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                stub.received.append(payload)
+                logger.info("webhook stub received {} alert(s)", len(payload.get("alerts", [])))
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/alerts"
+
+    def start(self) -> "WebhookStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="webhook-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -1,29 +1,73 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
+from typing import Iterator
 
 from clickhouse_connect import get_client
 from clickhouse_connect.driver import Client
 
+from pipeline_anomaly.infrastructure.clients.columnar import ColumnarWriter
+from pipeline_anomaly.infrastructure.clients.pool import ClientPool, PoolMetrics
+
 
 class ClickHouseFactory:
-    def __init__(self, host: str, port: int, username: str, password: str, database: str) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        database: str,
+        pool_size: int = 4,
+        pool_idle_timeout: float = 300.0,
+        pool_health_check_interval: float = 30.0,
+        compression: bool | str = True,
+        insert_batch_rows: int = 100_000,
+        async_insert: bool = False,
+        wait_for_async_insert: bool = True,
+    ) -> None:
         self._host = host
         self._port = port
         self._username = username
         self._password = password
         self._database = database
+        self._compression = compression
+        self._insert_batch_rows = insert_batch_rows
+        self._async_insert = async_insert
+        self._wait_for_async_insert = wait_for_async_insert
+        self._pool: ClientPool[Client] = ClientPool(
+            create=self._create_client,
+            max_size=pool_size,
+            idle_timeout=pool_idle_timeout,
+            health_check_interval=pool_health_check_interval,
+        )
+
+    @property
+    def pool_metrics(self) -> PoolMetrics:
+        return self._pool.metrics
 
     @contextmanager
-    def connect(self) -> Client:
-        client = get_client(
+    def connect(self) -> Iterator[Client]:
+        with self._pool.lease() as client:
+            yield client
+
+    def writer(self) -> ColumnarWriter:
+        return ColumnarWriter(
+            self,
+            batch_rows=self._insert_batch_rows,
+            async_insert=self._async_insert,
+            wait_for_async_insert=self._wait_for_async_insert,
+        )
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def _create_client(self) -> Client:
+        return get_client(
             host=self._host,
             port=self._port,
             username=self._username,
             password=self._password,
             database=self._database,
+            compress=self._compression,
         )
-        try:
-            yield client
-        finally:
-            client.close()
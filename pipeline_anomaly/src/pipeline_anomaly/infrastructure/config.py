@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import yaml
@@ -15,18 +15,49 @@ class ClickHouseConfig:
     username: str
     password: str
     database: str
+    pool_size: int = 4
+    pool_idle_timeout: float = 300.0
+    pool_health_check_interval: float = 30.0
+    compression: bool | str = True
+    insert_batch_rows: int = 100_000
+    async_insert: bool = False
+    wait_for_async_insert: bool = True
+
+
+@dataclass(slots=True)
+class IngestConfig:
+    streaming: bool = False
+    max_in_flight: int = 2
+    queue_size: int = 2
+
+
+@dataclass(slots=True)
+class WindowCacheConfig:
+    enabled: bool = False
+    incremental: bool = False
 
 
 @dataclass(slots=True)
 class IsolationForestConfig:
     contamination: float
     random_state: int
+    n_estimators: int = 100
+    model_dir: str | None = None
+    refit_interval_minutes: float | None = None
+    drift_threshold: float | None = None
+    n_jobs: int | None = None
+    chunk_size: int = 100_000
 
 
 @dataclass(slots=True)
 class DBSCANConfig:
     eps: float
     min_samples: int
+    mode: str = "exact"
+    algorithm: str = "auto"
+    n_jobs: int | None = None
+    memory_limit_mb: float | None = None
+    max_samples: int = 50_000
 
 
 @dataclass(slots=True)
@@ -34,6 +65,9 @@ class RollingMADConfig:
     window: int
     threshold: float
     min_periods: int | None = None
+    streaming: bool = False
+    state_path: str | None = None
+    n_jobs: int | None = None
 
 
 @dataclass(slots=True)
@@ -51,13 +85,30 @@ class AnomalyDetectionConfig:
     dbscan: DBSCANConfig
     rolling_mad: RollingMADConfig
     ensemble: EnsembleConfig | None = None
+    mad_threshold: float = 3.5
+    executor: str = "sequential"
+    max_workers: int | None = None
+    timeout_seconds: float | None = None
+    detector_timeouts: dict[str, float] = field(default_factory=dict)
+    per_entity: bool = False
+    min_entity_events: int = 5
+    top_k_entities: int = 0
 
 
 @dataclass(slots=True)
 class AlertingConfig:
     enabled: bool
     threshold_score: float
+    # stdout | file | webhook
     sink: str
+    path: str | None = None
+    url: str | None = None
+    timeout_seconds: float = 5.0
+    queue_size: int = 1000
+    batch_window_seconds: float = 1.0
+    max_batch: int = 100
+    dedup_window_seconds: float = 300.0
+    retries: int = 2
 
 
 @dataclass(slots=True)
@@ -73,6 +124,27 @@ class AggregationMetricConfig:
 class AggregationConfig:
     window_minutes: int
     metrics: tuple[AggregationMetricConfig, ...]
+    engine: str = "pandas"
+    quantile_method: str = "exact"
+    local_engine: str = "per_metric"
+
+
+@dataclass(slots=True)
+class StreamingConfig:
+    # clickhouse (tail events by watermark) | socket (JSON lines over TCP)
+    source: str = "clickhouse"
+    poll_interval_seconds: float = 1.0
+    lag_seconds: int = 2
+    lookback_minutes: int = 5
+    host: str = "127.0.0.1"
+    port: int = 9009
+    max_batch: int = 10_000
+    flush_interval_seconds: float = 0.5
+    zscore_window: int = 10_000
+    mad_window: int = 10_000
+    min_agreement: float = 0.5
+    state_path: str | None = None
+    checkpoint_interval_seconds: float = 30.0
 
 
 @dataclass(slots=True)
@@ -82,6 +154,9 @@ class PipelineConfig:
     aggregation: AggregationConfig
     anomaly_detection: AnomalyDetectionConfig
     alerting: AlertingConfig
+    ingest: IngestConfig = field(default_factory=IngestConfig)
+    window_cache: WindowCacheConfig = field(default_factory=WindowCacheConfig)
+    streaming: StreamingConfig = field(default_factory=StreamingConfig)
 
     @classmethod
     def load(cls, path: Path) -> "PipelineConfig":
@@ -98,6 +173,9 @@ class PipelineConfig:
             aggregation=AggregationConfig(
                 window_minutes=int(aggregation_raw.get("window_minutes", 60)),
                 metrics=metrics_cfg,
+                engine=aggregation_raw.get("engine", "pandas"),
+                quantile_method=aggregation_raw.get("quantile_method", "exact"),
+                local_engine=aggregation_raw.get("local_engine", "per_metric"),
             ),
             anomaly_detection=AnomalyDetectionConfig(
                 window_minutes=int(raw["anomaly_detection"].get("window_minutes", 60)),
@@ -110,6 +188,17 @@ class PipelineConfig:
                     if raw["anomaly_detection"].get("ensemble")
                     else None
                 ),
+                mad_threshold=float(raw["anomaly_detection"].get("mad_threshold", 3.5)),
+                executor=raw["anomaly_detection"].get("executor", "sequential"),
+                max_workers=raw["anomaly_detection"].get("max_workers"),
+                timeout_seconds=raw["anomaly_detection"].get("timeout_seconds"),
+                detector_timeouts=dict(raw["anomaly_detection"].get("detector_timeouts") or {}),
+                per_entity=bool(raw["anomaly_detection"].get("per_entity", False)),
+                min_entity_events=int(raw["anomaly_detection"].get("min_entity_events", 5)),
+                top_k_entities=int(raw["anomaly_detection"].get("top_k_entities", 0)),
             ),
             alerting=AlertingConfig(**raw["alerting"]),
+            ingest=IngestConfig(**raw.get("ingest", {})),
+            window_cache=WindowCacheConfig(**raw.get("window_cache", {})),
+            streaming=StreamingConfig(**raw.get("streaming", {})),
         )
@@ -9,6 +9,12 @@ class PandasDetector:
     def __init__(self, name: str) -> None:
         self.name = name
 
+    @property
+    def persists_state(self) -> bool:
+        """Whether a run writes state that outlives it (files, a model store)."""
+
+        return False
+
     def severity(self, scores: pd.Series) -> float:
         if scores.empty:
             return 0.0
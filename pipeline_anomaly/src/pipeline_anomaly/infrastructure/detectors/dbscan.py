@@ -1,17 +1,172 @@
 from __future__ import annotations
 
+import math
+
+import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
+from loguru import logger
 from sklearn.cluster import DBSCAN
+from sklearn.neighbors import KDTree
 
 from pipeline_anomaly.infrastructure.detectors.base import PandasDetector
 
+# rough per-row footprint of the grid path: features, cell keys, masks and a KD-tree
+_GRID_BYTES_PER_ROW = 96
+# sklearn keeps one int64 index per neighbour pair for the whole window
+_EXACT_BYTES_PER_PAIR = 8
+# cells are eps/sqrt(2) wide, so everything within eps lies in a 5x5 block of cells
+_STENCIL = tuple((dx, dy) for dx in range(-2, 3) for dy in range(-2, 3))
+
 
 class DBSCANDetector(PandasDetector):
-    def __init__(self, eps: float, min_samples: int) -> None:
+    """Flags DBSCAN noise points over ``value``/``attribute``.
+
+    Modes:
+    - ``exact``: sklearn ``DBSCAN`` on the full window (``algorithm``/``n_jobs`` are forwarded).
+    - ``grid``: same noise set as ``exact`` in O(n) memory. Points are bucketed into
+      eps/sqrt(2) cells, every point of a cell holding ``min_samples`` points is a
+      core point, and KD-tree radius counts are only run for points of sparse cells.
+    - ``subsample``: fits DBSCAN on at most ``max_samples`` rows and marks every row
+      farther than ``eps`` from a sampled core point as noise (approximate).
+    - ``auto``: ``exact`` while the estimated neighbourhood memory fits into
+      ``memory_limit_mb``, then ``grid``, then ``subsample``.
+    """
+
+    MODES = ("exact", "grid", "subsample", "auto")
+
+    def __init__(
+        self,
+        eps: float,
+        min_samples: int,
+        mode: str = "exact",
+        algorithm: str = "auto",
+        n_jobs: int | None = None,
+        memory_limit_mb: float | None = None,
+        max_samples: int = 50_000,
+        chunk_size: int = 100_000,
+        random_state: int = 42,
+    ) -> None:
         super().__init__(name="dbscan")
-        self._model = DBSCAN(eps=eps, min_samples=min_samples)
+        if mode not in self.MODES:
+            raise ValueError(f"unknown dbscan mode {mode}")
+        self._eps = eps
+        self._min_samples = min_samples
+        self._mode = mode
+        self._algorithm = algorithm
+        self._n_jobs = n_jobs
+        self._memory_limit = None if memory_limit_mb is None else memory_limit_mb * 1024 * 1024
+        self._max_samples = max_samples
+        self._chunk_size = chunk_size
+        self._random_state = random_state
+        self._model = DBSCAN(eps=eps, min_samples=min_samples, algorithm=algorithm, n_jobs=n_jobs)
 
     def fit_predict(self, dataframe: pd.DataFrame) -> pd.Series:
         features = dataframe[["value", "attribute"]]
-        predictions = self._model.fit_predict(features)
-        return pd.Series((predictions == -1).astype(int))
+        mode = self._resolve_mode(features)
+        if mode == "exact":
+            predictions = self._model.fit_predict(features)
+            return pd.Series((predictions == -1).astype(int))
+        points = features.to_numpy(dtype=np.float64)
+        noise = self._grid_noise(points) if mode == "grid" else self._subsample_noise(points)
+        return pd.Series(noise.astype(int))
+
+    def _resolve_mode(self, features: pd.DataFrame) -> str:
+        if self._mode != "auto":
+            return self._mode
+        if features.empty:
+            return "exact"
+        if self._memory_limit is None:
+            return "grid"
+        points = features.to_numpy(dtype=np.float64)
+        _, keys, counts, width = self._cells(points)
+        pairs = float(np.dot(counts, self._stencil_sum(keys, counts, keys, width)))
+        if pairs * _EXACT_BYTES_PER_PAIR <= self._memory_limit:
+            return "exact"
+        if len(points) * _GRID_BYTES_PER_ROW <= self._memory_limit:
+            return "grid"
+        logger.warning("dbscan window of {} rows exceeds the memory limit, subsampling", len(points))
+        return "subsample"
+
+    def _grid_noise(self, points: np.ndarray) -> np.ndarray:
+        n = len(points)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        inverse, keys, counts, width = self._cells(points)
+
+        core = counts[inverse] >= self._min_samples
+        sparse_cells = np.unique(inverse[~core])
+        if len(sparse_cells):
+            # an upper bound from the surrounding cells rules most sparse points out without a query
+            bound = self._stencil_sum(keys[sparse_cells], counts, keys, width)
+            maybe_cells = np.zeros(len(keys), dtype=bool)
+            maybe_cells[sparse_cells[bound >= self._min_samples]] = True
+            maybe = np.flatnonzero(maybe_cells[inverse])
+            if len(maybe):
+                nearby = self._near_cells(keys, keys[np.unique(inverse[maybe])], width)[inverse]
+                tree = KDTree(points[nearby])
+                neighbours = self._chunked(
+                    lambda chunk: tree.query_radius(chunk, r=self._eps, count_only=True), points[maybe]
+                )
+                core[maybe] = neighbours >= self._min_samples
+
+        noise = ~core
+        candidates = np.flatnonzero(noise)
+        if len(candidates):
+            near_core = core & self._near_cells(keys, keys[np.unique(inverse[candidates])], width)[inverse]
+            if near_core.any():
+                core_tree = KDTree(points[near_core])
+                distances = self._chunked(lambda chunk: core_tree.query(chunk, k=1)[0][:, 0], points[candidates])
+                noise[candidates] = distances > self._eps
+        return noise
+
+    def _subsample_noise(self, points: np.ndarray) -> np.ndarray:
+        n = len(points)
+        if n <= self._max_samples:
+            return self._model.fit_predict(points) == -1
+        rng = np.random.default_rng(self._random_state)
+        sample = points[rng.choice(n, size=self._max_samples, replace=False)]
+        # keep the density threshold comparable to the full window
+        min_samples = max(2, round(self._min_samples * self._max_samples / n))
+        model = DBSCAN(eps=self._eps, min_samples=min_samples, algorithm=self._algorithm, n_jobs=self._n_jobs)
+        model.fit(sample)
+        if len(model.core_sample_indices_) == 0:
+            return np.ones(n, dtype=bool)
+        core_tree = KDTree(sample[model.core_sample_indices_])
+        distances = self._chunked(lambda chunk: core_tree.query(chunk, k=1)[0][:, 0], points)
+        return distances > self._eps
+
+    def _cells(self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """Bucket points into eps/sqrt(2) cells.
+
+        Returns the per-point cell index, sorted cell keys, points per cell and
+        the row width used to encode ``(x, y)`` cells as one int64 key.
+        """
+
+        side = self._eps / math.sqrt(2) * (1 - 1e-9)
+        cells = np.floor((points - points.min(axis=0)) / side).astype(np.int64) + 2
+        width = int(cells[:, 1].max()) + 5
+        keys, inverse, counts = np.unique(cells[:, 0] * width + cells[:, 1], return_inverse=True, return_counts=True)
+        return inverse, keys, counts, width
+
+    @staticmethod
+    def _stencil_sum(targets: np.ndarray, counts: np.ndarray, keys: np.ndarray, width: int) -> np.ndarray:
+        total = np.zeros(len(targets), dtype=np.int64)
+        for dx, dy in _STENCIL:
+            neighbour = targets + dx * width + dy
+            position = np.minimum(np.searchsorted(keys, neighbour), len(keys) - 1)
+            total += np.where(keys[position] == neighbour, counts[position], 0)
+        return total
+
+    @staticmethod
+    def _near_cells(keys: np.ndarray, targets: np.ndarray, width: int) -> np.ndarray:
+        offsets = np.array([dx * width + dy for dx, dy in _STENCIL], dtype=np.int64)
+        return np.isin(keys, np.unique((targets[:, None] + offsets[None, :]).ravel()))
+
+    def _chunked(self, query, rows: np.ndarray) -> np.ndarray:
+        chunks = [rows[start : start + self._chunk_size] for start in range(0, len(rows), self._chunk_size)]
+        if len(chunks) == 1 or not self._n_jobs or self._n_jobs == 1:
+            return np.concatenate([query(chunk) for chunk in chunks])
+        # KD-tree queries release the GIL, threads share the tree without copies
+        results = Parallel(n_jobs=self._n_jobs, prefer="threads")(delayed(query)(chunk) for chunk in chunks)
+        return np.concatenate(results)
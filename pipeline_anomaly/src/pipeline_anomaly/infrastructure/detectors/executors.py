@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from pipeline_anomaly.domain.models.anomaly import DetectorRun, EntityAnomaly
+from pipeline_anomaly.domain.services.interfaces import AnomalyDetector
+from pipeline_anomaly.infrastructure.detectors.shared_frame import SharedFrame, SharedFrameHandle, attach, detach
+from pipeline_anomaly.infrastructure.detectors.statistics import entity_codes
+
+
+def run_detector(detector: AnomalyDetector, dataframe: pd.DataFrame, top_k: int = 0) -> DetectorRun:
+    started = time.perf_counter()
+    scores = detector.fit_predict(dataframe)
+    severity = detector.severity(scores)
+    return DetectorRun(
+        detector=detector.name,
+        score=float(scores.mean()) if len(scores) else 0.0,
+        severity=float(severity),
+        duration_ms=(time.perf_counter() - started) * 1000.0,
+        entities=top_entities(detector.name, dataframe, scores, top_k) if top_k else (),
+    )
+
+
+def top_entities(detector: str, dataframe: pd.DataFrame, scores: pd.Series, k: int) -> tuple[EntityAnomaly, ...]:
+    """The ``k`` entities with the most flagged events, ties broken by the flagged share."""
+
+    if "entity_id" not in dataframe.columns or not len(scores):
+        return ()
+    # streaming detectors score a subset of the rows
+    entity_ids = dataframe["entity_id"].to_numpy()
+    if len(scores) != len(dataframe):
+        entity_ids = dataframe.loc[scores.index, "entity_id"].to_numpy()
+    codes, ids = entity_codes(entity_ids)
+    flagged = np.bincount(codes, weights=scores.to_numpy() > 0, minlength=len(ids))
+    candidates = np.flatnonzero(flagged)
+    if not len(candidates):
+        return ()
+    events = np.bincount(codes, minlength=len(ids))
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-flagged[candidates], k - 1)[:k]]
+    ranked = sorted(candidates, key=lambda code: (-flagged[code], -flagged[code] / events[code], ids[code]))
+    return tuple(
+        EntityAnomaly(entity_id=int(ids[code]), flagged=int(flagged[code]), events=int(events[code]), detectors=(detector,))
+        for code in ranked[:k]
+    )
+
+
+def _run_shared_detector(detector: AnomalyDetector, handle: SharedFrameHandle, top_k: int) -> DetectorRun:
+    dataframe, segments = attach(handle)
+    try:
+        return run_detector(detector, dataframe, top_k)
+    finally:
+        del dataframe
+        detach(segments)
+
+
+class SequentialDetectorExecutor:
+    def __init__(self, top_k: int = 0) -> None:
+        self._top_k = top_k
+
+    def run(self, detectors: Sequence[AnomalyDetector], dataframe: pd.DataFrame) -> list[DetectorRun]:
+        return [run_detector(detector, dataframe, self._top_k) for detector in detectors]
+
+
+class _PooledDetectorExecutor:
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        timeout: float | None = None,
+        timeouts: Mapping[str, float] | None = None,
+        top_k: int = 0,
+    ) -> None:
+        self._max_workers = max_workers
+        self._top_k = top_k
+        self._timeout = timeout
+        self._timeouts = dict(timeouts or {})
+
+    def _collect(
+        self,
+        detectors: Sequence[AnomalyDetector],
+        futures: Sequence[Future[DetectorRun]],
+        started: float,
+    ) -> tuple[list[DetectorRun], bool]:
+        """Wait for every detector within its budget, keeping the configured order."""
+
+        runs: list[DetectorRun] = []
+        timed_out = False
+        for detector, future in zip(detectors, futures):
+            budget = self._budget(detector)
+            remaining = None if budget is None else max(0.0, started + budget - time.monotonic())
+            try:
+                runs.append(future.result(timeout=remaining))
+            except FuturesTimeoutError:
+                future.cancel()
+                timed_out = True
+                logger.warning("detector {} exceeded its {}s budget", detector.name, budget)
+                runs.append(
+                    DetectorRun(
+                        detector=detector.name,
+                        score=0.0,
+                        severity=0.0,
+                        duration_ms=(time.monotonic() - started) * 1000.0,
+                        timed_out=True,
+                    )
+                )
+        return runs, timed_out
+
+    def _budget(self, detector: AnomalyDetector) -> float | None:
+        return self._timeouts.get(detector.name, self._timeout)
+
+    def _workers(self, detectors: Sequence[AnomalyDetector]) -> int:
+        return max(1, min(self._max_workers or len(detectors), len(detectors)))
+
+
+class ThreadDetectorExecutor(_PooledDetectorExecutor):
+    """Runs detectors concurrently in threads; numpy and sklearn release the GIL.
+
+    A timed-out thread cannot be stopped, so detectors that persist state
+    (``persists_state``) and have a time budget run in worker processes
+    instead, where a timeout kills the run before it writes anything.
+    """
+
+    def run(self, detectors: Sequence[AnomalyDetector], dataframe: pd.DataFrame) -> list[DetectorRun]:
+        if not detectors:
+            return []
+        isolated = [
+            getattr(detector, "persists_state", False) and self._budget(detector) is not None for detector in detectors
+        ]
+        threaded = [detector for detector, flag in zip(detectors, isolated) if not flag]
+        stateful = [detector for detector, flag in zip(detectors, isolated) if flag]
+        executor = ThreadPoolExecutor(max_workers=self._workers(threaded or detectors), thread_name_prefix="detector")
+        try:
+            started = time.monotonic()
+            futures = [executor.submit(run_detector, detector, dataframe, self._top_k) for detector in threaded]
+            processes = ProcessDetectorExecutor(self._max_workers, self._timeout, self._timeouts, self._top_k)
+            in_processes = iter(processes.run(stateful, dataframe))
+            in_threads = iter(self._collect(threaded, futures, started)[0])
+            return [next(in_processes) if flag else next(in_threads) for flag in isolated]
+        finally:
+            # a timed-out thread cannot be interrupted, it is left to finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ProcessDetectorExecutor(_PooledDetectorExecutor):
+    """Runs detectors in worker processes that map the window from shared memory."""
+
+    def run(self, detectors: Sequence[AnomalyDetector], dataframe: pd.DataFrame) -> list[DetectorRun]:
+        if not detectors:
+            return []
+        with SharedFrame.publish(dataframe) as shared:
+            executor = ProcessPoolExecutor(max_workers=self._workers(detectors))
+            timed_out = False
+            try:
+                started = time.monotonic()
+                futures = [
+                    executor.submit(_run_shared_detector, detector, shared.handle, self._top_k) for detector in detectors
+                ]
+                runs, timed_out = self._collect(detectors, futures, started)
+                return runs
+            finally:
+                if timed_out:
+                    terminate_workers(executor)
+                executor.shutdown(wait=not timed_out, cancel_futures=True)
+
+
+def terminate_workers(executor: ProcessPoolExecutor) -> None:
+    """Stop the worker processes of ``executor``, including the tasks they are running.
+
+    Python 3.14 has ``terminate_workers``; before it the only handle is the
+    private ``_processes`` dict. Without either, queued tasks are cancelled
+    and running ones are left to finish.
+    """
+
+    if sys.version_info >= (3, 14):
+        executor.terminate_workers()
+        return
+    processes = getattr(executor, "_processes", None)
+    if not isinstance(processes, dict):
+        logger.warning("cannot terminate detector processes on this Python, running detectors will finish")
+        executor.shutdown(wait=False, cancel_futures=True)
+        return
+    for process in list(processes.values()):
+        process.terminate()
+
+
+def build_executor(
+    kind: str,
+    max_workers: int | None = None,
+    timeout: float | None = None,
+    timeouts: Mapping[str, float] | None = None,
+    top_k: int = 0,
+) -> SequentialDetectorExecutor | ThreadDetectorExecutor | ProcessDetectorExecutor:
+    if kind == "sequential":
+        return SequentialDetectorExecutor(top_k=top_k)
+    if kind == "thread":
+        return ThreadDetectorExecutor(max_workers=max_workers, timeout=timeout, timeouts=timeouts, top_k=top_k)
+    if kind == "process":
+        return ProcessDetectorExecutor(max_workers=max_workers, timeout=timeout, timeouts=timeouts, top_k=top_k)
+    raise ValueError(f"unknown detector executor {kind}")
@@ -1,17 +1,163 @@
 from __future__ import annotations
 
+import time
+from typing import Callable
+
+import numpy as np
 import pandas as pd
+import sklearn
+from joblib import Parallel, delayed
+from loguru import logger
 from sklearn.ensemble import IsolationForest
 
 from pipeline_anomaly.infrastructure.detectors.base import PandasDetector
+from pipeline_anomaly.infrastructure.detectors.model_store import ForestMetadata, ForestModelStore
+
+FEATURES = ("value", "attribute")
+_DRIFT_BINS = 10
 
 
 class IsolationForestDetector(PandasDetector):
-    def __init__(self, contamination: float, random_state: int) -> None:
+    """IsolationForest over ``value``/``attribute``.
+
+    Without a ``store`` the forest is refitted on every window. With a store
+    it is fitted once on a reference window, persisted with its metadata and
+    reused for scoring until ``refit_interval_seconds`` elapses or the
+    population stability index of a feature against the reference window
+    exceeds ``drift_threshold``.
+    """
+
+    def __init__(
+        self,
+        contamination: float,
+        random_state: int,
+        n_estimators: int = 100,
+        store: ForestModelStore | None = None,
+        refit_interval_seconds: float | None = None,
+        drift_threshold: float | None = None,
+        n_jobs: int | None = None,
+        chunk_size: int = 100_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         super().__init__(name="isolation_forest")
-        self._model = IsolationForest(contamination=contamination, random_state=random_state)
+        self._contamination = contamination
+        self._random_state = random_state
+        self._n_estimators = n_estimators
+        self._store = store
+        self._refit_interval = refit_interval_seconds
+        self._drift_threshold = drift_threshold
+        self._n_jobs = n_jobs
+        self._chunk_size = chunk_size
+        self._clock = clock
+        self._model = self._new_model()
+        self._metadata: ForestMetadata | None = None
+        self.last_drift: float | None = None
+
+    @property
+    def metadata(self) -> ForestMetadata | None:
+        return self._metadata
+
+    @property
+    def persists_state(self) -> bool:
+        return self._store is not None
 
     def fit_predict(self, dataframe: pd.DataFrame) -> pd.Series:
-        features = dataframe[["value", "attribute"]]
-        predictions = self._model.fit_predict(features)
-        return pd.Series((predictions == -1).astype(int))
+        features = dataframe[list(FEATURES)]
+        if self._store is None:
+            predictions = self._model.fit_predict(features)
+            return pd.Series((predictions == -1).astype(int))
+        points = features.to_numpy(dtype=np.float64)
+        if self._needs_fit(points):
+            self.fit(points)
+        return pd.Series((self._decision_function(points) < 0).astype(int))
+
+    def fit(self, points: np.ndarray) -> ForestMetadata:
+        started = time.perf_counter()
+        model = self._new_model()
+        model.fit(points)
+        bins, shares = _reference_histograms(points)
+        metadata = ForestMetadata(
+            version=self._store.next_version() if self._store else 1,
+            fitted_at=self._clock(),
+            rows=len(points),
+            features=FEATURES,
+            n_estimators=self._n_estimators,
+            contamination=self._contamination,
+            random_state=self._random_state,
+            sklearn_version=sklearn.__version__,
+            reference_bins=bins,
+            reference_shares=shares,
+        )
+        if self._store is not None:
+            metadata = self._store.save(model, metadata)
+        self._model, self._metadata = model, metadata
+        logger.info(
+            "isolation forest v{} fitted on {} rows in {:.2f}s", metadata.version, len(points), time.perf_counter() - started
+        )
+        return metadata
+
+    def _needs_fit(self, points: np.ndarray) -> bool:
+        if self._metadata is None:
+            loaded = self._store.load() if self._store else None
+            compatible = loaded is not None and loaded[1].compatible_with(
+                FEATURES, self._n_estimators, self._contamination, self._random_state
+            )
+            if not compatible:
+                return True
+            self._model, self._metadata = loaded
+        if self._refit_interval is not None and self._clock() - self._metadata.fitted_at >= self._refit_interval:
+            logger.info("isolation forest v{} is due for a scheduled refit", self._metadata.version)
+            return True
+        if self._drift_threshold is not None and len(points):
+            self.last_drift = population_stability(self._metadata, points)
+            if self.last_drift > self._drift_threshold:
+                logger.info(
+                    "isolation forest v{} drift {:.3f} exceeds {}", self._metadata.version, self.last_drift, self._drift_threshold
+                )
+                return True
+        return False
+
+    def _decision_function(self, points: np.ndarray) -> np.ndarray:
+        chunks = [points[start : start + self._chunk_size] for start in range(0, len(points), self._chunk_size)]
+        if not chunks:
+            return np.zeros(0)
+        if len(chunks) == 1 or not self._n_jobs or self._n_jobs == 1:
+            return np.concatenate([self._model.decision_function(chunk) for chunk in chunks])
+        # tree traversal runs in Cython; threads share the fitted forest instead of pickling it per chunk
+        scores = Parallel(n_jobs=self._n_jobs, prefer="threads")(
+            delayed(self._model.decision_function)(chunk) for chunk in chunks
+        )
+        return np.concatenate(scores)
+
+    def _new_model(self) -> IsolationForest:
+        return IsolationForest(
+            n_estimators=self._n_estimators,
+            contamination=self._contamination,
+            random_state=self._random_state,
+            n_jobs=self._n_jobs,
+        )
+
+
+def _reference_histograms(points: np.ndarray) -> tuple[dict[str, list[float]], dict[str, list[float]]]:
+    bins: dict[str, list[float]] = {}
+    shares: dict[str, list[float]] = {}
+    for idx, name in enumerate(FEATURES):
+        column = points[:, idx]
+        edges = np.unique(np.quantile(column, np.linspace(0, 1, _DRIFT_BINS + 1)[1:-1])) if len(column) else np.array([])
+        counts = np.bincount(np.searchsorted(edges, column, side="right"), minlength=len(edges) + 1)
+        bins[name] = edges.tolist()
+        shares[name] = (counts / max(len(column), 1)).tolist()
+    return bins, shares
+
+
+def population_stability(metadata: ForestMetadata, points: np.ndarray) -> float:
+    """Largest PSI across features of ``points`` against the reference window deciles."""
+
+    worst = 0.0
+    for idx, name in enumerate(metadata.features):
+        edges = np.asarray(metadata.reference_bins[name])
+        expected = np.clip(np.asarray(metadata.reference_shares[name]), 1e-6, None)
+        counts = np.bincount(np.searchsorted(edges, points[:, idx], side="right"), minlength=len(edges) + 1)
+        actual = np.clip(counts / len(points), 1e-6, None)
+        worst = max(worst, float(np.sum((actual - expected) * np.log(actual / expected))))
+    return worst
@@ -1,24 +1,48 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from pipeline_anomaly.infrastructure.detectors.base import PandasDetector
+from pipeline_anomaly.infrastructure.detectors.statistics import ColumnStatisticsContext, outside_band
 
 
 class MedianAbsoluteDeviationDetector(PandasDetector):
     """Robust anomaly detector based on the modified Z-score."""
 
-    def __init__(self, threshold: float) -> None:
+    def __init__(
+        self,
+        threshold: float,
+        statistics: ColumnStatisticsContext | None = None,
+        per_entity: bool = False,
+        min_entity_events: int = 5,
+    ) -> None:
         super().__init__(name="mad")
         self._threshold = threshold
+        self._statistics = statistics or ColumnStatisticsContext()
+        self._per_entity = per_entity
+        self._min_entity_events = min_entity_events
 
     def fit_predict(self, dataframe: pd.DataFrame) -> pd.Series:
-        series = dataframe["value"]
-        median = series.median()
-        deviation = (series - median).abs()
-        mad = deviation.median()
+        values = self._statistics.values(dataframe)
+        if self._per_entity:
+            return pd.Series(self._entity_flags(dataframe, values), index=dataframe.index)
+        stats = self._statistics.get(dataframe)
+        mad = stats.mad
         if mad == 0:
             # fall back to standard deviation to avoid division by zero
-            mad = float(series.std() or 1.0)
-        modified_z = 0.6745 * deviation / mad
-        return (modified_z > self._threshold).astype(int)
+            mad = float(stats.std or 1.0)
+        # 0.6745 * |x - median| / mad > threshold
+        flags = outside_band(values, stats.median, self._threshold * mad / 0.6745)
+        return pd.Series(flags, index=dataframe.index)
+
+    def _entity_flags(self, dataframe: pd.DataFrame, values: np.ndarray) -> np.ndarray:
+        codes, _ = self._statistics.entities(dataframe)
+        moments = self._statistics.entity_moments(dataframe)
+        median, mad = self._statistics.entity_medians(dataframe)
+        # same fallbacks as the global path, per entity
+        scale = np.where(mad == 0, moments.std, mad)
+        scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+        width = np.where(moments.count >= self._min_entity_events, self._threshold * scale / 0.6745, np.nan)
+        flags = np.abs(values - median[codes]) > width[codes]
+        return flags.view(np.int8)
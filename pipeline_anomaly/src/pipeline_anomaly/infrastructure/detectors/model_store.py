@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import os
+import pickle
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+import joblib
+import sklearn
+from loguru import logger
+from sklearn.ensemble import IsolationForest
+
+
+@dataclass(frozen=True, slots=True)
+class ForestMetadata:
+    """What a persisted forest was trained on; drift is measured against ``reference_bins``."""
+
+    version: int
+    fitted_at: float
+    rows: int
+    features: tuple[str, ...]
+    n_estimators: int
+    contamination: float
+    random_state: int
+    sklearn_version: str
+    reference_bins: dict[str, list[float]]
+    reference_shares: dict[str, list[float]]
+    model_file: str = ""
+
+    def compatible_with(
+        self, features: tuple[str, ...], n_estimators: int, contamination: float, random_state: int
+    ) -> bool:
+        return (
+            self.features == features
+            and self.n_estimators == n_estimators
+            and self.contamination == contamination
+            and self.random_state == random_state
+            and self.sklearn_version == sklearn.__version__
+        )
+
+
+class ForestModelStore:
+    """Keeps versioned forests as ``<name>-v<version>.joblib`` next to a ``<name>.json`` manifest.
+
+    The manifest names the current model file and is replaced atomically, so
+    a reader never pairs a model from one fit with metadata from another.
+    The previous version is kept for rollback, older ones are pruned.
+    """
+
+    def __init__(self, directory: Path, name: str = "isolation_forest", keep: int = 2) -> None:
+        self._directory = Path(directory)
+        self._name = name
+        self._keep = max(1, keep)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self._directory / f"{self._name}.json"
+
+    def load(self) -> tuple[IsolationForest, ForestMetadata] | None:
+        metadata = self.metadata()
+        if metadata is None:
+            return None
+        try:
+            model = joblib.load(self._directory / metadata.model_file)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError) as exc:
+            logger.warning("ignoring unreadable forest {}: {}", metadata.model_file, exc)
+            return None
+        return model, metadata
+
+    def metadata(self) -> ForestMetadata | None:
+        if not self.manifest_path.exists():
+            return None
+        try:
+            raw = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            return ForestMetadata(**{**raw, "features": tuple(raw["features"])})
+        except (OSError, ValueError, TypeError, KeyError) as exc:
+            logger.warning("ignoring unreadable forest manifest {}: {}", self.manifest_path, exc)
+            return None
+
+    def save(self, model: IsolationForest, metadata: ForestMetadata) -> ForestMetadata:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        metadata = replace(metadata, model_file=f"{self._name}-v{metadata.version}.joblib")
+        joblib.dump(model, self._directory / metadata.model_file)
+        manifest_tmp = self.manifest_path.with_suffix(".json.tmp")
+        manifest_tmp.write_text(json.dumps(asdict(metadata), indent=2), encoding="utf-8")
+        os.replace(manifest_tmp, self.manifest_path)
+        self._prune(metadata.version)
+        return metadata
+
+    def next_version(self) -> int:
+        metadata = self.metadata()
+        return 1 if metadata is None else metadata.version + 1
+
+    def _prune(self, current: int) -> None:
+        for path in self._directory.glob(f"{self._name}-v*.joblib"):
+            version = path.stem.rsplit("-v", 1)[-1]
+            if version.isdigit() and int(version) <= current - self._keep:
+                path.unlink(missing_ok=True)
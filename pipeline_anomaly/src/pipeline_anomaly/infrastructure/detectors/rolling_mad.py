@@ -1,20 +1,68 @@
 from __future__ import annotations
 
+import json
+import os
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
+from pandas.api.indexers import BaseIndexer
 
 from pipeline_anomaly.infrastructure.detectors.base import PandasDetector
+from pipeline_anomaly.infrastructure.detectors.statistics import ColumnStatisticsContext
+from pipeline_anomaly.infrastructure.detectors.streaming_median import StreamingRollingMAD
 
 
 class RollingMADDetector(PandasDetector):
-    """Robust detector based on rolling median absolute deviation."""
+    """Robust detector based on rolling median absolute deviation.
+
+    In ``streaming`` mode the detector keeps a ``StreamingRollingMAD`` between
+    runs and only scores events newer than the last one it has seen; the
+    returned series covers those events. With ``state_path`` the engine state
+    survives restarts and process-pool workers.
+
+    With ``per_entity`` the rolling windows run over each entity's own events:
+    rows are sorted into entity blocks once and a single rolling pass uses
+    windows clipped at the block start.
+    """
 
-    def __init__(self, window: int, threshold: float, min_periods: int | None = None) -> None:
+    def __init__(
+        self,
+        window: int,
+        threshold: float,
+        min_periods: int | None = None,
+        streaming: bool = False,
+        state_path: Path | None = None,
+        per_entity: bool = False,
+        statistics: ColumnStatisticsContext | None = None,
+        n_jobs: int | None = None,
+        chunk_size: int = 1_000_000,
+    ) -> None:
         super().__init__(name="rolling_mad")
         self._window = window
         self._threshold = threshold
         self._min_periods = min_periods or max(1, window // 2)
+        self._streaming = streaming
+        self._state_path = Path(state_path) if state_path else None
+        self._engine: StreamingRollingMAD | None = None
+        self._watermark: int | None = None
+        if streaming and per_entity:
+            raise ValueError("streaming rolling MAD does not support per-entity windows")
+        self._per_entity = per_entity
+        self._statistics = statistics or ColumnStatisticsContext()
+        self._n_jobs = n_jobs
+        self._chunk_size = chunk_size
+
+    @property
+    def persists_state(self) -> bool:
+        return self._streaming and self._state_path is not None
 
     def fit_predict(self, dataframe: pd.DataFrame) -> pd.Series:
+        if self._streaming:
+            return self._score_new_events(dataframe)
+        if self._per_entity:
+            return self._score_entities(dataframe)
         ordered = dataframe.sort_values("event_time")
         series = ordered["value"].reset_index(drop=True)
         rolling_median = series.rolling(window=self._window, min_periods=self._min_periods).median()
@@ -27,3 +75,123 @@ class RollingMADDetector(PandasDetector):
         predictions.index = ordered.index
         return predictions.sort_index()
 
+    def _score_entities(self, dataframe: pd.DataFrame) -> pd.Series:
+        codes, _ = self._statistics.entities(dataframe)
+        times = dataframe["event_time"].to_numpy(dtype="datetime64[ns]")
+        if len(times) and (times[1:] >= times[:-1]).all():
+            # windows are read ORDER BY event_time, a stable sort by entity keeps time order inside blocks
+            order = _stable_order(codes)
+        else:
+            order = np.lexsort((times, codes))
+        sorted_codes = codes[order]
+        block_start = np.zeros(len(order), dtype=np.int64)
+        boundaries = np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1
+        block_start[boundaries] = boundaries
+        np.maximum.accumulate(block_start, out=block_start)
+
+        values = self._statistics.values(dataframe)[order]
+        chunks = self._entity_chunks(block_start)
+        if len(chunks) > 1:
+            # pandas' rolling median runs without the GIL, entity blocks never straddle a chunk border
+            parts = Parallel(n_jobs=self._n_jobs, prefer="threads")(
+                delayed(self._entity_deviation)(values[lo:hi], block_start[lo:hi] - lo, sorted_codes[lo:hi])
+                for lo, hi in chunks
+            )
+            deviation = np.concatenate([part[0] for part in parts])
+            mad = np.concatenate([part[1] for part in parts])
+        else:
+            deviation, mad = self._entity_deviation(values, block_start, sorted_codes)
+        # entities too short to ever fill a MAD window fall back to the window-wide deviation median
+        mad = np.where(np.isnan(mad), np.nanmedian(deviation) if np.isfinite(deviation).any() else np.nan, mad)
+        with np.errstate(invalid="ignore"):
+            robust_z = 0.6745 * deviation / np.clip(mad, 1e-9, None)
+        flags = np.zeros(len(order), dtype=np.int8)
+        flags[order] = robust_z > self._threshold
+        return pd.Series(flags, index=dataframe.index)
+
+    def _entity_deviation(
+        self, values: np.ndarray, block_start: np.ndarray, codes: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        indexer = _EntityWindowIndexer(window_size=self._window, block_start=block_start)
+        series = pd.Series(values)
+        rolling_median = series.rolling(indexer, min_periods=self._min_periods).median()
+        deviation = (series - rolling_median).abs()
+        mad = deviation.rolling(indexer, min_periods=self._min_periods).median()
+        mad = mad.groupby(codes).bfill()
+        return deviation.to_numpy(), mad.to_numpy()
+
+    def _entity_chunks(self, block_start: np.ndarray) -> list[tuple[int, int]]:
+        total = len(block_start)
+        if not self._n_jobs or self._n_jobs == 1 or total < 2 * self._chunk_size:
+            return [(0, total)]
+        # snap every cut back to the start of the entity block it falls into
+        cuts = np.unique(block_start[np.arange(self._chunk_size, total, self._chunk_size)])
+        edges = [0, *[int(cut) for cut in cuts if cut > 0], total]
+        return [(lo, hi) for lo, hi in zip(edges[:-1], edges[1:]) if hi > lo]
+
+    def _score_new_events(self, dataframe: pd.DataFrame) -> pd.Series:
+        if self._engine is None:
+            self._restore()
+        times = dataframe["event_time"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        # events at or before the watermark were scored by an earlier run
+        fresh = np.flatnonzero(times > self._watermark) if self._watermark is not None else np.arange(len(times))
+        if not len(fresh):
+            return pd.Series([], dtype=int)
+        order = fresh[np.argsort(times[fresh], kind="stable")]
+        scores = self._engine.update(dataframe["value"].to_numpy(dtype=np.float64)[order])
+        self._watermark = int(times[order[-1]])
+        self._save()
+        predictions = pd.Series((scores > self._threshold).astype(int), index=dataframe.index[order])
+        return predictions.sort_index()
+
+    def _restore(self) -> None:
+        if self._state_path is not None and self._state_path.exists():
+            raw = json.loads(self._state_path.read_text(encoding="utf-8"))
+            engine = raw["engine"]
+            if engine["window"] == self._window and engine["min_periods"] == self._min_periods:
+                self._engine = StreamingRollingMAD.restore(engine)
+                self._watermark = raw["watermark"]
+                return
+        self._engine = StreamingRollingMAD(window=self._window, min_periods=self._min_periods)
+        self._watermark = None
+
+    def _save(self) -> None:
+        if self._state_path is None:
+            return
+        self._state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"watermark": self._watermark, "engine": self._engine.snapshot()}), encoding="utf-8")
+        os.replace(tmp, self._state_path)
+
+
+def _stable_order(codes: np.ndarray) -> np.ndarray:
+    """``argsort(codes, kind="stable")`` as one unstable sort of ``code << bits | row`` keys.
+
+    The keys are unique, so NumPy's quicksort gives the stable order, several
+    times faster than the merge sort behind ``kind="stable"`` on int64.
+    """
+
+    bits = max(1, int(len(codes) - 1).bit_length())
+    if not len(codes) or int(codes.max()).bit_length() + bits > 62:
+        return np.argsort(codes, kind="stable")
+    keys = codes.astype(np.int64) << bits
+    keys |= np.arange(len(codes), dtype=np.int64)
+    keys.sort()
+    keys &= (1 << bits) - 1
+    return keys
+
+
+class _EntityWindowIndexer(BaseIndexer):
+    """Trailing windows of ``window_size`` rows that never reach back past the entity block start."""
+
+    def get_window_bounds(
+        self,
+        num_values: int = 0,
+        min_periods: int | None = None,
+        center: bool | None = None,
+        closed: str | None = None,
+        step: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        end = np.arange(1, num_values + 1, dtype=np.int64)
+        start = np.maximum(end - self.window_size, self.block_start[:num_values])
+        return start, end
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from contextlib import suppress
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True, slots=True)
+class SharedColumn:
+    name: str
+    segment: str
+    dtype: str
+    length: int
+
+
+@dataclass(frozen=True, slots=True)
+class SharedFrameHandle:
+    """Picklable description of a frame whose numeric columns live in shared memory."""
+
+    columns: tuple[SharedColumn, ...]
+    order: tuple[str, ...]
+    inline: pd.DataFrame | None = None
+
+
+class SharedFrame:
+    """Publishes numeric DataFrame columns to shared memory for worker processes.
+
+    Workers map the segments instead of unpickling copies of the window, so
+    large ``value``/``attribute`` arrays are transferred once, not per detector.
+    """
+
+    def __init__(self, handle: SharedFrameHandle, segments: list[SharedMemory]) -> None:
+        self.handle = handle
+        self._segments = segments
+
+    @classmethod
+    def publish(cls, dataframe: pd.DataFrame) -> "SharedFrame":
+        columns: list[SharedColumn] = []
+        segments: list[SharedMemory] = []
+        inline: list[str] = []
+        try:
+            for name in dataframe.columns:
+                series = dataframe[name]
+                if not isinstance(series.dtype, np.dtype) or series.dtype.kind not in "biufM":
+                    inline.append(name)
+                    continue
+                array = np.ascontiguousarray(series.to_numpy())
+                segment = SharedMemory(create=True, size=max(array.nbytes, 1))
+                segments.append(segment)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[:] = array
+                columns.append(SharedColumn(name=name, segment=segment.name, dtype=array.dtype.str, length=len(array)))
+        except BaseException:
+            cls(SharedFrameHandle(columns=(), order=()), segments).release()
+            raise
+        handle = SharedFrameHandle(
+            columns=tuple(columns),
+            order=tuple(dataframe.columns),
+            inline=dataframe[inline].reset_index(drop=True) if inline else None,
+        )
+        return cls(handle, segments)
+
+    def release(self) -> None:
+        for segment in self._segments:
+            with suppress(FileNotFoundError):
+                segment.close()
+                segment.unlink()
+        self._segments = []
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
+
+
+def attach(handle: SharedFrameHandle) -> tuple[pd.DataFrame, list[SharedMemory]]:
+    """Rebuild the frame inside a worker; the caller closes the returned segments."""
+
+    segments: list[SharedMemory] = []
+    data: dict[str, object] = {}
+    for column in handle.columns:
+        segment = SharedMemory(name=column.segment)
+        segments.append(segment)
+        data[column.name] = np.ndarray((column.length,), dtype=np.dtype(column.dtype), buffer=segment.buf)
+    if handle.inline is not None:
+        for name in handle.inline.columns:
+            data[name] = handle.inline[name]
+    frame = pd.DataFrame({name: data[name] for name in handle.order}, copy=False)
+    return frame, segments
+
+
+def detach(segments: list[SharedMemory]) -> None:
+    for segment in segments:
+        # views may still be referenced by pandas internals; the mapping goes away with the worker
+        with suppress(BufferError):
+            segment.close()
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+import numpy as np
+import pandas as pd
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnStatistics:
+    count: int
+    mean: float
+    std: float
+    median: float
+    mad: float
+
+
+@dataclass(frozen=True, slots=True)
+class EntityMoments:
+    count: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+
+
+def column_statistics(values: np.ndarray) -> ColumnStatistics:
+    """Moments, median and MAD of ``values`` with a single float scratch buffer.
+
+    Median and MAD come from ``partition`` (selection, O(n)) instead of a
+    sort, and every intermediate is written into the same scratch array.
+    NaN is skipped like pandas does.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    total = float(np.add.reduce(values)) if len(values) else 0.0
+    if np.isnan(total):
+        values = values[~np.isnan(values)]
+        total = float(np.add.reduce(values)) if len(values) else 0.0
+    count = len(values)
+    if count == 0:
+        return ColumnStatistics(count=0, mean=np.nan, std=np.nan, median=np.nan, mad=np.nan)
+    mean = total / count
+
+    scratch = np.empty_like(values)
+    np.subtract(values, mean, out=scratch)
+    # two-pass variance: the centred dot product avoids the cancellation of sum(x^2) - n*mean^2
+    std = float(np.sqrt(np.dot(scratch, scratch) / (count - 1))) if count > 1 else np.nan
+
+    np.copyto(scratch, values)
+    median = _select_median(scratch)
+    np.subtract(values, median, out=scratch)
+    np.abs(scratch, out=scratch)
+    mad = _select_median(scratch)
+    return ColumnStatistics(count=count, mean=mean, std=std, median=median, mad=mad)
+
+
+def outside_band(values: np.ndarray, center: float, width: float) -> np.ndarray:
+    """``|values - center| > width`` as 0/1 int8 without float temporaries."""
+
+    flags = np.greater(values, center + width)
+    flags |= np.less(values, center - width)
+    return flags.view(np.int8)
+
+
+def _select_median(buffer: np.ndarray) -> float:
+    """Median of ``buffer``, which is reordered in place."""
+
+    n = len(buffer)
+    middle = n // 2
+    if n % 2:
+        buffer.partition(middle)
+        return float(buffer[middle])
+    buffer.partition((middle - 1, middle))
+    return float((buffer[middle - 1] + buffer[middle]) / 2.0)
+
+
+def entity_codes(entity_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Dense group codes per row and the entity id of every code."""
+
+    if len(entity_ids) and entity_ids.dtype.kind in "iu" and 0 <= entity_ids.min() and entity_ids.max() < 4 * len(entity_ids):
+        # small non-negative ids (the generator's range) are their own codes after dropping empty slots
+        dense = entity_ids.astype(np.int64, copy=False)
+        present = np.flatnonzero(np.bincount(dense))
+        lookup = np.empty(int(present[-1]) + 1, dtype=np.int64)
+        lookup[present] = np.arange(len(present))
+        return lookup[dense], present.astype(entity_ids.dtype)
+    codes, uniques = pd.factorize(entity_ids, sort=True)
+    return codes.astype(np.int64, copy=False), np.asarray(uniques)
+
+
+def entity_moments(values: np.ndarray, codes: np.ndarray, groups: int) -> EntityMoments:
+    """Per-entity count, mean and std (ddof=1) with ``bincount`` segment sums, no sort."""
+
+    count = np.bincount(codes, minlength=groups)
+    mean = np.bincount(codes, weights=values, minlength=groups) / np.maximum(count, 1)
+    centred = values - mean[codes]
+    np.square(centred, out=centred)
+    squares = np.bincount(codes, weights=centred, minlength=groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(squares / (count - 1))
+    return EntityMoments(count=count, mean=mean, std=std)
+
+
+def entity_medians(values: np.ndarray, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-entity median and MAD; pandas' grouped median selects within groups instead of sorting them."""
+
+    median = pd.Series(values, copy=False).groupby(codes, sort=True).median().to_numpy()
+    deviation = values - median[codes]
+    np.abs(deviation, out=deviation)
+    mad = pd.Series(deviation, copy=False).groupby(codes, sort=True).median().to_numpy()
+    return median, mad
+
+
+class ColumnStatisticsContext:
+    """Column statistics shared by the statistical detectors of one window.
+
+    Detectors built with the same context compute the statistics of a frame
+    once: the first caller computes them, concurrent callers wait for it, and
+    the entry is dropped when the frame is garbage collected. Process workers
+    receive their own (empty) copy. Per-entity statistics are computed and
+    cached the same way, each kind only when a detector asks for it.
+    """
+
+    def __init__(self, column: str = "value", entity_column: str = "entity_id") -> None:
+        self.column = column
+        self.entity_column = entity_column
+        # reentrant: the weakref callback may fire from a collection triggered inside get()
+        self._lock = threading.RLock()
+        self._entries: dict[int, tuple[weakref.ref[pd.DataFrame], dict[str, object]]] = {}
+        self.computed = 0
+
+    def get(self, dataframe: pd.DataFrame) -> ColumnStatistics:
+        return self._memo(dataframe, "column", lambda: column_statistics(self.values(dataframe)))
+
+    def entities(self, dataframe: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        return self._memo(
+            dataframe, "entities", lambda: entity_codes(dataframe[self.entity_column].to_numpy(copy=False))
+        )
+
+    def entity_moments(self, dataframe: pd.DataFrame) -> EntityMoments:
+        codes, ids = self.entities(dataframe)
+        return self._memo(dataframe, "moments", lambda: entity_moments(self.values(dataframe), codes, len(ids)))
+
+    def entity_medians(self, dataframe: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        codes, _ = self.entities(dataframe)
+        return self._memo(dataframe, "medians", lambda: entity_medians(self.values(dataframe), codes))
+
+    def values(self, dataframe: pd.DataFrame) -> np.ndarray:
+        return dataframe[self.column].to_numpy(dtype=np.float64, copy=False)
+
+    def _memo(self, dataframe: pd.DataFrame, name: str, compute: Callable[[], T]) -> T:
+        key = id(dataframe)
+        with self._lock:
+            entry = self._entries.get(key)
+            # ids are reused after collection, so the weakref confirms it is the same frame
+            if entry is None or entry[0]() is not dataframe:
+                entry = (weakref.ref(dataframe, lambda _, key=key: self._evict(key)), {})
+                self._entries[key] = entry
+            cached = entry[1]
+            if name not in cached:
+                cached[name] = compute()
+                self.computed += 1
+            return cached[name]  # type: ignore[return-value]
+
+    def _evict(self, key: int) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is None:
+                del self._entries[key]
+
+    def __getstate__(self) -> dict[str, object]:
+        return {"column": self.column, "entity_column": self.entity_column}
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__init__(column=str(state["column"]), entity_column=str(state["entity_column"]))
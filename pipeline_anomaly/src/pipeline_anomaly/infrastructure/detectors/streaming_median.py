@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import heapq
+import math
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+
+# consistency constant of the modified z-score, same as the batch detectors
+_MAD_SCALE = 0.6745
+
+
+class SlidingMedian:
+    """Median of the last ``window`` values in O(log w) per update.
+
+    Two heaps hold the lower and upper halves; values leaving the window are
+    marked and only popped once they reach a heap top (lazy deletion). NaN
+    occupies a window slot but is not counted, like ``rolling().median()``.
+    """
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError("window must be positive")
+        self._window = window
+        self._values: deque[float] = deque()
+        self._low: list[float] = []  # max-heap through negation
+        self._high: list[float] = []
+        self._delayed: dict[float, int] = {}
+        self._low_size = 0
+        self._high_size = 0
+
+    @property
+    def count(self) -> int:
+        return self._low_size + self._high_size
+
+    @property
+    def values(self) -> list[float]:
+        return list(self._values)
+
+    def push(self, value: float) -> None:
+        if len(self._values) == self._window:
+            self._discard(self._values.popleft())
+        self._values.append(value)
+        if math.isnan(value):
+            return
+        if not self._low_size or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+        self._rebalance()
+
+    def median(self) -> float:
+        if not self.count:
+            return math.nan
+        if self._low_size > self._high_size:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2.0
+
+    def _discard(self, value: float) -> None:
+        if math.isnan(value):
+            return
+        self._delayed[value] = self._delayed.get(value, 0) + 1
+        if value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune(self._low, negated=True)
+        else:
+            self._high_size -= 1
+            if value == self._high[0]:
+                self._prune(self._high, negated=False)
+        self._rebalance()
+
+    def _rebalance(self) -> None:
+        if self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, negated=True)
+        elif self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune(self._high, negated=False)
+
+    def _prune(self, heap: list[float], negated: bool) -> None:
+        while heap:
+            value = -heap[0] if negated else heap[0]
+            pending = self._delayed.get(value)
+            if not pending:
+                return
+            if pending == 1:
+                del self._delayed[value]
+            else:
+                self._delayed[value] = pending - 1
+            heapq.heappop(heap)
+
+
+class StreamingRollingMAD:
+    """Incremental robust z-scores over a trailing window of events.
+
+    Keeps a sliding median of the values and a sliding median of their
+    absolute deviations, so each event costs O(log w) and earlier events are
+    never rescored. ``snapshot``/``restore`` carry the state between runs.
+    """
+
+    def __init__(self, window: int, min_periods: int) -> None:
+        self._window = window
+        self._min_periods = min_periods
+        self._values = SlidingMedian(window)
+        self._deviations = SlidingMedian(window)
+
+    def update(self, values: Iterable[float]) -> np.ndarray:
+        """Feeds events in time order and returns their robust z-scores (NaN while warming up)."""
+
+        scores: list[float] = []
+        for value in values:
+            value = float(value)
+            self._values.push(value)
+            median = self._values.median() if self._values.count >= self._min_periods else math.nan
+            deviation = abs(value - median)
+            self._deviations.push(deviation)
+            if self._deviations.count < self._min_periods or math.isnan(deviation):
+                scores.append(math.nan)
+                continue
+            scores.append(_MAD_SCALE * deviation / max(self._deviations.median(), 1e-9))
+        return np.asarray(scores, dtype=np.float64)
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "window": self._window,
+            "min_periods": self._min_periods,
+            "values": _encode(self._values.values),
+            "deviations": _encode(self._deviations.values),
+        }
+
+    @classmethod
+    def restore(cls, snapshot: dict[str, object]) -> "StreamingRollingMAD":
+        engine = cls(window=int(snapshot["window"]), min_periods=int(snapshot["min_periods"]))
+        for value in _decode(snapshot["values"]):
+            engine._values.push(value)
+        for value in _decode(snapshot["deviations"]):
+            engine._deviations.push(value)
+        return engine
+
+
+def _encode(values: list[float]) -> list[float | None]:
+    # keeps the snapshot strict JSON
+    return [None if math.isnan(value) else value for value in values]
+
+
+def _decode(values: object) -> list[float]:
+    return [math.nan if value is None else float(value) for value in values]  # type: ignore[union-attr]
@@ -1,17 +1,38 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from pipeline_anomaly.infrastructure.detectors.base import PandasDetector
+from pipeline_anomaly.infrastructure.detectors.statistics import ColumnStatisticsContext, outside_band
 
 
 class ZScoreDetector(PandasDetector):
-    def __init__(self, threshold: float) -> None:
+    """Z-score over the whole window, or against each entity's own baseline with ``per_entity``."""
+
+    def __init__(
+        self,
+        threshold: float,
+        statistics: ColumnStatisticsContext | None = None,
+        per_entity: bool = False,
+        min_entity_events: int = 5,
+    ) -> None:
         super().__init__(name="zscore")
         self._threshold = threshold
+        self._statistics = statistics or ColumnStatisticsContext()
+        self._per_entity = per_entity
+        self._min_entity_events = min_entity_events
 
     def fit_predict(self, dataframe: pd.DataFrame) -> pd.Series:
-        mean = dataframe["value"].mean()
-        std = dataframe["value"].std()
-        z_scores = (dataframe["value"] - mean) / std
-        return (z_scores.abs() > self._threshold).astype(int)
+        values = self._statistics.values(dataframe)
+        if self._per_entity:
+            codes, _ = self._statistics.entities(dataframe)
+            moments = self._statistics.entity_moments(dataframe)
+            # entities with too few events have no baseline; a NaN width never flags
+            width = np.where(moments.count >= self._min_entity_events, self._threshold * moments.std, np.nan)
+            flags = np.abs(values - moments.mean[codes]) > width[codes]
+            return pd.Series(flags.view(np.int8), index=dataframe.index)
+        stats = self._statistics.get(dataframe)
+        # |x - mean| / std > threshold, compared against the band instead of materialising z-scores
+        flags = outside_band(values, stats.mean, self._threshold * stats.std)
+        return pd.Series(flags, index=dataframe.index)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Iterator
@@ -9,6 +11,8 @@ import pandas as pd
 
 from pipeline_anomaly.domain.models.batch import RecordBatch
 
+_NS_PER_SECOND = 1_000_000_000
+
 
 @dataclass(slots=True)
 class SyntheticDatasetConfig:
@@ -16,19 +20,108 @@ class SyntheticDatasetConfig:
     batch_size: int
     anomaly_ratio: float
     seed: int
+    vectorized: bool = False
+    workers: int = 1
+    reuse_buffers: bool = False
+
+
+@dataclass(slots=True)
+class _PartitionBuffers:
+    """Preallocated column arrays reused between vectorized partitions."""
+
+    event_time: np.ndarray
+    value: np.ndarray
+    attribute: np.ndarray
+    steps: np.ndarray
+
+    @classmethod
+    def allocate(cls, size: int) -> "_PartitionBuffers":
+        return cls(
+            event_time=np.empty(size, dtype="datetime64[ns]"),
+            value=np.empty(size, dtype=np.float64),
+            attribute=np.empty(size, dtype=np.float64),
+            steps=np.arange(size, dtype=np.int64) * _NS_PER_SECOND,
+        )
+
+
+def _generate_partition(
+    seed: int,
+    index: int,
+    start_ns: int,
+    offset: int,
+    size: int,
+    anomaly_ratio: float,
+    buffers: _PartitionBuffers | None = None,
+) -> pd.DataFrame:
+    """Build one partition from its own seed stream.
+
+    The stream depends only on ``seed`` and the partition index, so the
+    output is identical no matter which process generates the partition.
+    """
+
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+    if buffers is None or len(buffers.value) < size:
+        buffers = _PartitionBuffers.allocate(size)
+
+    event_time = buffers.event_time[:size]
+    np.subtract(start_ns - offset * _NS_PER_SECOND, buffers.steps[:size], out=event_time.view(np.int64))
+
+    entity_ids = rng.integers(1, 1_000_000, size=size, dtype=np.int64)
+
+    values = buffers.value[:size]
+    rng.standard_normal(out=values)
+    values *= 15.0
+    values += 100.0
+
+    attribute = buffers.attribute[:size]
+    rng.random(out=attribute)
+
+    anomalies_count = max(1, int(size * anomaly_ratio))
+    anomaly_indices = rng.choice(size, size=anomalies_count, replace=False)
+    values[anomaly_indices] *= rng.uniform(2, 5, size=anomalies_count)
+
+    return pd.DataFrame(
+        {
+            "event_time": event_time,
+            "entity_id": entity_ids,
+            "value": values,
+            "attribute": attribute,
+        },
+        copy=False,
+    )
 
 
 class SyntheticDatasetGenerator:
-    def __init__(self, config: SyntheticDatasetConfig) -> None:
+    def __init__(self, config: SyntheticDatasetConfig, start_time: datetime | None = None) -> None:
         self._config = config
         self._random = np.random.default_rng(config.seed)
+        self._start_time = start_time
+
+    @property
+    def reuses_buffers(self) -> bool:
+        """Whether a yielded batch is overwritten by the next one."""
+
+        return self._config.reuse_buffers
 
     def batches(self) -> list[RecordBatch]:
+        """All batches at once; with ``reuse_buffers`` each one is copied out of the shared arrays."""
+
+        if self._config.reuse_buffers:
+            return [RecordBatch(dataframe=batch.dataframe.copy()) for batch in self._iter_batches()]
         return list(self._iter_batches())
 
+    def iter_batches(self) -> Iterator[RecordBatch]:
+        """Yield batches lazily so only the batch being built is held in memory."""
+
+        return self._iter_batches()
+
     def _iter_batches(self) -> Iterator[RecordBatch]:
+        if self._config.vectorized:
+            yield from self._iter_vectorized_batches()
+            return
+
         remaining = self._config.row_count
-        current_time = datetime.utcnow()
+        current_time = self._start_time or datetime.utcnow()
         while remaining > 0:
             batch_size = min(self._config.batch_size, remaining)
             timestamps = [current_time - timedelta(seconds=i) for i in range(batch_size)]
@@ -51,3 +144,44 @@ class SyntheticDatasetGenerator:
             yield RecordBatch(dataframe=dataframe)
             remaining -= batch_size
             current_time -= timedelta(seconds=batch_size)
+
+    def _iter_vectorized_batches(self) -> Iterator[RecordBatch]:
+        """Generate ``datetime64[ns]`` partitions with NumPy kernels only.
+
+        With ``reuse_buffers`` every batch shares the same arrays, so a batch is
+        only valid until the next one is requested.
+        """
+
+        start = np.datetime64(self._start_time or datetime.utcnow(), "ns")
+        start_ns = int(start.astype(np.int64))
+        partitions = self._partitions()
+        cfg = self._config
+
+        if cfg.workers <= 1:
+            buffers = _PartitionBuffers.allocate(min(cfg.batch_size, cfg.row_count)) if cfg.reuse_buffers else None
+            for index, offset, size in partitions:
+                frame = _generate_partition(cfg.seed, index, start_ns, offset, size, cfg.anomaly_ratio, buffers)
+                yield RecordBatch(dataframe=frame)
+            return
+
+        # keep a bounded number of partitions in flight so memory stays flat
+        max_pending = cfg.workers * 2
+        with ProcessPoolExecutor(max_workers=cfg.workers) as executor:
+            pending: deque[Future[pd.DataFrame]] = deque()
+            for index, offset, size in partitions:
+                pending.append(
+                    executor.submit(_generate_partition, cfg.seed, index, start_ns, offset, size, cfg.anomaly_ratio)
+                )
+                if len(pending) >= max_pending:
+                    yield RecordBatch(dataframe=pending.popleft().result())
+            while pending:
+                yield RecordBatch(dataframe=pending.popleft().result())
+
+    def _partitions(self) -> Iterator[tuple[int, int, int]]:
+        offset = 0
+        index = 0
+        while offset < self._config.row_count:
+            size = min(self._config.batch_size, self._config.row_count - offset)
+            yield index, offset, size
+            offset += size
+            index += 1
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Sequence
 
 import pandas as pd
 
@@ -8,11 +9,13 @@ from pipeline_anomaly.domain.models.aggregate import AggregateCollection
 from pipeline_anomaly.domain.models.anomaly import AnomalyReport
 from pipeline_anomaly.domain.models.batch import RecordBatch
 from pipeline_anomaly.infrastructure.clients.clickhouse import ClickHouseFactory
+from pipeline_anomaly.infrastructure.clients.columnar import ColumnarWriter
 
 
 class ClickHouseRepository:
-    def __init__(self, factory: ClickHouseFactory) -> None:
+    def __init__(self, factory: ClickHouseFactory, writer: ColumnarWriter | None = None) -> None:
         self._factory = factory
+        self._writer = writer or factory.writer()
 
     def ensure_schema(self) -> None:
         ddl_statements = [
@@ -41,9 +44,23 @@ class ClickHouseRepository:
                 detector String,
                 score Float64,
                 severity Float64,
-                description String
+                description String,
+                duration_ms Nullable(Float64)
             ) ENGINE = MergeTree ORDER BY (generated_at, detector)
             """,
+            "ALTER TABLE anomaly_reports ADD COLUMN IF NOT EXISTS duration_ms Nullable(Float64)",
+            """
+            CREATE TABLE IF NOT EXISTS anomaly_entities (
+                generated_at DateTime,
+                window_start DateTime,
+                window_end DateTime,
+                rank UInt16,
+                entity_id UInt64,
+                flagged UInt64,
+                events UInt64,
+                detectors Array(String)
+            ) ENGINE = MergeTree ORDER BY (generated_at, rank)
+            """,
         ]
         with self._factory.connect() as client:
             for ddl in ddl_statements:
@@ -51,28 +68,110 @@ class ClickHouseRepository:
 
     def ingest_batch(self, batch: RecordBatch) -> None:
         with self._factory.connect() as client:
-            client.insert_dataframe("events", batch.dataframe)
+            client.insert_df("events", batch.dataframe)
 
     def persist_aggregates(self, aggregates: AggregateCollection) -> None:
-        payload = aggregates.as_dict()
-        with self._factory.connect() as client:
-            client.insert_dicts("aggregates", payload)
+        items = aggregates.aggregates
+        self._writer.write(
+            "aggregates",
+            {
+                "metric": [item.metric for item in items],
+                "value": [float(item.value) for item in items],
+                "window_start": [item.window_start for item in items],
+                "window_end": [item.window_end for item in items],
+                "extra": [dict(item.extra or {}) for item in items],
+            },
+        )
 
     def persist_report(self, report: AnomalyReport) -> None:
-        rows = [
+        anomalies = report.anomalies
+        self._writer.write(
+            "anomaly_reports",
             {
-                "generated_at": report.generated_at,
-                "window_start": report.window_start,
-                "window_end": report.window_end,
-                "detector": anomaly.detector,
-                "score": anomaly.score,
-                "severity": anomaly.severity,
-                "description": anomaly.description,
-            }
-            for anomaly in report.anomalies
-        ]
+                "generated_at": [report.generated_at] * len(anomalies),
+                "window_start": [report.window_start] * len(anomalies),
+                "window_end": [report.window_end] * len(anomalies),
+                "detector": [anomaly.detector for anomaly in anomalies],
+                "score": [anomaly.score for anomaly in anomalies],
+                "severity": [anomaly.severity for anomaly in anomalies],
+                "description": [anomaly.description for anomaly in anomalies],
+                "duration_ms": [anomaly.duration_ms for anomaly in anomalies],
+            },
+        )
+        entities = report.top_entities
+        self._writer.write(
+            "anomaly_entities",
+            {
+                "generated_at": [report.generated_at] * len(entities),
+                "window_start": [report.window_start] * len(entities),
+                "window_end": [report.window_end] * len(entities),
+                "rank": list(range(1, len(entities) + 1)),
+                "entity_id": [entity.entity_id for entity in entities],
+                "flagged": [entity.flagged for entity in entities],
+                "events": [entity.events for entity in entities],
+                "detectors": [list(entity.detectors) for entity in entities],
+            },
+        )
+
+    def window_bounds(self, minutes: int | None = None) -> tuple[datetime, datetime | None]:
+        """Return the server-side window cutoff and the current ``events`` watermark."""
+
+        interval_minutes = minutes or 60 * 24
+        query = f"""
+        SELECT now() - INTERVAL {interval_minutes} MINUTE AS cutoff, max(event_time) AS watermark, count() AS rows
+        FROM events
+        """
+        with self._factory.connect() as client:
+            cutoff, watermark, rows = client.query(query).result_rows[0]
+        return cutoff, (watermark if rows else None)
+
+    def read_window_since(self, watermark: datetime, minutes: int | None = None) -> pd.DataFrame:
+        """Read only rows newer than ``watermark`` that still fall into the window."""
+
+        interval_minutes = minutes or 60 * 24
+        query = f"""
+        SELECT * FROM events
+        WHERE event_time > {{watermark:DateTime}}
+          AND event_time >= now() - INTERVAL {interval_minutes} MINUTE
+        ORDER BY event_time
+        """
+        with self._factory.connect() as client:
+            return client.query_df(query, parameters={"watermark": watermark})
+
+    def read_events_after(
+        self, watermark: datetime | None, lag_seconds: int = 2, lookback_minutes: int = 5
+    ) -> pd.DataFrame:
+        """Tail ``events``: rows newer than ``watermark`` up to ``lag_seconds`` before the server clock.
+
+        ``event_time`` has second precision, so the lag keeps a second open
+        until late rows of it have landed and a strict ``>`` never skips them.
+        """
+
+        lower = (
+            "event_time > {watermark:DateTime}"
+            if watermark is not None
+            else f"event_time >= now() - INTERVAL {int(lookback_minutes)} MINUTE"
+        )
+        query = f"""
+        SELECT * FROM events
+        WHERE {lower}
+          AND event_time <= now() - INTERVAL {int(lag_seconds)} SECOND
+        ORDER BY event_time
+        """
+        with self._factory.connect() as client:
+            return client.query_df(query, parameters={"watermark": watermark} if watermark is not None else None)
+
+    def query_window_scalars(self, expressions: Sequence[str], minutes: int | None = None) -> tuple[object, ...]:
+        """Evaluate aggregate expressions over the window and return the single result row."""
+
+        interval_minutes = minutes or 60 * 24
+        query = f"""
+        SELECT {", ".join(expressions)}
+        FROM events
+        WHERE event_time >= now() - INTERVAL {interval_minutes} MINUTE
+        """
         with self._factory.connect() as client:
-            client.insert_dicts("anomaly_reports", rows)
+            return tuple(client.query(query).result_rows[0])
 
     def read_latest_window(self, minutes: int | None = None) -> pd.DataFrame:
         with self._factory.connect() as client:
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from pipeline_anomaly.domain.models.aggregate import AggregateCollection
+from pipeline_anomaly.domain.models.anomaly import AnomalyReport
+from pipeline_anomaly.domain.models.batch import RecordBatch
+from pipeline_anomaly.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+
+DEFAULT_WINDOW_MINUTES = 60 * 24
+
+
+@dataclass(slots=True)
+class WindowCacheStats:
+    hits: int = 0
+    full_reads: int = 0
+    incremental_reads: int = 0
+    rows_fetched: int = 0
+    rows_evicted: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class _WindowEntry:
+    watermark: pd.Timestamp
+    frame: pd.DataFrame
+
+
+class WindowedFrameCache:
+    """ClickHouseWriter that serves window reads from a frame shared by all stages.
+
+    Frames are keyed by (window, watermark): as long as ``max(event_time)`` in
+    ``events`` does not move, every stage gets the cached frame without a scan.
+    Narrower windows are sliced out of the widest one (``min_window_minutes``).
+    In incremental mode only rows newer than the cached watermark are fetched
+    and rows that fell out of the window are dropped, which assumes events
+    arrive in ``event_time`` order. Returned frames are shared, treat them as
+    read-only.
+    """
+
+    def __init__(
+        self,
+        repository: ClickHouseRepository,
+        incremental: bool = False,
+        min_window_minutes: int | None = None,
+    ) -> None:
+        self._repository = repository
+        self._incremental = incremental
+        self._min_window_minutes = min_window_minutes or 0
+        self._entries: dict[int, _WindowEntry] = {}
+        self._stats = WindowCacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> WindowCacheStats:
+        with self._lock:
+            return WindowCacheStats(**self._stats.as_dict())
+
+    def ensure_schema(self) -> None:
+        self._repository.ensure_schema()
+
+    def ingest_batch(self, batch: RecordBatch) -> None:
+        self._repository.ingest_batch(batch)
+
+    def persist_aggregates(self, aggregates: AggregateCollection) -> None:
+        self._repository.persist_aggregates(aggregates)
+
+    def persist_report(self, report: AnomalyReport) -> None:
+        self._repository.persist_report(report)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def read_latest_window(self, minutes: int | None = None) -> pd.DataFrame:
+        requested = minutes or DEFAULT_WINDOW_MINUTES
+        window = max(requested, self._min_window_minutes)
+        with self._lock:
+            cutoff, watermark = self._repository.window_bounds(window)
+            if watermark is None:
+                raise RuntimeError("events table is empty")
+            frame = self._refresh(window, pd.Timestamp(cutoff), pd.Timestamp(watermark))
+
+        if requested < window:
+            frame = self._slice_from(frame, pd.Timestamp(cutoff) + timedelta(minutes=window - requested))
+        if frame.empty:
+            raise RuntimeError("events table is empty")
+        return frame
+
+    def _refresh(self, window: int, cutoff: pd.Timestamp, watermark: pd.Timestamp) -> pd.DataFrame:
+        entry = self._entries.get(window)
+        if entry is not None and entry.watermark >= watermark:
+            self._stats.hits += 1
+            frame = entry.frame
+        elif entry is not None and self._incremental:
+            delta = self._repository.read_window_since(entry.watermark.to_pydatetime(), window)
+            self._stats.incremental_reads += 1
+            self._stats.rows_fetched += len(delta)
+            frame = pd.concat([entry.frame, delta], ignore_index=True) if not delta.empty else entry.frame
+        else:
+            frame = self._repository.read_latest_window(window)
+            self._stats.full_reads += 1
+            self._stats.rows_fetched += len(frame)
+
+        evicted = self._slice_from(frame, cutoff)
+        self._stats.rows_evicted += len(frame) - len(evicted)
+        if evicted.empty:
+            self._entries.pop(window, None)
+            return evicted
+        # the watermark is taken from the rows actually fetched, so rows that
+        # landed between the bounds query and the read are never fetched twice
+        self._entries[window] = _WindowEntry(watermark=evicted["event_time"].iloc[-1], frame=evicted)
+        return evicted
+
+    @staticmethod
+    def _slice_from(frame: pd.DataFrame, cutoff: pd.Timestamp | datetime) -> pd.DataFrame:
+        # frames are kept ordered by event_time, a binary search is enough
+        start = int(frame["event_time"].searchsorted(cutoff, side="left"))
+        if start == 0:
+            return frame
+        return frame.iloc[start:].reset_index(drop=True)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+
+from pipeline_anomaly.infrastructure.detectors.streaming_median import StreamingRollingMAD
+
+
+class OnlineZScoreDetector:
+    """Z-score of each event against the trailing ``window`` events (the event included).
+
+    Mean and variance are kept with Welford updates that also retire the
+    event leaving the window, so every event costs O(1).
+    """
+
+    def __init__(self, threshold: float, window: int, min_periods: int | None = None, name: str = "zscore") -> None:
+        self.name = name
+        self.threshold = threshold
+        self._window = window
+        self._min_periods = min_periods or max(2, window // 2)
+        self._values: deque[float] = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def score(self, values: Iterable[float]) -> np.ndarray:
+        scores: list[float] = []
+        for value in values:
+            value = float(value)
+            if len(self._values) == self._window:
+                self._remove(self._values.popleft())
+            self._values.append(value)
+            count = len(self._values)
+            delta = value - self._mean
+            self._mean += delta / count
+            self._m2 += delta * (value - self._mean)
+            if count < self._min_periods:
+                scores.append(math.nan)
+                continue
+            std = math.sqrt(max(self._m2, 0.0) / (count - 1))
+            scores.append(abs(value - self._mean) / std if std > 0 else math.nan)
+        return np.asarray(scores, dtype=np.float64)
+
+    def _remove(self, value: float) -> None:
+        count = len(self._values)
+        if count == 0:
+            self._mean, self._m2 = 0.0, 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / count
+        self._m2 -= delta * (value - self._mean)
+
+    def snapshot(self) -> dict[str, object]:
+        return {"kind": "zscore", "window": self._window, "min_periods": self._min_periods, "values": list(self._values)}
+
+    def restore(self, snapshot: dict[str, object]) -> None:
+        if snapshot.get("window") != self._window or snapshot.get("min_periods") != self._min_periods:
+            return
+        self._values.clear()
+        self._mean, self._m2 = 0.0, 0.0
+        self.score(snapshot["values"])  # type: ignore[arg-type]
+
+
+class OnlineRobustDetector:
+    """Modified z-score against the trailing window median and MAD.
+
+    With a long window this is the online counterpart of the MAD detector,
+    with a short one of the rolling MAD detector.
+    """
+
+    def __init__(self, name: str, threshold: float, window: int, min_periods: int | None = None) -> None:
+        self.name = name
+        self.threshold = threshold
+        self._engine = StreamingRollingMAD(window=window, min_periods=min_periods or max(1, window // 2))
+
+    def score(self, values: Iterable[float]) -> np.ndarray:
+        return self._engine.update(values)
+
+    def snapshot(self) -> dict[str, object]:
+        return {"kind": "robust", **self._engine.snapshot()}
+
+    def restore(self, snapshot: dict[str, object]) -> None:
+        current = self._engine.snapshot()
+        if snapshot.get("window") != current["window"] or snapshot.get("min_periods") != current["min_periods"]:
+            return
+        self._engine = StreamingRollingMAD.restore(snapshot)
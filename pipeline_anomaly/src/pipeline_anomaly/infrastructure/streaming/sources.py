@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+from datetime import datetime
+from typing import AsyncIterator
+
+import pandas as pd
+from loguru import logger
+
+from pipeline_anomaly.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+
+EVENT_COLUMNS = ("event_time", "entity_id", "value", "attribute")
+_MAX_BACKOFF = 30.0
+
+
+class ClickHouseTailSource:
+    """Polls ``events`` for rows newer than the last watermark.
+
+    A failed poll is logged and retried with exponential backoff; the
+    watermark only moves when a batch is read, so nothing is skipped.
+    """
+
+    def __init__(
+        self,
+        repository: ClickHouseRepository,
+        poll_interval: float = 1.0,
+        lag_seconds: int = 2,
+        lookback_minutes: int = 5,
+        watermark: datetime | None = None,
+    ) -> None:
+        self._repository = repository
+        self._poll_interval = poll_interval
+        self._lag_seconds = lag_seconds
+        self._lookback_minutes = lookback_minutes
+        self.watermark = watermark
+
+    async def batches(self) -> AsyncIterator[pd.DataFrame]:
+        failures = 0
+        while True:
+            started = asyncio.get_running_loop().time()
+            try:
+                frame = await asyncio.to_thread(
+                    self._repository.read_events_after, self.watermark, self._lag_seconds, self._lookback_minutes
+                )
+            except Exception as exc:  # noqa: BLE001 - a ClickHouse hiccup must not end the stream
+                failures += 1
+                delay = min(max(self._poll_interval, 0.1) * 2**failures, _MAX_BACKOFF)
+                logger.warning("polling events after {} failed ({}), retrying in {:.1f}s", self.watermark, exc, delay)
+                await asyncio.sleep(delay)
+                continue
+            failures = 0
+            if not frame.empty:
+                self.watermark = frame["event_time"].max().to_pydatetime()
+                yield frame
+            elapsed = asyncio.get_running_loop().time() - started
+            await asyncio.sleep(max(0.0, self._poll_interval - elapsed))
+
+
+class SocketEventSource:
+    """Accepts JSON-lines events over TCP, a local stand-in for a message bus.
+
+    Each line is one event with ``event_time`` (ISO string or epoch seconds),
+    ``entity_id``, ``value`` and ``attribute``. Lines that are not such an
+    object are logged and dropped. Events are flushed as a batch every
+    ``flush_interval`` seconds or once ``max_batch`` are buffered.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9009,
+        max_batch: int = 10_000,
+        flush_interval: float = 0.5,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self._max_batch = max_batch
+        self._flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict[str, object]] = asyncio.Queue(maxsize=max_batch * 4)
+        self._server: asyncio.AbstractServer | None = None
+        self.ready = asyncio.Event()
+
+    async def batches(self) -> AsyncIterator[pd.DataFrame]:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # port 0 binds an ephemeral port; expose the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.ready.set()
+        logger.info("listening for events on {}:{}", self.host, self.port)
+        try:
+            while True:
+                events = [await self._queue.get()]
+                deadline = asyncio.get_running_loop().time() + self._flush_interval
+                while len(events) < self._max_batch:
+                    timeout = deadline - asyncio.get_running_loop().time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        events.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                yield _frame(events)
+        finally:
+            self._server.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                event = _event(line)
+                if event is None:
+                    continue
+                # a full queue applies back-pressure to the producer's socket
+                await self._queue.put(event)
+        finally:
+            writer.close()
+
+
+def _event(line: bytes) -> dict[str, object] | None:
+    """Parse one line into an event with a naive UTC timestamp and numeric fields, ``None`` if it is malformed."""
+
+    try:
+        raw = json.loads(line)
+        if not isinstance(raw, dict):
+            raise TypeError(f"expected a JSON object, got {type(raw).__name__}")
+        stamp = raw["event_time"]
+        numeric = isinstance(stamp, (int, float)) and not isinstance(stamp, bool)
+        event_time = pd.Timestamp(stamp, unit="s") if numeric else pd.Timestamp(stamp)
+        if pd.isna(event_time):
+            raise ValueError("event_time is missing")
+        if event_time.tzinfo is not None:
+            event_time = event_time.tz_convert("UTC").tz_localize(None)
+        value = float(raw["value"])
+        if not math.isfinite(value):
+            raise ValueError(f"value {value} is not finite")
+        attribute = raw.get("attribute")
+        return {
+            "event_time": event_time,
+            "entity_id": int(raw["entity_id"]),
+            "value": value,
+            "attribute": float("nan") if attribute is None else float(attribute),
+        }
+    except (KeyError, TypeError, ValueError, OverflowError) as exc:
+        logger.warning("dropping malformed event line {!r}: {!r}", line[:200], exc)
+        return None
+
+
+def _frame(events: list[dict[str, object]]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(events, columns=list(EVENT_COLUMNS))
+    frame["event_time"] = pd.to_datetime(frame["event_time"])
+    return frame
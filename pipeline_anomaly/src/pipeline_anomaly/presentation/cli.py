@@ -1,59 +1,156 @@
 from __future__ import annotations
 
+import asyncio
+import signal
 from pathlib import Path
 
 import typer
+from loguru import logger
 
 from pipeline_anomaly.application.services.ensemble import WeightedAnomalyEnsemble
 from pipeline_anomaly.application.use_cases.compute_aggregates import ComputeAggregates
 from pipeline_anomaly.application.use_cases.detect_anomalies import DetectAnomalies
 from pipeline_anomaly.application.use_cases.load_dataset import LoadSyntheticDataset
 from pipeline_anomaly.application.use_cases.run_pipeline import RunPipeline
-from pipeline_anomaly.infrastructure.alerting.stdout_sink import StdOutAlertSink
+from pipeline_anomaly.application.use_cases.stream_anomalies import StreamAnomalies
+from pipeline_anomaly.infrastructure.aggregations.clickhouse_pushdown import ClickHouseAggregateEngine
+from pipeline_anomaly.infrastructure.aggregations.fused import FusedAggregateEngine
+from pipeline_anomaly.infrastructure.alerting.dispatcher import AlertDispatcher, build_alert_sink
+from pipeline_anomaly.infrastructure.alerting.webhook_sink import WebhookStub
 from pipeline_anomaly.infrastructure.clients.clickhouse import ClickHouseFactory
 from pipeline_anomaly.infrastructure.config import PipelineConfig
 from pipeline_anomaly.infrastructure.detectors.dbscan import DBSCANDetector
+from pipeline_anomaly.infrastructure.detectors.executors import build_executor
 from pipeline_anomaly.infrastructure.detectors.isolation_forest import IsolationForestDetector
+from pipeline_anomaly.infrastructure.detectors.median_absolute_deviation import MedianAbsoluteDeviationDetector
+from pipeline_anomaly.infrastructure.detectors.model_store import ForestModelStore
 from pipeline_anomaly.infrastructure.detectors.rolling_mad import RollingMADDetector
+from pipeline_anomaly.infrastructure.detectors.statistics import ColumnStatisticsContext
 from pipeline_anomaly.infrastructure.detectors.zscore import ZScoreDetector
 from pipeline_anomaly.infrastructure.generators.synthetic_generator import SyntheticDatasetGenerator
 from pipeline_anomaly.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+from pipeline_anomaly.infrastructure.repositories.window_cache import WindowedFrameCache
+from pipeline_anomaly.infrastructure.streaming.online_detectors import OnlineRobustDetector, OnlineZScoreDetector
+from pipeline_anomaly.infrastructure.streaming.sources import ClickHouseTailSource, SocketEventSource
 
 app = typer.Typer()
 
 
-@app.command()
-def run(config: Path = typer.Option(..., exists=True, readable=True)) -> None:
-    cfg = PipelineConfig.load(config)
-
-    factory = ClickHouseFactory(
+def _clickhouse_factory(cfg: PipelineConfig) -> ClickHouseFactory:
+    return ClickHouseFactory(
         host=cfg.clickhouse.host,
         port=cfg.clickhouse.port,
         username=cfg.clickhouse.username,
         password=cfg.clickhouse.password,
         database=cfg.clickhouse.database,
+        pool_size=cfg.clickhouse.pool_size,
+        pool_idle_timeout=cfg.clickhouse.pool_idle_timeout,
+        pool_health_check_interval=cfg.clickhouse.pool_health_check_interval,
+        compression=cfg.clickhouse.compression,
+        insert_batch_rows=cfg.clickhouse.insert_batch_rows,
+        async_insert=cfg.clickhouse.async_insert,
+        wait_for_async_insert=cfg.clickhouse.wait_for_async_insert,
+    )
+
+
+def _alert_dispatcher(cfg: PipelineConfig, base: Path) -> AlertDispatcher:
+    sink = build_alert_sink(
+        cfg.alerting.sink,
+        path=base / cfg.alerting.path if cfg.alerting.path else None,
+        url=cfg.alerting.url,
+        timeout=cfg.alerting.timeout_seconds,
+    )
+    return AlertDispatcher(
+        sink,
+        queue_size=cfg.alerting.queue_size,
+        batch_window=cfg.alerting.batch_window_seconds,
+        max_batch=cfg.alerting.max_batch,
+        dedup_window=cfg.alerting.dedup_window_seconds,
+        retries=cfg.alerting.retries,
     )
+
+
+@app.command()
+def run(config: Path = typer.Option(..., exists=True, readable=True)) -> None:
+    cfg = PipelineConfig.load(config)
+
+    factory = _clickhouse_factory(cfg)
     repository = ClickHouseRepository(factory=factory)
 
     generator = SyntheticDatasetGenerator(config=cfg.dataset)
-    loader = LoadSyntheticDataset(generator=generator, writer=repository)
-    aggregator = ComputeAggregates(writer=repository, config=cfg.aggregation)
+    loader = LoadSyntheticDataset(
+        generator=generator,
+        writer=repository,
+        streaming=cfg.ingest.streaming,
+        max_in_flight=cfg.ingest.max_in_flight,
+        queue_size=cfg.ingest.queue_size,
+    )
+    reader = (
+        WindowedFrameCache(
+            repository=repository,
+            incremental=cfg.window_cache.incremental,
+            min_window_minutes=max(cfg.aggregation.window_minutes, cfg.anomaly_detection.window_minutes),
+        )
+        if cfg.window_cache.enabled
+        else repository
+    )
+    pushdown = (
+        ClickHouseAggregateEngine(reader=repository, quantile_method=cfg.aggregation.quantile_method)
+        if cfg.aggregation.engine == "clickhouse"
+        else None
+    )
+    fused = FusedAggregateEngine() if cfg.aggregation.local_engine == "fused" else None
+    aggregator = ComputeAggregates(writer=reader, config=cfg.aggregation, pushdown=pushdown, fused=fused)
 
+    forest_cfg = cfg.anomaly_detection.isolation_forest
+    statistics = ColumnStatisticsContext(column="value")
     detectors = [
-        ZScoreDetector(threshold=cfg.anomaly_detection.zscore_threshold),
-        MedianAbsoluteDeviationDetector(threshold=cfg.anomaly_detection.mad_threshold),
+        ZScoreDetector(
+            threshold=cfg.anomaly_detection.zscore_threshold,
+            statistics=statistics,
+            per_entity=cfg.anomaly_detection.per_entity,
+            min_entity_events=cfg.anomaly_detection.min_entity_events,
+        ),
+        MedianAbsoluteDeviationDetector(
+            threshold=cfg.anomaly_detection.mad_threshold,
+            statistics=statistics,
+            per_entity=cfg.anomaly_detection.per_entity,
+            min_entity_events=cfg.anomaly_detection.min_entity_events,
+        ),
         IsolationForestDetector(
-            contamination=cfg.anomaly_detection.isolation_forest.contamination,
-            random_state=cfg.anomaly_detection.isolation_forest.random_state,
+            contamination=forest_cfg.contamination,
+            random_state=forest_cfg.random_state,
+            n_estimators=forest_cfg.n_estimators,
+            store=ForestModelStore(config.parent / forest_cfg.model_dir) if forest_cfg.model_dir else None,
+            refit_interval_seconds=(
+                forest_cfg.refit_interval_minutes * 60 if forest_cfg.refit_interval_minutes is not None else None
+            ),
+            drift_threshold=forest_cfg.drift_threshold,
+            n_jobs=forest_cfg.n_jobs,
+            chunk_size=forest_cfg.chunk_size,
         ),
         DBSCANDetector(
             eps=cfg.anomaly_detection.dbscan.eps,
             min_samples=cfg.anomaly_detection.dbscan.min_samples,
+            mode=cfg.anomaly_detection.dbscan.mode,
+            algorithm=cfg.anomaly_detection.dbscan.algorithm,
+            n_jobs=cfg.anomaly_detection.dbscan.n_jobs,
+            memory_limit_mb=cfg.anomaly_detection.dbscan.memory_limit_mb,
+            max_samples=cfg.anomaly_detection.dbscan.max_samples,
         ),
         RollingMADDetector(
             window=cfg.anomaly_detection.rolling_mad.window,
             threshold=cfg.anomaly_detection.rolling_mad.threshold,
             min_periods=cfg.anomaly_detection.rolling_mad.min_periods,
+            streaming=cfg.anomaly_detection.rolling_mad.streaming,
+            state_path=(
+                config.parent / cfg.anomaly_detection.rolling_mad.state_path
+                if cfg.anomaly_detection.rolling_mad.state_path
+                else None
+            ),
+            per_entity=cfg.anomaly_detection.per_entity,
+            statistics=statistics,
+            n_jobs=cfg.anomaly_detection.rolling_mad.n_jobs,
         ),
     ]
     ensemble = (
@@ -65,13 +162,22 @@ def run(config: Path = typer.Option(..., exists=True, readable=True)) -> None:
         else None
     )
     detector = DetectAnomalies(
-        writer=repository,
+        writer=reader,
         detectors=detectors,
         threshold=cfg.alerting.threshold_score,
         ensemble=ensemble,
+        window_minutes=cfg.anomaly_detection.window_minutes,
+        executor=build_executor(
+            cfg.anomaly_detection.executor,
+            max_workers=cfg.anomaly_detection.max_workers,
+            timeout=cfg.anomaly_detection.timeout_seconds,
+            timeouts=cfg.anomaly_detection.detector_timeouts,
+            top_k=cfg.anomaly_detection.top_k_entities,
+        ),
+        top_k_entities=cfg.anomaly_detection.top_k_entities,
     )
 
-    sink = StdOutAlertSink()
+    sink = _alert_dispatcher(cfg, config.parent)
     pipeline = RunPipeline(
         loader=loader,
         aggregator=aggregator,
@@ -79,7 +185,88 @@ def run(config: Path = typer.Option(..., exists=True, readable=True)) -> None:
         alert_sink=sink,
         alerts_enabled=cfg.alerting.enabled,
     )
-    pipeline.execute()
+    try:
+        pipeline.execute()
+    finally:
+        logger.info("clickhouse pool stats: {}", factory.pool_metrics.as_dict())
+        if isinstance(reader, WindowedFrameCache):
+            logger.info("window cache stats: {}", reader.stats.as_dict())
+        sink.close()
+        logger.info("alert dispatch stats: {}", sink.metrics.as_dict())
+        factory.close()
+
+
+@app.command()
+def stream(config: Path = typer.Option(..., exists=True, readable=True)) -> None:
+    """Long-running detection: tails new events and alerts within seconds."""
+
+    cfg = PipelineConfig.load(config)
+    stream_cfg = cfg.streaming
+    factory = _clickhouse_factory(cfg)
+    repository = ClickHouseRepository(factory=factory)
+    source = (
+        SocketEventSource(
+            host=stream_cfg.host,
+            port=stream_cfg.port,
+            max_batch=stream_cfg.max_batch,
+            flush_interval=stream_cfg.flush_interval_seconds,
+        )
+        if stream_cfg.source == "socket"
+        else ClickHouseTailSource(
+            repository=repository,
+            poll_interval=stream_cfg.poll_interval_seconds,
+            lag_seconds=stream_cfg.lag_seconds,
+            lookback_minutes=stream_cfg.lookback_minutes,
+        )
+    )
+    detectors = [
+        OnlineZScoreDetector(threshold=cfg.anomaly_detection.zscore_threshold, window=stream_cfg.zscore_window),
+        OnlineRobustDetector(name="mad", threshold=cfg.anomaly_detection.mad_threshold, window=stream_cfg.mad_window),
+        OnlineRobustDetector(
+            name="rolling_mad",
+            threshold=cfg.anomaly_detection.rolling_mad.threshold,
+            window=cfg.anomaly_detection.rolling_mad.window,
+            min_periods=cfg.anomaly_detection.rolling_mad.min_periods,
+        ),
+    ]
+    sink = _alert_dispatcher(cfg, config.parent)
+    service = StreamAnomalies(
+        source=source,
+        detectors=detectors,
+        alert_sink=sink,
+        writer=repository,
+        min_agreement=stream_cfg.min_agreement,
+        top_k_entities=cfg.anomaly_detection.top_k_entities,
+        state_path=config.parent / stream_cfg.state_path if stream_cfg.state_path else None,
+        checkpoint_interval=stream_cfg.checkpoint_interval_seconds,
+    )
+
+    async def _serve() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        await service.run(stop)
+
+    try:
+        asyncio.run(_serve())
+    finally:
+        logger.info("streaming detection stopped: {} events, {} alerts", service.events_seen, service.alerts_sent)
+        sink.close()
+        logger.info("alert dispatch stats: {}", sink.metrics.as_dict())
+        factory.close()
+
+
+@app.command("webhook-stub")
+def webhook_stub(host: str = "127.0.0.1", port: int = 8765) -> None:
+    """Local webhook receiver that logs the alerts it gets."""
+
+    stub = WebhookStub(host=host, port=port)
+    logger.info("webhook stub listening on {}", stub.url)
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
 
 
 if __name__ == "__main__":
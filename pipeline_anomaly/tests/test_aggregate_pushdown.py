@@ -0,0 +1,60 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+import pandas as pd
+
+from pipeline_anomaly.application.use_cases.compute_aggregates import ComputeAggregates
+from pipeline_anomaly.infrastructure.aggregations.clickhouse_pushdown import ClickHouseAggregateEngine
+from pipeline_anomaly.infrastructure.config import AggregationConfig, AggregationMetricConfig
+
+METRICS = (
+    AggregationMetricConfig(name="count", type="count"),
+    AggregationMetricConfig(name="mean_value", type="mean", column="value"),
+    AggregationMetricConfig(name="p95_value", type="quantile", column="value", q=0.95),
+    AggregationMetricConfig(name="iqr_value", type="iqr", column="value"),
+    AggregationMetricConfig(name="ewma_trend", type="ewma_trend", column="value", span=3),
+)
+
+
+def test_pushdown_compiles_single_query_with_shared_quantiles():
+    engine = ClickHouseAggregateEngine(reader=Mock())
+
+    compiled = engine.compile(METRICS[:4])
+
+    assert compiled.expressions == (
+        "count()",
+        "min(event_time)",
+        "max(event_time)",
+        "avg(value)",
+        "quantilesExactInclusive(0.25, 0.75, 0.95)(value)",
+    )
+
+
+def test_compute_aggregates_pushes_down_sql_metrics_and_falls_back_for_ewma():
+    window_start, window_end = datetime(2024, 1, 1), datetime(2024, 1, 1, 4)
+    reader = Mock()
+    reader.query_window_scalars.return_value = (5, window_start, window_end, 4.2, [2.0, 5.0, 9.0])
+    writer = Mock()
+    writer.read_latest_window.return_value = pd.DataFrame(
+        {
+            "event_time": pd.date_range(window_start, periods=5, freq="h"),
+            "value": [1.0, 2.0, 3.0, 10.0, 5.0],
+        }
+    )
+
+    aggregator = ComputeAggregates(
+        writer=writer,
+        config=AggregationConfig(window_minutes=120, metrics=METRICS),
+        pushdown=ClickHouseAggregateEngine(reader=reader),
+    )
+    collection = aggregator.execute()
+
+    values = {aggregate.metric: aggregate for aggregate in collection.aggregates}
+    assert [aggregate.metric for aggregate in collection.aggregates] == [cfg.name for cfg in METRICS]
+    assert values["count"].value == 5.0
+    assert values["p95_value"].value == 9.0
+    assert values["iqr_value"].value == 3.0
+    assert values["iqr_value"].extra == {"q75": 5.0, "q25": 2.0}
+    assert values["ewma_trend"].extra["span"] == 3.0
+    reader.query_window_scalars.assert_called_once()
+    writer.read_latest_window.assert_called_once_with(minutes=120)
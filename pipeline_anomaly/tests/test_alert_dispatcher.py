@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from pipeline_anomaly.domain.models.anomaly import Anomaly, AnomalyReport
+from pipeline_anomaly.infrastructure.alerting.dispatcher import AlertDispatcher
+from pipeline_anomaly.infrastructure.alerting.webhook_sink import WebhookAlertSink, WebhookStub
+
+START = datetime(2024, 1, 1)
+
+
+def _report(detector: str, severity: float = 0.9, window: int = 0) -> AnomalyReport:
+    window_start = START + timedelta(hours=window)
+    return AnomalyReport(
+        generated_at=START,
+        window_start=window_start,
+        window_end=window_start + timedelta(hours=1),
+        anomalies=(Anomaly(detector=detector, score=severity, severity=severity, description="test"),),
+    )
+
+
+class RecordingSink:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.batches: list[list[AnomalyReport]] = []
+        self.delay = delay
+        self.release = threading.Event()
+
+    def send(self, report: AnomalyReport) -> None:
+        self.send_many([report])
+
+    def send_many(self, reports) -> None:
+        if self.delay:
+            self.release.wait(self.delay)
+        self.batches.append(list(reports))
+
+
+def test_dispatcher_coalesces_windows_and_suppresses_duplicates():
+    sink = RecordingSink()
+    dispatcher = AlertDispatcher(sink, batch_window=0.2)
+
+    dispatcher.send(_report("zscore"))
+    dispatcher.send(_report("mad"))
+    dispatcher.send(_report("zscore", window=1))
+    _wait_for(lambda: dispatcher.metrics.batches == 1)
+    # the same detector and window again, within the dedup window
+    dispatcher.send(_report("zscore", severity=0.95))
+    dispatcher.close()
+
+    assert len(sink.batches) == 1
+    merged = {report.window_start: {a.detector for a in report.anomalies} for report in sink.batches[0]}
+    assert merged == {START: {"zscore", "mad"}, START + timedelta(hours=1): {"zscore"}}
+    assert dispatcher.metrics.coalesced == 1
+    assert dispatcher.metrics.suppressed == 1
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_slow_sink_does_not_block_senders():
+    sink = RecordingSink(delay=5.0)
+    dispatcher = AlertDispatcher(sink, queue_size=2, batch_window=0.0, max_batch=1)
+
+    started = time.perf_counter()
+    for window in range(10):
+        dispatcher.send(_report("zscore", window=window))
+    elapsed = time.perf_counter() - started
+    sink.release.set()
+    dispatcher.close()
+
+    metrics = dispatcher.metrics
+    assert elapsed < 0.5
+    assert metrics.dropped > 0
+    assert metrics.enqueued + metrics.dropped == 10
+    assert metrics.delivered == metrics.enqueued
+
+
+def test_close_gives_up_on_a_stuck_sink_and_counts_the_abandoned_reports():
+    sink = RecordingSink(delay=5.0)
+    dispatcher = AlertDispatcher(sink, queue_size=2, batch_window=0.0, max_batch=1)
+    dispatcher.send(_report("zscore", window=0))
+    _wait_for(lambda: dispatcher.metrics.queue_depth == 0)
+    for window in range(1, 3):
+        dispatcher.send(_report("zscore", window=window))
+
+    started = time.perf_counter()
+    dispatcher.close(timeout=0.2)
+    elapsed = time.perf_counter() - started
+    sink.release.set()
+
+    metrics = dispatcher.metrics
+    assert elapsed < 1.0
+    assert metrics.abandoned == 2
+    assert metrics.queue_depth == 0
+
+
+def test_webhook_sink_posts_batches_to_stub():
+    stub = WebhookStub().start()
+    try:
+        dispatcher = AlertDispatcher(WebhookAlertSink(stub.url), batch_window=0.2)
+        dispatcher.send(_report("zscore"))
+        dispatcher.send(_report("mad", window=2))
+        dispatcher.close()
+    finally:
+        stub.stop()
+
+    assert len(stub.received) == 1
+    assert [alert["anomalies"][0]["detector"] for alert in stub.received[0]["alerts"]] == ["zscore", "mad"]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pytest
+
+from pipeline_anomaly.infrastructure.clients.pool import ClientPool
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.healthy = True
+        self.closed = False
+
+    def ping(self) -> bool:
+        return self.healthy
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_pool_reuses_released_clients() -> None:
+    pool = ClientPool(create=FakeClient, max_size=2)
+
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+
+    assert first is second
+    metrics = pool.metrics
+    assert (metrics.created, metrics.reused, metrics.misses) == (1, 1, 1)
+
+
+def test_pool_evicts_idle_and_unhealthy_clients() -> None:
+    clock = FakeClock()
+    pool = ClientPool(create=FakeClient, max_size=2, idle_timeout=60.0, health_check_interval=10.0, clock=clock)
+
+    with pool.lease() as stale:
+        pass
+    clock.now = 120.0
+    with pool.lease() as fresh:
+        pass
+    assert stale.closed and fresh is not stale
+
+    fresh.healthy = False
+    clock.now = 135.0
+    with pool.lease() as replacement:
+        pass
+    assert fresh.closed and replacement is not fresh
+
+    metrics = pool.metrics
+    assert metrics.evicted_idle == 1
+    assert metrics.evicted_unhealthy == 1
+
+
+def test_pool_respects_size_limit() -> None:
+    pool = ClientPool(create=FakeClient, max_size=1, acquire_timeout=0.01)
+
+    client = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    pool.release(client)
+
+    assert pool.acquire() is client
+
+
+def test_pool_discards_client_after_failure() -> None:
+    pool = ClientPool(create=FakeClient, max_size=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.lease() as client:
+            raise RuntimeError("boom")
+
+    assert client.closed
+    assert pool.metrics.discarded == 1
+    with pool.lease() as other:
+        assert other is not client
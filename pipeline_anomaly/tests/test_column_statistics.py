@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline_anomaly.infrastructure.detectors.median_absolute_deviation import (
+    MedianAbsoluteDeviationDetector,
+)
+from pipeline_anomaly.infrastructure.detectors.statistics import ColumnStatisticsContext, column_statistics
+from pipeline_anomaly.infrastructure.detectors.zscore import ZScoreDetector
+
+
+@pytest.mark.parametrize("rows", [3, 4, 1001, 1000])
+def test_column_statistics_match_pandas(rows):
+    values = np.random.default_rng(rows).normal(100.0, 15.0, size=rows)
+    values[::7] = np.nan
+    series = pd.Series(values)
+
+    stats = column_statistics(values)
+
+    assert stats.count == series.count()
+    assert stats.mean == pytest.approx(series.mean())
+    assert stats.median == pytest.approx(series.median())
+    assert stats.mad == pytest.approx((series - series.median()).abs().median())
+    if rows > 2:
+        assert stats.std == pytest.approx(series.std())
+
+
+def test_statistics_are_computed_once_per_window():
+    values = np.random.default_rng(0).normal(100.0, 15.0, size=5000)
+    values[10] = 500.0
+    dataframe = pd.DataFrame({"value": values})
+    context = ColumnStatisticsContext()
+
+    zscore = ZScoreDetector(threshold=3.0, statistics=context).fit_predict(dataframe)
+    mad = MedianAbsoluteDeviationDetector(threshold=3.5, statistics=context).fit_predict(dataframe)
+
+    assert context.computed == 1
+    assert zscore.loc[10] == 1 and mad.loc[10] == 1
+    expected = ((dataframe["value"] - dataframe["value"].mean()).abs() / dataframe["value"].std() > 3.0).astype(int)
+    assert zscore.tolist() == expected.tolist()
+
+    ZScoreDetector(threshold=3.0, statistics=context).fit_predict(dataframe.copy())
+    assert context.computed == 2
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline_anomaly.domain.models.aggregate import Aggregate, AggregateCollection
+from pipeline_anomaly.domain.models.anomaly import Anomaly, AnomalyReport, EntityAnomaly
+from pipeline_anomaly.infrastructure.clients.columnar import ColumnarWriter
+from pipeline_anomaly.infrastructure.repositories.clickhouse_repository import ClickHouseRepository
+
+
+class RecordingClient:
+    def __init__(self) -> None:
+        self.inserts: list[dict[str, Any]] = []
+
+    def insert(self, table, data, column_names, column_oriented=False, settings=None):  # noqa: ANN001
+        self.inserts.append(
+            {
+                "table": table,
+                "data": data,
+                "columns": list(column_names),
+                "oriented": column_oriented,
+                "settings": settings,
+            }
+        )
+
+
+class RecordingFactory:
+    def __init__(self) -> None:
+        self.client = RecordingClient()
+        self.connects = 0
+
+    @contextmanager
+    def connect(self) -> Iterator[RecordingClient]:
+        self.connects += 1
+        yield self.client
+
+    def writer(self) -> ColumnarWriter:
+        return ColumnarWriter(self)
+
+
+def test_writer_splits_columns_into_batches_on_one_client() -> None:
+    factory = RecordingFactory()
+    writer = ColumnarWriter(factory, batch_rows=4, async_insert=True, wait_for_async_insert=False)
+    frame = pd.DataFrame(
+        {
+            "event_time": pd.date_range("2024-01-01", periods=10, freq="s"),
+            "entity_id": np.arange(10, dtype=np.uint64),
+            "score": np.linspace(0.0, 1.0, 10),
+        }
+    )
+
+    assert writer.write_frame("predictions", frame) == 10
+
+    inserts = factory.client.inserts
+    assert factory.connects == 1
+    assert [len(item["data"][0]) for item in inserts] == [4, 4, 2]
+    assert all(item["oriented"] and item["columns"] == ["event_time", "entity_id", "score"] for item in inserts)
+    assert inserts[0]["settings"] == {"async_insert": 1, "wait_for_async_insert": 0}
+    # datetimes go over as epoch seconds, numpy scalars as plain Python values
+    assert inserts[0]["data"][0][0] == int(pd.Timestamp("2024-01-01").timestamp())
+    assert type(inserts[2]["data"][1][0]) is int
+    assert writer.metrics.as_dict() == {"inserts": 3, "rows": 10}
+
+
+def test_writer_rejects_ragged_columns_and_skips_empty_writes() -> None:
+    factory = RecordingFactory()
+    writer = ColumnarWriter(factory)
+
+    with pytest.raises(ValueError):
+        writer.write("t", {"a": [1, 2], "b": [1]})
+    assert writer.write("t", {"a": [], "b": []}) == 0
+    assert factory.connects == 0
+
+
+def test_repository_writes_reports_and_aggregates_column_wise() -> None:
+    factory = RecordingFactory()
+    repository = ClickHouseRepository(factory)  # type: ignore[arg-type]
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 2)
+    report = AnomalyReport(
+        generated_at=end,
+        window_start=start,
+        window_end=end,
+        anomalies=(
+            Anomaly(detector="zscore", score=4.0, severity=0.1, description="z"),
+            Anomaly(detector="mad", score=5.0, severity=0.2, description="m"),
+        ),
+        top_entities=(EntityAnomaly(entity_id=7, flagged=3, events=10, detectors=("zscore",)),),
+    )
+
+    repository.persist_report(report)
+    repository.persist_aggregates(
+        AggregateCollection(aggregates=(Aggregate("p90", 1.5, start, end, extra={"q": 0.9}),))
+    )
+
+    reports, entities, aggregates = factory.client.inserts
+    assert reports["table"] == "anomaly_reports"
+    assert dict(zip(reports["columns"], reports["data"]))["detector"] == ["zscore", "mad"]
+    assert dict(zip(entities["columns"], entities["data"]))["rank"] == [1]
+    assert dict(zip(aggregates["columns"], aggregates["data"]))["extra"] == [{"q": 0.9}]
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline_anomaly.infrastructure.detectors.dbscan import DBSCANDetector
+
+
+def _window(rows: int = 3000, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    values = rng.normal(100.0, 5.0, size=rows)
+    values[rng.choice(rows, size=20, replace=False)] *= 3
+    return pd.DataFrame({"value": values, "attribute": rng.uniform(0, 1, size=rows)})
+
+
+@pytest.mark.parametrize(("eps", "min_samples"), [(0.5, 5), (1.0, 15), (2.0, 40)])
+def test_grid_mode_matches_exact_noise(eps, min_samples):
+    dataframe = _window()
+
+    exact = DBSCANDetector(eps, min_samples, mode="exact").fit_predict(dataframe)
+    grid = DBSCANDetector(eps, min_samples, mode="grid", n_jobs=2, chunk_size=500).fit_predict(dataframe)
+
+    assert grid.tolist() == exact.tolist()
+
+
+def test_subsample_mode_flags_outliers():
+    dataframe = _window()
+    outliers = dataframe["value"] > 200
+
+    scores = DBSCANDetector(1.0, 15, mode="subsample", max_samples=1000).fit_predict(dataframe)
+
+    assert scores[outliers].all()
+    assert scores.mean() < 0.05
+
+
+def test_auto_mode_falls_back_under_memory_limit():
+    features = _window()[["value", "attribute"]]
+
+    assert DBSCANDetector(1.0, 15, mode="auto", memory_limit_mb=0.001)._resolve_mode(features) == "subsample"
+    assert DBSCANDetector(1.0, 15, mode="auto", memory_limit_mb=512)._resolve_mode(features) == "exact"
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline_anomaly.infrastructure.detectors.executors import (
+    ProcessDetectorExecutor,
+    SequentialDetectorExecutor,
+    ThreadDetectorExecutor,
+)
+from pipeline_anomaly.infrastructure.detectors.median_absolute_deviation import MedianAbsoluteDeviationDetector
+from pipeline_anomaly.infrastructure.detectors.zscore import ZScoreDetector
+
+
+class SlowDetector:
+    name = "slow"
+
+    def fit_predict(self, dataframe: pd.DataFrame) -> pd.Series:
+        time.sleep(1.0)
+        return pd.Series(0, index=dataframe.index)
+
+    def severity(self, scores: pd.Series) -> float:
+        return 0.0
+
+
+class SlowStatefulDetector(SlowDetector):
+    name = "slow_stateful"
+    persists_state = True
+
+    def __init__(self, state_path: Path) -> None:
+        self.state_path = state_path
+
+    def fit_predict(self, dataframe: pd.DataFrame) -> pd.Series:
+        scores = super().fit_predict(dataframe)
+        self.state_path.write_text("written after the budget")
+        return scores
+
+
+def _window() -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    values = rng.normal(100.0, 5.0, size=500)
+    values[::50] = 400.0
+    return pd.DataFrame(
+        {
+            "event_time": pd.date_range("2024-01-01", periods=500, freq="s"),
+            "value": values,
+            "attribute": rng.uniform(0, 1, size=500),
+        }
+    )
+
+
+@pytest.mark.parametrize("executor", [ThreadDetectorExecutor(), ProcessDetectorExecutor(max_workers=2)])
+def test_parallel_executors_match_sequential_order_and_scores(executor) -> None:
+    detectors = [ZScoreDetector(threshold=3.0), MedianAbsoluteDeviationDetector(threshold=3.5)]
+    dataframe = _window()
+
+    expected = SequentialDetectorExecutor().run(detectors, dataframe)
+    runs = executor.run(detectors, dataframe)
+
+    assert [run.detector for run in runs] == ["zscore", "mad"]
+    assert [run.severity for run in runs] == [run.severity for run in expected]
+    assert all(run.duration_ms >= 0 for run in runs)
+
+
+def test_thread_executor_enforces_per_detector_timeout() -> None:
+    executor = ThreadDetectorExecutor(timeouts={"slow": 0.05})
+
+    started = time.monotonic()
+    runs = executor.run([SlowDetector(), ZScoreDetector(threshold=3.0)], _window())
+
+    assert time.monotonic() - started < 0.9
+    assert runs[0].timed_out and runs[0].severity == 0.0
+    assert not runs[1].timed_out
+
+
+def test_thread_executor_kills_timed_out_stateful_detectors_before_they_save(tmp_path) -> None:
+    state_path = tmp_path / "state.json"
+    executor = ThreadDetectorExecutor(timeouts={"slow_stateful": 0.2})
+
+    runs = executor.run([ZScoreDetector(threshold=3.0), SlowStatefulDetector(state_path)], _window())
+
+    assert [run.detector for run in runs] == ["zscore", "slow_stateful"]
+    assert runs[1].timed_out and not runs[0].timed_out
+    time.sleep(1.5)
+    assert not state_path.exists()
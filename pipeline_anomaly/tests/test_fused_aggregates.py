@@ -0,0 +1,38 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from pipeline_anomaly.application.use_cases.compute_aggregates import ComputeAggregates
+from pipeline_anomaly.infrastructure.aggregations.fused import FusedAggregateEngine
+from pipeline_anomaly.infrastructure.config import AggregationMetricConfig
+
+METRICS = (
+    AggregationMetricConfig(name="count", type="count"),
+    AggregationMetricConfig(name="mean_value", type="mean", column="value"),
+    AggregationMetricConfig(name="std_value", type="std", column="value"),
+    AggregationMetricConfig(name="median_value", type="median", column="value"),
+    AggregationMetricConfig(name="min_value", type="min", column="value"),
+    AggregationMetricConfig(name="max_value", type="max", column="value"),
+    AggregationMetricConfig(name="p95_value", type="quantile", column="value", q=0.95),
+    AggregationMetricConfig(name="p07_value", type="quantile", column="value", q=0.07),
+    AggregationMetricConfig(name="iqr_value", type="iqr", column="value"),
+    AggregationMetricConfig(name="ewma_trend", type="ewma_trend", column="value", span=5),
+)
+
+
+def test_fused_engine_matches_per_metric_path():
+    rng = np.random.default_rng(0)
+    values = rng.normal(100.0, 15.0, size=1001)
+    values[10] = np.nan
+    dataframe = pd.DataFrame({"event_time": pd.date_range("2024-01-01", periods=1001, freq="s"), "value": values})
+    start, end = dataframe["event_time"].min(), dataframe["event_time"].max()
+    reference = ComputeAggregates(writer=None, config=None)
+
+    fused = FusedAggregateEngine().compute(METRICS, dataframe, start, end)
+
+    for cfg, aggregate in zip(METRICS, fused):
+        expected = reference._materialize(cfg, dataframe, start, end)
+        assert aggregate.metric == expected.metric
+        assert math.isclose(aggregate.value, expected.value, rel_tol=1e-9, abs_tol=1e-9)
+        assert (aggregate.extra or {}).keys() == (expected.extra or {}).keys()
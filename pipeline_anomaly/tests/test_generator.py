@@ -1,3 +1,7 @@
+from datetime import datetime
+
+import pandas as pd
+
 from pipeline_anomaly.infrastructure.generators.synthetic_generator import (
     SyntheticDatasetConfig,
     SyntheticDatasetGenerator,
@@ -9,3 +13,19 @@ def test_batches_shape():
     generator = SyntheticDatasetGenerator(config)
     batches = generator.batches()
     assert sum(batch.size for batch in batches) == 1000
+
+
+def test_vectorized_batches_are_reproducible_across_workers():
+    start = datetime(2024, 1, 1)
+    frames = []
+    for workers in (1, 2):
+        config = SyntheticDatasetConfig(
+            row_count=1000, batch_size=300, anomaly_ratio=0.01, seed=42, vectorized=True, workers=workers
+        )
+        batches = SyntheticDatasetGenerator(config, start_time=start).batches()
+        frames.append(pd.concat([batch.dataframe for batch in batches], ignore_index=True))
+
+    assert frames[0]["event_time"].dtype == "datetime64[ns]"
+    assert len(frames[0]) == 1000
+    assert frames[0]["event_time"].iloc[0] == pd.Timestamp(start)
+    pd.testing.assert_frame_equal(frames[0], frames[1])
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from pipeline_anomaly.infrastructure.detectors.isolation_forest import IsolationForestDetector
+from pipeline_anomaly.infrastructure.detectors.model_store import ForestModelStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _window(rows: int = 2000, shift: float = 0.0, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {"value": rng.normal(100.0 + shift, 5.0, size=rows), "attribute": rng.uniform(0, 1, size=rows)}
+    )
+
+
+def _detector(store: ForestModelStore, clock: FakeClock, **kwargs) -> IsolationForestDetector:
+    return IsolationForestDetector(
+        contamination=0.01, random_state=42, n_estimators=20, store=store, clock=clock, **kwargs
+    )
+
+
+def test_forest_is_fitted_once_and_reused_across_instances(tmp_path):
+    store = ForestModelStore(tmp_path)
+    clock = FakeClock()
+
+    first = _detector(store, clock, n_jobs=2, chunk_size=300)
+    scores = first.fit_predict(_window())
+    second = _detector(store, clock)
+    second.fit_predict(_window(seed=4))
+
+    assert first.metadata.version == 1
+    assert second.metadata.version == 1
+    assert 0 < scores.sum() <= 40
+    assert (tmp_path / "isolation_forest.json").exists()
+
+
+def test_forest_with_another_random_state_is_refitted(tmp_path):
+    store = ForestModelStore(tmp_path)
+    clock = FakeClock()
+    _detector(store, clock).fit_predict(_window())
+
+    other = IsolationForestDetector(contamination=0.01, random_state=7, n_estimators=20, store=store, clock=clock)
+    other.fit_predict(_window())
+
+    assert other.metadata.version == 2
+    assert store.metadata().random_state == 7
+
+
+def test_forest_refits_on_schedule_and_on_drift(tmp_path):
+    store = ForestModelStore(tmp_path)
+    clock = FakeClock()
+    detector = _detector(store, clock, refit_interval_seconds=600, drift_threshold=0.25)
+
+    detector.fit_predict(_window())
+    clock.now += 60
+    detector.fit_predict(_window(seed=5))
+    assert detector.metadata.version == 1
+    assert detector.last_drift < 0.25
+
+    clock.now += 600
+    detector.fit_predict(_window(seed=6))
+    assert detector.metadata.version == 2
+
+    detector.fit_predict(_window(shift=10.0, seed=7))
+    assert detector.metadata.version == 3
+    assert store.metadata().version == 3
+    assert sorted(path.name for path in tmp_path.glob("*.joblib")) == [
+        "isolation_forest-v2.joblib",
+        "isolation_forest-v3.joblib",
+    ]
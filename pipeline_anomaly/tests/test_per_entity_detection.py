@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline_anomaly.application.use_cases.detect_anomalies import DetectAnomalies
+from pipeline_anomaly.infrastructure.detectors.median_absolute_deviation import MedianAbsoluteDeviationDetector
+from pipeline_anomaly.infrastructure.detectors.rolling_mad import RollingMADDetector
+from pipeline_anomaly.infrastructure.detectors.statistics import ColumnStatisticsContext
+from pipeline_anomaly.infrastructure.detectors.zscore import ZScoreDetector
+
+
+def _window(rows: int = 3000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    entity_ids = rng.integers(1, 30, size=rows)
+    # every entity has its own baseline, far apart from the others
+    values = rng.normal(100.0, 5.0, size=rows) + entity_ids * 50.0
+    values[np.flatnonzero(entity_ids == 7)[::10]] += 60.0
+    return pd.DataFrame(
+        {
+            "event_time": pd.date_range("2024-01-01", periods=rows, freq="s"),
+            "entity_id": entity_ids.astype(np.uint64),
+            "value": values,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "build",
+    [
+        lambda per_entity: ZScoreDetector(3.0, per_entity=per_entity, min_entity_events=1),
+        lambda per_entity: MedianAbsoluteDeviationDetector(3.5, per_entity=per_entity, min_entity_events=1),
+        lambda per_entity: RollingMADDetector(
+            20, 4.0, min_periods=10, per_entity=per_entity, n_jobs=2, chunk_size=500
+        ),
+    ],
+)
+def test_per_entity_mode_matches_scoring_each_entity_alone(build):
+    dataframe = _window()
+
+    grouped = build(True).fit_predict(dataframe)
+    expected = pd.concat(
+        [build(False).fit_predict(group) for _, group in dataframe.groupby("entity_id")]
+    ).sort_index()
+
+    assert grouped.tolist() == expected.tolist()
+    assert grouped.sum() > 0
+
+
+def test_report_ranks_top_entities_across_detectors():
+    dataframe = _window()
+    writer = Mock()
+    writer.read_latest_window.return_value = dataframe
+    context = ColumnStatisticsContext()
+    use_case = DetectAnomalies(
+        writer=writer,
+        detectors=[
+            ZScoreDetector(3.0, statistics=context, per_entity=True),
+            MedianAbsoluteDeviationDetector(3.5, statistics=context, per_entity=True),
+        ],
+        threshold=0.5,
+        top_k_entities=3,
+    )
+
+    report = use_case.execute()
+
+    assert len(report.top_entities) <= 3
+    top = report.top_entities[0]
+    assert top.entity_id == 7
+    assert top.detectors == ("zscore", "mad")
+    assert top.flagged >= 2 * 5
+    writer.persist_report.assert_called_once_with(report)
@@ -16,3 +16,23 @@ def test_rolling_mad_flags_single_spike() -> None:
 
     assert result.loc[50] == 1
     assert result.sum() == 1
+
+
+def test_streaming_rolling_mad_scores_only_new_events(tmp_path) -> None:
+    timestamps = pd.date_range("2024-01-01", periods=200, freq="s")
+    values = [100.0 + (idx % 5) for idx in range(200)]
+    values[150] = 1000.0
+    dataframe = pd.DataFrame({"event_time": timestamps, "value": values})
+    state_path = tmp_path / "rolling_mad.json"
+
+    first = RollingMADDetector(window=20, threshold=4.0, min_periods=10, streaming=True, state_path=state_path)
+    warmup = first.fit_predict(dataframe.iloc[:120])
+    # a fresh instance resumes from the snapshot and skips the overlapping part of the window
+    resumed = RollingMADDetector(window=20, threshold=4.0, min_periods=10, streaming=True, state_path=state_path)
+    result = resumed.fit_predict(dataframe.iloc[100:])
+
+    assert warmup.sum() == 0
+    assert list(result.index) == list(range(120, 200))
+    assert result.loc[150] == 1
+    assert result.sum() == 1
+    assert resumed.fit_predict(dataframe).empty
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+
+from pipeline_anomaly.application.use_cases.stream_anomalies import StreamAnomalies
+from pipeline_anomaly.infrastructure.streaming.online_detectors import OnlineRobustDetector, OnlineZScoreDetector
+from pipeline_anomaly.infrastructure.streaming.sources import ClickHouseTailSource, SocketEventSource
+
+
+class ListSink:
+    def __init__(self) -> None:
+        self.reports = []
+        self.received = asyncio.Event()
+
+    def send(self, report) -> None:
+        self.reports.append(report)
+        self.received.set()
+
+
+class FailingWriter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def persist_report(self, report) -> None:
+        self.calls += 1
+        raise ConnectionError("clickhouse is restarting")
+
+
+class FlakyEvents:
+    def __init__(self, frame) -> None:
+        self.frame = frame
+        self.watermarks = []
+
+    def read_events_after(self, watermark, lag_seconds, lookback_minutes):
+        self.watermarks.append(watermark)
+        if len(self.watermarks) == 1:
+            raise ConnectionError("clickhouse is restarting")
+        return self.frame[self.frame["event_time"] > watermark] if watermark is not None else self.frame
+
+
+def _detectors():
+    return [
+        OnlineZScoreDetector(threshold=4.0, window=500, min_periods=50),
+        OnlineRobustDetector(name="mad", threshold=4.0, window=500, min_periods=50),
+        OnlineRobustDetector(name="rolling_mad", threshold=4.0, window=30, min_periods=15),
+    ]
+
+
+def test_online_zscore_matches_a_trailing_window():
+    values = np.random.default_rng(0).normal(100.0, 5.0, size=400)
+    detector = OnlineZScoreDetector(threshold=3.0, window=50, min_periods=50)
+
+    scores = np.concatenate([detector.score(values[:123]), detector.score(values[123:])])
+
+    window = values[-50:]
+    assert np.isnan(scores[:49]).all()
+    assert np.isclose(scores[-1], abs(values[-1] - window.mean()) / window.std(ddof=1))
+    restored = OnlineZScoreDetector(threshold=3.0, window=50, min_periods=50)
+    restored.restore(detector.snapshot())
+    assert np.isclose(restored.score([120.0])[0], detector.score([120.0])[0])
+
+
+def test_socket_stream_alerts_on_a_spike(tmp_path):
+    async def scenario():
+        source = SocketEventSource(port=0, flush_interval=0.05)
+        sink = ListSink()
+        service = StreamAnomalies(
+            source=source,
+            detectors=_detectors(),
+            alert_sink=sink,
+            min_agreement=0.6,
+            state_path=tmp_path / "state.json",
+        )
+        stop = asyncio.Event()
+        task = asyncio.create_task(service.run(stop))
+        await asyncio.wait_for(source.ready.wait(), 5)
+
+        _, writer = await asyncio.open_connection(source.host, source.port)
+        rng = np.random.default_rng(1)
+        for second in range(300):
+            value = 1000.0 if second == 250 else float(rng.normal(100.0, 5.0))
+            event = {"event_time": 1_700_000_000 + second, "entity_id": 42, "value": value, "attribute": 0.5}
+            writer.write((json.dumps(event) + "\n").encode())
+        await writer.drain()
+
+        await asyncio.wait_for(sink.received.wait(), 5)
+        stop.set()
+        await asyncio.wait_for(task, 5)
+        writer.close()
+        return service, sink
+
+    service, sink = asyncio.run(scenario())
+
+    assert service.events_seen == 300
+    assert len(sink.reports) == 1
+    report = sink.reports[0]
+    assert {anomaly.detector for anomaly in report.anomalies} == {"zscore", "mad", "rolling_mad"}
+    assert report.top_entities[0].entity_id == 42
+    state = json.loads((tmp_path / "state.json").read_text())
+    assert set(state["detectors"]) == {"zscore", "mad", "rolling_mad"}
+
+
+def test_socket_stream_drops_malformed_events_and_still_alerts(tmp_path):
+    async def scenario():
+        source = SocketEventSource(port=0, flush_interval=0.05)
+        sink = ListSink()
+        writer = FailingWriter()
+        service = StreamAnomalies(
+            source=source, detectors=_detectors(), alert_sink=sink, writer=writer, min_agreement=0.6, retry_backoff=0
+        )
+        stop = asyncio.Event()
+        task = asyncio.create_task(service.run(stop))
+        await asyncio.wait_for(source.ready.wait(), 5)
+
+        _, stream = await asyncio.open_connection(source.host, source.port)
+        for line in (b"42\n", b'{"event_time": "yesterday", "entity_id": 1, "value": 1.0}\n', b'{"value": 1}\n'):
+            stream.write(line)
+        rng = np.random.default_rng(1)
+        for second in range(300):
+            value = 1000.0 if second == 250 else float(rng.normal(100.0, 5.0))
+            event = {"event_time": 1_700_000_000 + second, "entity_id": 42, "value": value, "attribute": 0.5}
+            stream.write((json.dumps(event) + "\n").encode())
+            if second == 100:
+                stream.write(b'{"event_time": 1700000100, "entity_id": "x", "value": "nan"}\n')
+        await stream.drain()
+
+        await asyncio.wait_for(sink.received.wait(), 5)
+        stop.set()
+        await asyncio.wait_for(task, 5)
+        stream.close()
+        return service, sink, writer
+
+    service, sink, writer = asyncio.run(scenario())
+
+    assert service.events_seen == 300
+    assert len(sink.reports) == 1
+    assert writer.calls == 3
+    assert service.publish_failures == 1
+
+
+def test_tail_source_retries_a_failed_poll_without_moving_the_watermark():
+    times = pd.date_range("2024-01-01", periods=3, freq="s")
+    repository = FlakyEvents(pd.DataFrame({"event_time": times, "entity_id": 1, "value": 1.0, "attribute": 0.0}))
+    source = ClickHouseTailSource(repository, poll_interval=0.0, watermark=times[0].to_pydatetime())
+
+    async def first_batch():
+        batches = source.batches()
+        frame = await asyncio.wait_for(anext(batches), 5)
+        await batches.aclose()
+        return frame
+
+    frame = asyncio.run(first_batch())
+
+    assert repository.watermarks == [times[0].to_pydatetime()] * 2
+    assert len(frame) == 2
+    assert source.watermark == times[-1].to_pydatetime()
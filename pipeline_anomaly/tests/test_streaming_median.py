@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from pipeline_anomaly.infrastructure.detectors.streaming_median import SlidingMedian, StreamingRollingMAD
+
+
+def test_sliding_median_matches_pandas_with_duplicates_and_nan():
+    rng = np.random.default_rng(1)
+    values = rng.integers(0, 20, size=2000).astype(float)
+    values[rng.random(2000) < 0.05] = np.nan
+
+    for window in (1, 2, 7, 50):
+        median = SlidingMedian(window)
+        got = []
+        for value in values:
+            median.push(value)
+            got.append(median.median())
+        expected = pd.Series(values).rolling(window, min_periods=1).median().to_numpy()
+        np.testing.assert_allclose(got, expected, equal_nan=True)
+
+
+def test_restored_engine_continues_the_stream():
+    values = np.random.default_rng(2).normal(100.0, 5.0, size=3000)
+    series = pd.Series(values)
+    median = series.rolling(200, min_periods=100).median()
+    deviation = (series - median).abs()
+    expected = 0.6745 * deviation / deviation.rolling(200, min_periods=100).median().clip(lower=1e-9)
+
+    engine = StreamingRollingMAD(window=200, min_periods=100)
+    head = engine.update(values[:1000])
+    tail = StreamingRollingMAD.restore(engine.snapshot()).update(values[1000:])
+
+    np.testing.assert_allclose(np.concatenate([head, tail]), expected.to_numpy(), equal_nan=True)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from pipeline_anomaly.infrastructure.repositories.window_cache import WindowedFrameCache
+
+
+class InMemoryEvents:
+    def __init__(self, now: datetime) -> None:
+        self.now = now
+        self.events = pd.DataFrame({"event_time": pd.Series(dtype="datetime64[ns]"), "value": pd.Series(dtype=float)})
+        self.rows_scanned = 0
+
+    def append(self, start: datetime, count: int) -> None:
+        times = pd.date_range(start, periods=count, freq="min")
+        chunk = pd.DataFrame({"event_time": times, "value": [float(idx) for idx in range(count)]})
+        self.events = pd.concat([self.events, chunk], ignore_index=True)
+
+    def window_bounds(self, minutes):
+        watermark = self.events["event_time"].max() if not self.events.empty else None
+        return self.now - timedelta(minutes=minutes), watermark
+
+    def read_latest_window(self, minutes=None):
+        frame = self.events[self.events["event_time"] >= self.now - timedelta(minutes=minutes)]
+        self.rows_scanned += len(frame)
+        return frame.reset_index(drop=True)
+
+    def read_window_since(self, watermark, minutes=None):
+        frame = self.read_latest_window(minutes)
+        return frame[frame["event_time"] > watermark].reset_index(drop=True)
+
+
+def test_window_cache_shares_reads_between_stages() -> None:
+    now = datetime(2024, 1, 1, 12, 0)
+    repository = InMemoryEvents(now)
+    repository.append(now - timedelta(minutes=179), 180)
+    cache = WindowedFrameCache(repository=repository, min_window_minutes=180)
+
+    detection = cache.read_latest_window(minutes=180)
+    aggregation = cache.read_latest_window(minutes=120)
+
+    assert len(detection) == 180
+    assert len(aggregation) == 121
+    assert cache.stats.full_reads == 1
+    assert cache.stats.hits == 1
+
+
+def test_window_cache_fetches_only_new_rows_incrementally() -> None:
+    now = datetime(2024, 1, 1, 12, 0)
+    repository = InMemoryEvents(now)
+    repository.append(now - timedelta(minutes=59), 60)
+    cache = WindowedFrameCache(repository=repository, incremental=True)
+    cache.read_latest_window(minutes=60)
+
+    repository.append(now + timedelta(minutes=1), 10)
+    repository.now = now + timedelta(minutes=10)
+    frame = cache.read_latest_window(minutes=60)
+
+    assert cache.stats.incremental_reads == 1
+    assert cache.stats.rows_fetched == 60 + 10
+    assert cache.stats.rows_evicted == 9
+    assert len(frame) == 61
+    assert frame["event_time"].is_monotonic_increasing
+    assert frame["event_time"].iloc[-1] == pd.Timestamp(now + timedelta(minutes=10))